@@ -90,18 +90,31 @@ class Worker(multiprocessing.Process):
     Process-contained worker to execute objective calculations.
     """
 
-    def __init__(self, task_queue, cache, setup: Callable) -> None:
+    def __init__(self, task_queue, cache, setup: Callable, result_queue=None) -> None:
         """
         Process-contained worker, having an independent instance of the problem and simulation to evaluate the objective
 
         :param task_queue: multiprocessing.JoinableQueue()
-        :param cache: multiprocessing.manager.dict()
+        :param cache: diskcache Cache, as in the driver cache
         :param setup: function to create a new instance of the design problem
+        :param result_queue: (optional) multiprocessing.Queue(), the candidate is put on this queue once its result is
+            in the cache
         """
         super().__init__()
         self.task_queue = task_queue
         self.cache = cache
         self.setup = setup
+        self.result_queue = result_queue
+
+    def notify(self, candidate) -> None:
+        """
+        Signal the driver that the cache entry of a candidate is complete
+
+        :param candidate: candidate tuple, as in the task queue
+        :return: None
+        """
+        if self.result_queue is not None:
+            self.result_queue.put(candidate)
 
     def run(self):
         """
@@ -141,12 +154,14 @@ class Worker(multiprocessing.Process):
                 if candidate is not None:
                     # self.cache[candidate] = OptimizerInterrupt
                     self.cache.set(candidate, 'OptimizerInterrupt', tag='exception')
+                    self.notify(candidate)
 
                 break
 
             # Objective returns normally, mark task as done and return result
             self.task_queue.task_done()
             self.cache.set(candidate, result, tag='result')
+            self.notify(candidate)
 
 
 class OptimizationDriver():
@@ -266,16 +281,40 @@ class OptimizationDriver():
 
         if not hasattr(self, 'tasks'):
             self.tasks = multiprocessing.JoinableQueue()
+            self.results = multiprocessing.Queue()
             self.lock = threading.Lock()
 
+        # Candidates pending evaluation, each with an event set once its result is in the cache
+        self.pending = dict()
+        self.result_listener = threading.Thread(target=self.listen_for_results, daemon=True)
+        self.result_listener.start()
+
         print(f"Creating {num_workers} workers")
-        self.workers = [Worker(self.tasks, self.cache, self.setup)
+        self.workers = [Worker(self.tasks, self.cache, self.setup, self.results)
                         for _ in range(num_workers)]
 
         # Start the workers polling the task queue
         for w in self.workers:
             w.start()
 
+    def listen_for_results(self) -> None:
+        """
+        Wait for workers to signal completed candidates and wake the threads waiting on them, until a ``None``
+        candidate signals shutdown
+
+        :return: None
+        """
+        while True:
+            candidate = self.results.get()
+            if candidate is None:
+                break
+
+            with self.lock:
+                ready = self.pending.pop(candidate, None)
+
+            if ready is not None:
+                ready.set()
+
     def cleanup_parallel(self) -> None:
         """
         Cleanup all worker processes, signal them to exit cleanly, mark any pending tasks as complete
@@ -306,6 +345,14 @@ class OptimizationDriver():
             w.join()
             del w
 
+        # Stop the result listener, then release any threads still waiting on a result
+        self.results.put(None)
+        self.result_listener.join()
+        with self.lock:
+            for ready in self.pending.values():
+                ready.set()
+            self.pending.clear()
+
     def check_interrupt(self) -> None:
         """
         Check optional stopping criteria, these are specified by the user in the driver options
@@ -523,14 +570,15 @@ class OptimizationDriver():
             """
             Objective function the optimizer threads call, assumes a parallel structure and avoids any re-calculations
                 - Check if candidate is in cache, if so return objective stored in cache
-                - If not, check if candidate is in queue (indicated by integer value in cache), wait for signal
-                - If not, objective needs to be calculated, add candidate to task queue, poll cache for return,
-                    and finally signal any threads waiting on the same candidate
+                - If not, check if candidate is pending evaluation (indicated by integer value in cache), wait for
+                    its result
+                - If not, objective needs to be calculated, add candidate to task queue and wait for the worker to
+                    signal that the result is in the cache
 
             :param args: Follows the optimizer's convention of objective inputs (typically an array of floats)
             :param name: Caller name to insert into the result dictionary
-            :param idx: Thread index, used for signal conditions
-            :param objective_keys: Ordered list of keys to get the objective from the result dictionary
+            :param idx: Thread index, stored in the cache while the candidate is pending evaluation
+            :param objective: Callable returning the objective from the result dictionary
             :return: the numeric value being optimized
             """
             nonlocal eval_count
@@ -541,65 +589,51 @@ class OptimizationDriver():
             self.cache_info['total_evals'] += 1
             obj = None
 
-            try:
-                # Check if result in cache, throws KeyError if not
-                self.lock.acquire()
-                result = self.cache[candidate]
-                # print(f"cache hit {self.cache_info['total_evals']}")
-                self.lock.release()
-                self.cache_info['hits'] += 1
+            with self.lock:
+                result = self.cache.get(candidate)
 
-                if isinstance(result, int):
-                    # In cache but not complete, wait for complete signal
-                    signal = self.conditions[result]
-                    with signal:
-                        signal.wait()
+                if isinstance(result, dict) and 'exception' in result.keys() and self.options['retry']:
+                    self.cache.delete(candidate)
+                    result = None
 
-                    result = self.cache[candidate]
+                if isinstance(result, int) and candidate not in self.pending:
+                    # Pending marker left behind by an interrupted run, evaluate again
+                    result = None
 
-                if not isinstance(result, dict):
-                    self.force_stop = True
-                    self.check_interrupt()
+                is_new = result is None
+                if is_new:
+                    # Candidate not in cache, nor waiting in queue
+                    self.cache[candidate] = idx  # indicates a pending evaluation to any other thread
+                    self.pending[candidate] = threading.Event()
 
-                if 'exception' in result.keys():
-                    if self.options['retry']:
-                        with self.lock:
-                            self.cache.delete(candidate)
+                    # Insert candidate and caller information into task queue
+                    self.tasks.put((candidate, (name, eval_count)))
 
-                        raise KeyError
+                ready = self.pending.get(candidate)
+
+            # Wait for the worker to signal the result is available in the cache
+            if ready is not None:
+                while not ready.wait(timeout=1.):
+                    if self.force_stop:
+                        raise OptimizerInterrupt
+                result = self.cache.get(candidate)
+
+            # KeyboardInterrupt places a OptimizerInterrupt in the cache to signal a force_stop
+            if not isinstance(result, dict):
+                self.force_stop = True
+                self.check_interrupt()
 
+            if not is_new:
                 # Result available in cache, no work needed
                 # Append this caller name to the result dictionary
+                self.cache_info['hits'] += 1
                 with self.lock:
                     result['caller'].append((name, eval_count))
                     self.cache[candidate] = result
 
-            except KeyError:
-                # Candidate not in cache, nor waiting in queue
-                self.cache[candidate] = idx  # indicates waiting condition for any other thread
-
-                # Insert candidate and caller information into task queue
-                self.tasks.put((candidate, (name, eval_count)))
-
-                self.lock.release()
+            else:
                 self.cache_info['misses'] += 1
 
-                # Poll cache for available result (unclear how this could be a threading.Condition signal)
-                result = self.cache[candidate]
-                while isinstance(result, int):
-                    time.sleep(10)
-                    result = self.cache[candidate]
-
-                # Signal any other threads waiting on the same candidate
-                signal = self.conditions[idx]
-                with signal:
-                    signal.notifyAll()
-
-                # KeyboardInterrupt places a OptimizerInterrupt in the cache to signal a force_stop
-                if not isinstance(result, dict):
-                    self.force_stop = True
-                    self.check_interrupt()
-
                 # Update best best objective if needed, and print a log line to console
                 if objective is not None:
                     obj = objective(result)
@@ -779,9 +813,6 @@ class OptimizationDriver():
         num_workers = min(self.options['n_proc'], len(callables))  # optimizers are assumed to be serial
         self.init_parallel_workers(num_workers)
 
-        # Add thread conditions to allow signaling between threads waiting on the same candidate
-        self.conditions = [threading.Condition() for _ in range(len(callables))]
-
         # Begin parallel execution
         self.print_log_header()
         output = dict()
@@ -49,6 +49,8 @@ class HybridSizingProblem():  # OptimizationProblem (unwritten base)
                            generation_profile=False,  # add technology generation profile to output
                            financial_model=False,     # add financial model dictionary to output
                            shrink_output=False,       # keep only the first year of output
+                           copy_simulation=False,     # copy a baseline simulation instead of initializing one per evaluation
+                           phase_timings=False,       # add per-phase wall times of the simulation to output
                            )
 
     def __init__(self,
@@ -87,6 +89,7 @@ class HybridSizingProblem():  # OptimizationProblem (unwritten base)
         """
 
         self.simulation = None
+        self.baseline_simulation = None
         self.init_simulation = init_simulation
         self._parse_design_variables(design_variables, fixed_variables)
         self.options = self.DEFAULT_OPTIONS.copy()
@@ -275,28 +278,39 @@ class HybridSizingProblem():  # OptimizationProblem (unwritten base)
                 del self.simulation
 
             # Initialize (or re-initialize the simulation)
-            self.simulation = self.init_simulation()
+            if self.options['copy_simulation']:
+                if self.baseline_simulation is None:
+                    self.baseline_simulation = self.init_simulation()
+                self.simulation = self.baseline_simulation.copy()
+            else:
+                self.simulation = self.init_simulation()
 
             # Check if valid candidate, update simulation, execute simulation
             self._check_candidate(candidate)
             self._set_simulation_to_candidate(candidate)
             
             # return
+            if self.options['phase_timings']:
+                self.simulation.timer.reset()
+                self.simulation.timer.enabled = True
             self.simulation.simulate()
 
             result.update(self.simulation.hybrid_simulation_outputs().copy())
+
+            if self.options['phase_timings']:
+                result['timings'] = self.simulation.timer.summary()
             
             if self.options['time_series_outputs']:                
                 # CSP TES SOC
                 if 'tower' in self.simulation.power_sources.keys():
                     model = self.simulation.power_sources['tower']
-                    result['tes_soc'] = model.outputs.ssc_time_series['e_ch_tes'][:8760]
-                    result['rec_thermal'] = model.outputs.ssc_time_series['Q_thermal'][:8760]
+                    result['tes_soc'] = list(model.outputs.ssc_time_series['e_ch_tes'][:8760])
+                    result['rec_thermal'] = list(model.outputs.ssc_time_series['Q_thermal'][:8760])
                     
                 # Battery SOC
                 if 'battery' in self.simulation.power_sources.keys():
                     model = self.simulation.power_sources['battery']
-                    result['bat_soc'] = model.Outputs.SOC[:8760]
+                    result['bat_soc'] = list(model.Outputs.SOC[:8760])
                 
                 # Curtailment
                 if 'grid' in self.simulation.power_sources.keys():
@@ -0,0 +1,235 @@
+"""
+Offline benchmarks of end-to-end HybridSimulation runs using the bundled resource files.
+
+Each configuration is timed by phase (site creation, HybridSimulation construction, simulate_power,
+calculate_installed_cost, calculate_financials and simulate_financials) with the simulation's PhaseTimer. Timings are
+the minimum over the repeats, so resource files parsed by the first repeat are typically cached for the rest. Peak
+memory is measured per phase in a separate run with tracemalloc, which only tracks memory allocated through Python
+(not within the SSC library).
+
+Usage::
+
+    python benchmarks/benchmark_simulation.py                       # run and compare against benchmarks/baseline.json
+    python benchmarks/benchmark_simulation.py --save-baseline       # run and store results as the new baseline
+    python benchmarks/benchmark_simulation.py -c pv_wind -r 5       # run a single configuration, 5 repeats
+
+Baselines are machine specific, so they should be recorded on the machine used for comparisons. The exit status is 1
+if any phase is slower (or uses more memory) than its baseline by more than the tolerance.
+"""
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
+
+from hybrid.sites import SiteInfo, flatirons_site
+from hybrid.hybrid_simulation import HybridSimulation
+from hybrid.timing import PhaseTimer
+
+resource_dir = Path(__file__).absolute().parent.parent / "resource_files"
+solar_resource_file = resource_dir / "solar" / "35.2018863_-101.945027_psmv3_60_2012.csv"
+wind_resource_file = resource_dir / "wind" / "35.2018863_-101.945027_windtoolkit_2012_60min_80m_100m.srw"
+default_baseline_file = Path(__file__).absolute().parent / "baseline.json"
+
+PHASES = ('site', 'init', 'simulate_power', 'calculate_installed_cost', 'calculate_financials', 'simulate_financials')
+
+configurations = {
+    'pv_wind': {
+        'technologies': {'pv': {'system_capacity_kw': 5000},
+                         'wind': {'num_turbines': 5, 'turbine_rating_kw': 2000},
+                         'grid': {'interconnect_kw': 15000}},
+        'dispatch_options': None,
+    },
+    'pv_wind_battery': {
+        'technologies': {'pv': {'system_capacity_kw': 5000},
+                         'wind': {'num_turbines': 5, 'turbine_rating_kw': 2000},
+                         'battery': {'system_capacity_kwh': 20000, 'system_capacity_kw': 5000},
+                         'grid': {'interconnect_kw': 15000}},
+        'dispatch_options': None,
+    },
+    'tower_battery': {
+        'technologies': {'tower': {'cycle_capacity_kw': 50 * 1000, 'solar_multiple': 2.0, 'tes_hours': 12.0},
+                         'battery': {'system_capacity_kwh': 40 * 1000, 'system_capacity_kw': 20 * 1000},
+                         'grid': {'interconnect_kw': 50000}},
+        'dispatch_options': {'is_test_start_year': True, 'is_test_end_year': True},
+    },
+    'trough_battery': {
+        'technologies': {'trough': {'cycle_capacity_kw': 50 * 1000, 'solar_multiple': 2.0, 'tes_hours': 12.0},
+                         'battery': {'system_capacity_kwh': 40 * 1000, 'system_capacity_kw': 20 * 1000},
+                         'grid': {'interconnect_kw': 50000}},
+        'dispatch_options': {'is_test_start_year': True, 'is_test_end_year': True},
+    },
+}
+
+
+@contextmanager
+def benchmark_phase(timer: PhaseTimer, phase: str, peak_memory: dict = None):
+    """
+    Times a phase and, if peak_memory is given, records the peak memory traced during the phase
+
+    :param timer: timer the phase is recorded by
+    :param phase: phase name
+    :param peak_memory: {phase: peak traced memory [B]}, None to not trace memory
+    """
+    if peak_memory is not None:
+        tracemalloc.start()     # restarted per phase, as tracemalloc.reset_peak requires Python 3.9
+    try:
+        with timer.phase(phase):
+            yield
+    finally:
+        if peak_memory is not None:
+            peak_memory[phase] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+
+def run_configuration(name: str, peak_memory: dict = None, project_life: int = 25) -> dict:
+    """
+    Runs the phases of ``HybridSimulation.simulate`` for a configuration
+
+    :param name: configuration name, key of ``configurations``
+    :param peak_memory: {phase: peak traced memory [B]}, filled in if given
+    :param project_life: analysis period [years]
+
+    :returns: {phase: seconds}
+    """
+    config = configurations[name]
+    setup_timer = PhaseTimer(enabled=True)
+    with benchmark_phase(setup_timer, 'site', peak_memory):
+        site = SiteInfo(flatirons_site, solar_resource_file=solar_resource_file, wind_resource_file=wind_resource_file)
+    technologies = json.loads(json.dumps(config['technologies']))     # HybridSimulation modifies the dict
+    with benchmark_phase(setup_timer, 'init', peak_memory):
+        hybrid_plant = HybridSimulation(technologies, site, dispatch_options=config['dispatch_options'])
+    hybrid_plant.ppa_price = (0.05, )
+    if hybrid_plant.pv:
+        hybrid_plant.pv.dc_degradation = [0] * project_life
+
+    timer = hybrid_plant.timer
+    timer.enabled = True
+    with benchmark_phase(timer, 'simulate_power', peak_memory):
+        hybrid_plant.simulate_power(project_life)
+    with benchmark_phase(timer, 'calculate_installed_cost', peak_memory):
+        hybrid_plant.calculate_installed_cost()
+    with benchmark_phase(timer, 'calculate_financials', peak_memory):
+        hybrid_plant.calculate_financials()
+    with benchmark_phase(timer, 'simulate_financials', peak_memory):
+        hybrid_plant.simulate_financials(project_life)
+
+    summary = {**setup_timer.summary(), **timer.summary()}
+    return {phase: summary[phase]['total_s'] for phase in PHASES}
+
+
+def benchmark(names: list, repeat: int, measure_memory: bool = True) -> dict:
+    """
+    Benchmarks configurations
+
+    :param names: configuration names
+    :param repeat: number of timed runs of each configuration
+    :param measure_memory: whether to measure peak memory in an extra run
+
+    :returns: {configuration name: {'time_s': {phase: seconds}, 'peak_memory_mb': {phase: MB}}}
+    """
+    results = {}
+    for name in names:
+        times = {}
+        for i in range(repeat):
+            for phase, t in run_configuration(name).items():
+                times[phase] = min(t, times.get(phase, t))
+        results[name] = {'time_s': times}
+
+        if measure_memory:
+            peak_memory = {}
+            run_configuration(name, peak_memory)
+            results[name]['peak_memory_mb'] = {phase: m / 1e6 for phase, m in peak_memory.items()}
+    return results
+
+
+def print_results(name: str, result: dict, baseline: dict = None):
+    print(f"\n{name}")
+    print("".join(val.rjust(width) for val, width in zip(('phase', 'time [s]', 'baseline', 'memory [MB]', 'baseline'),
+                                                          (26, 12, 12, 14, 12))))
+    baseline = baseline if baseline else {}
+    for phase in PHASES:
+        if phase not in result['time_s']:
+            continue
+        values = [phase,
+                  f"{result['time_s'][phase]:.3f}",
+                  f"{baseline['time_s'][phase]:.3f}" if phase in baseline.get('time_s', {}) else "",
+                  f"{result['peak_memory_mb'][phase]:.1f}" if phase in result.get('peak_memory_mb', {}) else "",
+                  f"{baseline['peak_memory_mb'][phase]:.1f}" if phase in baseline.get('peak_memory_mb', {}) else ""]
+        print("".join(val.rjust(width) for val, width in zip(values, (26, 12, 12, 14, 12))))
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_time_s: float = 0.05) -> list:
+    """
+    Compares results against a baseline
+
+    :param results: output of :func:`benchmark`
+    :param baseline: stored baseline, in the same format as the results
+    :param tolerance: allowed fractional increase over the baseline
+    :param min_time_s: phases faster than this in the baseline are not compared, as their timings are mostly noise
+
+    :returns: list of regression descriptions
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for metric, unit in (('time_s', 's'), ('peak_memory_mb', 'MB')):
+            for phase, value in result.get(metric, {}).items():
+                reference = baseline[name].get(metric, {}).get(phase)
+                if reference is None or (metric == 'time_s' and reference < min_time_s):
+                    continue
+                if value > reference * (1 + tolerance):
+                    regressions.append(f"{name} {phase}: {value:.3f} {unit} vs. baseline {reference:.3f} {unit}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end HybridSimulation runs")
+    parser.add_argument('-c', '--config', action='append', choices=list(configurations.keys()),
+                        help="configuration to run, may be repeated (default: all)")
+    parser.add_argument('-r', '--repeat', type=int, default=3, help="timed runs per configuration")
+    parser.add_argument('-b', '--baseline', type=Path, default=default_baseline_file, help="baseline file")
+    parser.add_argument('-t', '--tolerance', type=float, default=0.25,
+                        help="allowed fractional increase over the baseline")
+    parser.add_argument('--save-baseline', action='store_true', help="store the results as the baseline")
+    parser.add_argument('--no-memory', action='store_true', help="skip the peak memory measurement")
+    args = parser.parse_args()
+
+    names = args.config if args.config else list(configurations.keys())
+    results = benchmark(names, args.repeat, not args.no_memory)
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    for name in names:
+        print_results(name, results[name], None if args.save_baseline else baseline.get(name))
+
+    if args.save_baseline:
+        baseline.update(results)
+        baseline['meta'] = {'date': datetime.now().isoformat(timespec='seconds'),
+                            'python': platform.python_version(),
+                            'machine': platform.platform()}
+        args.baseline.write_text(json.dumps(baseline, indent=2))
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline}, run with --save-baseline to create one")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nRegressions (tolerance {args.tolerance:.0%}):")
+        for regression in regressions:
+            print("    " + regression)
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
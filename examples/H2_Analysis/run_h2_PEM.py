@@ -1,4 +1,4 @@
-from hybrid.PEM_H2_LT_electrolyzer import PEM_electrolyzer_LT
+from hybrid.PEM_H2_LT_electrolyzer import PEM_electrolyzer_LT, PEM_electrolyzer_fleet
 from numpy.lib.function_base import average
 import examples.H2_Analysis.H2AModel as H2AModel
 import numpy as np
@@ -10,13 +10,18 @@ def run_h2_PEM(electrical_generation_timeseries, electrolyzer_size,
                 adjusted_installed_cost,useful_life,net_capital_costs,
                 voltage_type="constant", stack_input_voltage_DC=250, min_V_cell=1.62,
                 p_s_h2_bar=31, stack_input_current_lower_bound=500, cell_active_area=1250, 
-                N_cells=130, total_system_electrical_usage=55.5):
+                N_cells=130, total_system_electrical_usage=55.5, power_split=None):
 
     in_dict = dict()
     out_dict = dict()
     in_dict['P_input_external_kW'] = electrical_generation_timeseries
     in_dict['electrolyzer_system_size_MW'] = electrolyzer_size
-    el = PEM_electrolyzer_LT(in_dict, out_dict)
+    if power_split is None:
+        el = PEM_electrolyzer_LT(in_dict, out_dict)
+    else:
+        # model the electrolyzer as a fleet of stacks, splitting power 'equal'-ly or 'sequential'-ly
+        in_dict['power_split'] = power_split
+        el = PEM_electrolyzer_fleet(in_dict, out_dict)
 
     # el.power_supply_rating_MW = electrolyzer_size
     # el.power_supply_rating_MW = power_supply_rating_MW
@@ -28,6 +28,7 @@ from hybrid.hybrid_simulation import HybridSimulation
 from tools.analysis import create_cost_calculator
 from tools.resource import *
 from tools.resource.resource_loader import site_details_creator
+from hybrid.resource.resource_downloader import download_resources
 
 resource_dir = Path(__file__).parent.parent.parent / "resource_files"
 
@@ -586,6 +587,12 @@ if __name__ == '__main__':
             site_details = filter_sites(site_details, location='usa only')
             site_details.to_csv(sitelist_name)
 
+        # Download the resource of all sites concurrently, so each run loads its files instead of calling the API.
+        # Wind resource is downloaded for SiteInfo's default hub height.
+        resource_requests = [(site['Lat'], site['Lon'], int(site['year']), 97) for _, site in site_details.iterrows()]
+        for result in download_resources(resource_requests, max_workers=8):
+            if not result.success:
+                print("Resource download failed for {}: {}".format(result.request, result.errors))
 
     solar_tracking_mode = 'Fixed'  # Currently not making a difference
     ppa_prices = [0.04, 0.05, 0.06, 0.07, 0.08, 0.09, 0.10]
@@ -69,6 +69,7 @@ class PEM_electrolyzer_LT:
         self.stack_rating_kW = 1000  # 1 MW
         self.cell_active_area = 1250
         self.N_cells = 130
+        self.power_converter_efficiency = 0.95
 
         # Constants:
         self.moles_per_g_h2 = 0.49606
@@ -90,21 +91,21 @@ class PEM_electrolyzer_LT:
         TODO: extend model to accept variable voltage, current, and power
         This will replicate direct DC-coupled PV system operating at MPP
         """
-        power_converter_efficiency = 0.95
+        power_converter_efficiency = self.power_converter_efficiency
         if self.input_dict['voltage_type'] == 'constant':
 
-            self.input_dict['P_input_external_kW'] = \
-                np.where(self.input_dict['P_input_external_kW'] >
-                         (self.electrolyzer_system_size_MW * 1000),
-                         (self.electrolyzer_system_size_MW * 1000),
-                         self.input_dict['P_input_external_kW'])
-
             self.output_dict['curtailed_P_kW'] = \
                 np.where(self.input_dict['P_input_external_kW'] >
                          (self.electrolyzer_system_size_MW * 1000),
                          (self.input_dict['P_input_external_kW'] -
                           (self.electrolyzer_system_size_MW * 1000)), 0)
 
+            self.input_dict['P_input_external_kW'] = \
+                np.where(self.input_dict['P_input_external_kW'] >
+                         (self.electrolyzer_system_size_MW * 1000),
+                         (self.electrolyzer_system_size_MW * 1000),
+                         self.input_dict['P_input_external_kW'])
+
             self.output_dict['current_input_external_Amps'] = \
                 (self.input_dict['P_input_external_kW'] * 1000 *
                  power_converter_efficiency) / (self.stack_input_voltage_DC *
@@ -438,6 +439,125 @@ class PEM_electrolyzer_LT:
         pass
 
 
+class PEM_electrolyzer_fleet(PEM_electrolyzer_LT):
+    """
+    Create an instance of a low-temperature PEM Electrolyzer System modeled
+    as a fleet of 1 MW_DC stacks. The external power is split between the
+    stacks at every timestep and all stack quantities are 2-D arrays of
+    shape (number of stacks, number of timesteps), evaluated with the same
+    efficiency and H2 production equations as PEM_electrolyzer_LT.
+
+    Parameters
+    _____________
+    np_array P_input_external_kW
+        1-D array of time-series external power supply
+
+    float electrolyzer_system_size_MW
+        Rated power of the electrolyzer system, a multiple of the stack
+        rating
+
+    string power_split
+        How power is split between stacks ['equal' or 'sequential']:
+        'equal' operates all stacks at the same power, as in
+        PEM_electrolyzer_LT, 'sequential' commits stacks in order, using
+        the fewest stacks able to take the power and operating the
+        committed stacks at the same power
+
+    Returns
+    _____________
+
+    """
+
+    def __init__(self, input_dict, output_dict):
+        self.power_split = input_dict.get('power_split', 'equal')
+        if self.power_split not in ('equal', 'sequential'):
+            raise ValueError("power_split must be 'equal' or 'sequential'")
+        super().__init__(input_dict, output_dict)
+
+    @property
+    def n_stacks(self) -> int:
+        n_stacks = self.system_design()
+        if n_stacks < 1 or abs(n_stacks - round(n_stacks)) > 1e-9:
+            raise ValueError("Electrolyzer system size must be a multiple of the {} kW stack rating".format(
+                self.stack_rating_kW))
+        return int(round(n_stacks))
+
+    def stack_power_split(self, P_input_kW):
+        """
+        Splits the external power between stacks
+
+        Parameters
+        _____________
+        np_array P_input_kW
+            1-D array of time-series power supplied to the system, at most
+            the system rating
+
+        Returns
+        _____________
+        np_array
+            2-D array of power supplied to each stack (kW), shape (number of
+            stacks, number of timesteps)
+
+        """
+        n_stacks = self.n_stacks
+        P_input_kW = np.asarray(P_input_kW, dtype=float)
+        if self.power_split == 'equal':
+            return np.broadcast_to(P_input_kW / n_stacks, (n_stacks, len(P_input_kW)))
+
+        n_committed = np.clip(np.ceil(P_input_kW / self.stack_rating_kW - 1e-9), 0, n_stacks)
+        P_committed = np.divide(P_input_kW, n_committed, out=np.zeros_like(P_input_kW), where=n_committed > 0)
+        is_committed = np.arange(n_stacks)[:, None] < n_committed[None, :]
+        return np.where(is_committed, P_committed[None, :], 0.)
+
+    def external_power_supply(self):
+        """
+        External power source (grid or REG), stepped down and converted to
+        DC power and split between the stacks at fixed voltage.
+        """
+        if self.input_dict['voltage_type'] == 'constant':
+            system_rating_kW = self.electrolyzer_system_size_MW * 1000
+            P_input_kW = np.asarray(self.input_dict['P_input_external_kW'], dtype=float)
+
+            self.output_dict['curtailed_P_kW'] = np.maximum(P_input_kW - system_rating_kW, 0)
+            self.input_dict['P_input_external_kW'] = np.minimum(P_input_kW, system_rating_kW)
+
+            self.output_dict['stack_P_input_kW'] = self.stack_power_split(self.input_dict['P_input_external_kW'])
+            stack_current = (self.output_dict['stack_P_input_kW'] * 1000 * self.power_converter_efficiency) / \
+                self.stack_input_voltage_DC
+
+            self.output_dict['stack_current_density_A_cm2'] = stack_current / self.cell_active_area
+            self.output_dict['current_input_external_Amps'] = \
+                np.where(stack_current < self.stack_input_current_lower_bound, 0, stack_current)
+
+        else:
+            pass  # TODO: extend model to variable voltage and current source
+
+    def h2_production_rate(self):
+        """
+        H2 production rate of each stack and of the system, calculated
+        using Faraday's Law of Electrolysis
+
+        Returns
+        _____________
+        np_array
+            1-D array of time-series H2 production of the system (kg/hr)
+
+        """
+        n_Tot = self.total_efficiency()
+        h2_production_rate = n_Tot * ((self.N_cells *
+                                       self.output_dict['current_input_external_Amps']) /
+                                      (2 * self.F))  # mol/s
+        h2_production_rate_g_s = h2_production_rate / self.moles_per_g_h2
+        h2_produced_kg_hr = h2_production_rate_g_s * 3.6
+
+        self.output_dict['stack_h2_produced_kg_hr'] = h2_produced_kg_hr
+
+        h2_produced_kg_hr_system = h2_produced_kg_hr.sum(axis=0)
+        self.output_dict['h2_produced_kg_hr_system'] = h2_produced_kg_hr_system
+
+        return h2_produced_kg_hr_system
+
+
 if __name__=="__main__":
     # Example on how to use this model:
     in_dict = dict()
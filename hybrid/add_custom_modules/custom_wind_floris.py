@@ -1,9 +1,11 @@
 # tools to add floris to the hybrid simulation class
+import hashlib
+from collections import OrderedDict
 import numpy as np
 import matplotlib.pyplot as plt
 import floris
 
-floris_version = float(floris.__version__[0:2])
+floris_version = float('.'.join(floris.__version__.split('.')[0:2]))
 if floris_version >= 3.1:
     from floris.tools import FlorisInterface
 
@@ -16,6 +18,13 @@ class Floris:
 
         self.fi = FlorisInterface(config_dict["floris_config"])
 
+        # wind rose binning: evaluate FLORIS once per (direction bin, speed bin) instead of once per timestep
+        self.use_wind_rose_bins = config_dict.get("wind_rose_binning", False)
+        self.wind_dir_bin_width = config_dict.get("wind_direction_bin_deg", 5.0)         # [deg]
+        self.wind_speed_bin_width = config_dict.get("wind_speed_bin_ms", 0.5)            # [m/s]
+        self.wind_rose_cache_size = config_dict.get("wind_rose_cache_size", 100)         # layouts kept in the cache
+        self._wind_rose_cache = OrderedDict()
+
         self.site = site
         self.wind_resource_data = self.site.wind_resource.data
         self.speeds, self.wind_dirs = self.parse_resource_data()
@@ -65,14 +74,74 @@ class Floris:
     def parse_resource_data(self):
 
         # extract data for simulation
-        speeds = np.zeros(len(self.wind_resource_data['data']))
-        wind_dirs = np.zeros(len(self.site.wind_resource.data['data']))
-        for i in range((len(self.site.wind_resource.data['data']))):
-            speeds[i] = self.site.wind_resource.data['data'][i][2]
-            wind_dirs[i] = self.site.wind_resource.data['data'][i][3]
+        data = np.asarray(self.wind_resource_data['data'], dtype=float)
+        speeds = np.array(data[:, 2])
+        wind_dirs = np.array(data[:, 3])
 
         return speeds, wind_dirs
 
+    @staticmethod
+    def bin_wind_rose(speeds, wind_dirs, speed_bin_width, dir_bin_width):
+        """
+        Bins wind speeds and directions into a wind rose with bins centered on multiples of the bin widths
+
+        :param speeds: wind speeds [m/s]
+        :param wind_dirs: wind directions [deg]
+        :param speed_bin_width: width of wind speed bins [m/s]
+        :param dir_bin_width: width of wind direction bins [deg]
+
+        :return: tuple of (direction bin centers [deg], speed bin centers [m/s],
+                           index of each timestep's direction bin, index of each timestep's speed bin)
+        """
+        n_dir_bins = int(round(360. / dir_bin_width))
+        dir_idx = np.round(np.mod(wind_dirs, 360.) / dir_bin_width).astype(int) % n_dir_bins
+        speed_idx = np.round(np.maximum(speeds, 0.) / speed_bin_width).astype(int)
+        used_dirs, dir_inverse = np.unique(dir_idx, return_inverse=True)
+        used_speeds, speed_inverse = np.unique(speed_idx, return_inverse=True)
+        return used_dirs * dir_bin_width, used_speeds * speed_bin_width, dir_inverse, speed_inverse
+
+    def layout_key(self, dir_centers, speed_centers):
+        """Hash of the turbine layout and wind rose bins, used to key the binned FLORIS results"""
+        h = hashlib.sha1()
+        for arr in (self.wind_farm_xCoordinates, self.wind_farm_yCoordinates, dir_centers, speed_centers):
+            h.update(np.ascontiguousarray(arr, dtype=float).tobytes())
+            h.update(b'|')
+        return h.hexdigest()
+
+    def calculate_binned_turbine_powers(self, speeds, wind_dirs):
+        """
+        Calculates turbine powers for each timestep by evaluating FLORIS once per wind rose bin. Results are cached by
+        layout so repeated layouts (e.g., during layout optimization) skip the wake calculations.
+
+        :param speeds: wind speeds [m/s]
+        :param wind_dirs: wind directions [deg]
+
+        :return: turbine powers [W], shape (nTurbs, len(speeds))
+        """
+        dir_centers, speed_centers, dir_inverse, speed_inverse = self.bin_wind_rose(speeds, wind_dirs,
+                                                                                    self.wind_speed_bin_width,
+                                                                                    self.wind_dir_bin_width)
+        key = self.layout_key(dir_centers, speed_centers)
+        if key in self._wind_rose_cache:
+            self._wind_rose_cache.move_to_end(key)
+            bin_powers = self._wind_rose_cache[key]
+        else:
+            bin_powers = np.zeros((len(dir_centers), len(speed_centers), len(self.wind_farm_xCoordinates)))
+            moving = speed_centers > 0
+            if moving.any():
+                self.fi.reinitialize(layout_x=self.wind_farm_xCoordinates, layout_y=self.wind_farm_yCoordinates,
+                                     wind_directions=dir_centers, wind_speeds=speed_centers[moving])
+                self.fi.calculate_wake()
+                bin_powers[:, moving, :] = np.nan_to_num(self.fi.get_turbine_powers())
+            self._wind_rose_cache[key] = bin_powers
+            while len(self._wind_rose_cache) > self.wind_rose_cache_size:
+                self._wind_rose_cache.popitem(last=False)
+
+        return bin_powers[dir_inverse, speed_inverse, :].T
+
+    def clear_wind_rose_cache(self):
+        self._wind_rose_cache.clear()
+
     def execute(self, project_life):
 
         print('Simulating wind farm output in FLORIS...')
@@ -81,11 +150,16 @@ class Floris:
         power_turbines = np.zeros((self.nTurbs, 8760))
         power_farm = np.zeros(8760)
 
-        self.fi.reinitialize(wind_speeds=self.speeds[self.start_idx:self.end_idx], wind_directions=self.wind_dirs[self.start_idx:self.end_idx])
-        self.fi.calculate_wake()
+        if self.use_wind_rose_bins:
+            power_turbines = np.zeros((len(self.wind_farm_xCoordinates), 8760))
+            power_turbines[:, self.start_idx:self.end_idx] = self.calculate_binned_turbine_powers(
+                self.speeds[self.start_idx:self.end_idx], self.wind_dirs[self.start_idx:self.end_idx])
+        else:
+            self.fi.reinitialize(wind_speeds=self.speeds[self.start_idx:self.end_idx], wind_directions=self.wind_dirs[self.start_idx:self.end_idx])
+            self.fi.calculate_wake()
 
-        powers = self.fi.get_turbine_powers()
-        power_turbines[:, self.start_idx:self.end_idx] = powers[0].reshape((self.nTurbs, self.end_idx - self.start_idx))
+            powers = self.fi.get_turbine_powers()
+            power_turbines[:, self.start_idx:self.end_idx] = powers[0].reshape((self.nTurbs, self.end_idx - self.start_idx))
 
         power_farm = np.array(power_turbines).sum(axis=0)
 
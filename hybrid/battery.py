@@ -8,16 +8,34 @@ from hybrid.power_source import *
 
 
 class BatteryOutputs:
+    stateful_attributes = ['I', 'P', 'Q', 'SOC', 'T_batt', 'gen']
+    dispatch_attributes = ['dispatch_I', 'dispatch_P', 'dispatch_SOC']
+
     def __init__(self, n_timesteps):
-        """Class for storing stateful battery and dispatch outputs."""
-        self.stateful_attributes = ['I', 'P', 'Q', 'SOC', 'T_batt', 'gen']
-        for attr in self.stateful_attributes:
-            setattr(self, attr, [0.0]*n_timesteps)
+        """
+        Class for storing stateful battery and dispatch outputs.
 
-        # dispatch output storage
-        dispatch_attributes = ['I', 'P', 'SOC']
-        for attr in dispatch_attributes:
-            setattr(self, 'dispatch_'+attr, [0.0]*n_timesteps)
+        Each output is a preallocated numpy array indexed by simulation time step, which supports the indexing,
+        slicing, iteration and ``len`` of the lists previously stored. Use :meth:`export` for plain lists.
+        """
+        for attr in self.stateful_attributes + self.dispatch_attributes:
+            setattr(self, attr, np.zeros(n_timesteps))
+
+    def store_stateful_outputs(self, values: np.ndarray, start: int):
+        """
+        Stores stateful outputs of consecutive time steps
+
+        :param values: array of shape (len(stateful_attributes), n_steps), in the order of ``stateful_attributes``
+        :param start: time step of the first column of values
+        """
+        for attr, row in zip(self.stateful_attributes, values):
+            getattr(self, attr)[start:start + len(row)] = row
+
+    def export(self) -> dict:
+        """
+        :returns: {output name: list of values}
+        """
+        return {attr: list(getattr(self, attr)) for attr in self.stateful_attributes + self.dispatch_attributes}
 
 
 class Battery(PowerSource):
@@ -61,6 +79,7 @@ class Battery(PowerSource):
             financial_model = Singleowner.from_existing(system_model, "StandaloneBatterySingleOwner")
 
         super().__init__("Battery", site, system_model, financial_model)
+        self._financial_model_linked = 'fin_model' not in battery_config.keys()
 
         self.Outputs = BatteryOutputs(n_timesteps=site.n_timesteps)
         self.system_capacity_kw: float = battery_config['system_capacity_kw']
@@ -85,6 +104,14 @@ class Battery(PowerSource):
 
         self._dispatch = None
 
+        # Stateful model variable stored for each output, None if not available
+        self._stored_value_names = []
+        for attr in self.Outputs.stateful_attributes:
+            if hasattr(self._system_model.StatePack, attr):
+                self._stored_value_names.append(attr)
+            else:
+                self._stored_value_names.append('P' if attr == 'gen' else None)
+
         logger.info("Initialized battery with parameters and state {}".format(self._system_model.export()))
 
     def setup_system_model(self):
@@ -175,20 +202,22 @@ class Battery(PowerSource):
         else:
             raise ValueError("Stateful battery module 'control_mode' invalid value.")
 
+        # Only store information if passed the previous day simulations (used in clustering)
+        store_outputs = sim_start_time is not None
+        if store_outputs:
+            stateful_values = np.zeros((len(self.Outputs.stateful_attributes), n_periods))
+
         time_step_duration = self.dispatch.time_duration
         for t in range(n_periods):
             self.value('dt_hr', time_step_duration[t])
             self.value(self.dispatch.control_variable, control[t])
+            self.simulate_power()
+            if store_outputs:
+                stateful_values[:, t] = self.get_stateful_values()
 
-            # Only store information if passed the previous day simulations (used in clustering)
-            try:
-                index_time_step = sim_start_time + t  # Store information
-            except TypeError:
-                index_time_step = None  # Don't store information
-            self.simulate_power(time_step=index_time_step)
-
-        # Store Dispatch model values
-        if sim_start_time is not None:
+        # Store stateful and dispatch model values
+        if store_outputs:
+            self.Outputs.store_stateful_outputs(stateful_values, sim_start_time)
             time_slice = slice(sim_start_time, sim_start_time + n_periods)
             self.Outputs.dispatch_SOC[time_slice] = self.dispatch.soc[0:n_periods]
             self.Outputs.dispatch_P[time_slice] = self.dispatch.power[0:n_periods]
@@ -204,23 +233,26 @@ class Battery(PowerSource):
         """
         if not self._system_model:
             return
-        self._system_model.execute(0)
+        with self.timer.phase('ssc_execute'):
+            self._system_model.execute(0)
 
         if time_step is not None:
             self.update_battery_stored_values(time_step)
 
+    def get_stateful_values(self) -> list:
+        """
+        :returns: current Stateful battery values, in the order of ``BatteryOutputs.stateful_attributes``
+        """
+        return [self.value(name) if name is not None else 0. for name in self._stored_value_names]
+
     def update_battery_stored_values(self, time_step):
         """
         Stores Stateful battery outputs at time step provided.
 
         :param time_step: time step where outputs will be stored.
         """
-        for attr in self.Outputs.stateful_attributes:
-            if hasattr(self._system_model.StatePack, attr):
-                getattr(self.Outputs, attr)[time_step] = self.value(attr)
-            else:
-                if attr == 'gen':
-                    getattr(self.Outputs, attr)[time_step] = self.value('P')
+        for attr, value in zip(self.Outputs.stateful_attributes, self.get_stateful_values()):
+            getattr(self.Outputs, attr)[time_step] = value
 
 
     def validate_replacement_inputs(self, project_life):
@@ -276,12 +308,16 @@ class Battery(PowerSource):
 
         if len(self.Outputs.gen) == self.site.n_timesteps:
             single_year_gen = self.Outputs.gen
-            self._financial_model.value('gen', list(single_year_gen) * project_life)
-
-            self._financial_model.value('system_pre_curtailment_kwac', list(single_year_gen) * project_life)
-            self._financial_model.value('annual_energy_pre_curtailment_ac', sum(single_year_gen))
-            self._financial_model.value('batt_annual_discharge_energy', [sum(i for i in single_year_gen if i > 0)] * project_life)
-            self._financial_model.value('batt_annual_charge_energy', [sum(i for i in single_year_gen if i < 0)] * project_life)
+            lifetime_gen = list(single_year_gen) * project_life
+            self._financial_model.value('gen', lifetime_gen)
+
+            self._financial_model.value('system_pre_curtailment_kwac', lifetime_gen)
+            single_year_gen_array = np.asarray(single_year_gen, dtype=float)
+            self._financial_model.value('annual_energy_pre_curtailment_ac', float(single_year_gen_array.sum()))
+            self._financial_model.value('batt_annual_discharge_energy',
+                                        [float(single_year_gen_array[single_year_gen_array > 0].sum())] * project_life)
+            self._financial_model.value('batt_annual_charge_energy',
+                                        [float(single_year_gen_array[single_year_gen_array < 0].sum())] * project_life)
             # Do not calculate LCOS, so skip these inputs for now by unassigning or setting to 0
             self._financial_model.unassign("battery_total_cost_lcos")
             self._financial_model.value('batt_annual_charge_from_system', (0,))
@@ -292,7 +328,8 @@ class Battery(PowerSource):
         self.gen_max_feasible = self.calc_gen_max_feasible_kwh(interconnect_kw, cap_cred_avail_storage)
         self.capacity_credit_percent = self.calc_capacity_credit_percent(interconnect_kw)
 
-        self._financial_model.execute(0)
+        with self.timer.phase('financial_execute'):
+            self._financial_model.execute(0)
         logger.info("{} simulation executed".format('battery'))
 
     def calc_gen_max_feasible_kwh(self, interconnect_kw, use_avail_storage: bool = True) -> list:
@@ -306,28 +343,24 @@ class Battery(PowerSource):
         :return: maximum feasible capacity [kWh]: list of floats
         """
         t_step = self.site.interval / 60                                                # hr
-        df = pd.DataFrame()
-        df['E_delivered'] = [max(0, x * t_step) for x in self.Outputs.P]                # [kWh]
-        df['SOC_perc'] = self.Outputs.SOC                                               # [%]
-        df['E_stored'] = df.SOC_perc / 100 * self.system_capacity_kwh                   # [kWh]
-
-        def max_feasible_kwh(row):
-            return min(self.system_capacity_kw * t_step, row.E_delivered + row.E_stored)
+        E_delivered = np.maximum(0, np.asarray(self.Outputs.P, dtype=float) * t_step)  # [kWh]
+        SOC_perc = np.asarray(self.Outputs.SOC, dtype=float)                            # [%]
+        E_stored = SOC_perc / 100 * self.system_capacity_kwh                            # [kWh]
 
         if use_avail_storage:
-            E_max_feasible = df.apply(max_feasible_kwh, axis=1)                             # [kWh]
+            E_max_feasible = np.minimum(self.system_capacity_kw * t_step, E_delivered + E_stored)  # [kWh]
         else:
-            E_max_feasible = df['E_delivered']
+            E_max_feasible = E_delivered
 
         W_ac_nom = self.calc_nominal_capacity(interconnect_kw)
-        E_max_feasible = np.minimum(E_max_feasible, W_ac_nom*t_step) 
-        
-        return list(E_max_feasible)
+        E_max_feasible = np.minimum(E_max_feasible, W_ac_nom*t_step)
+
+        return E_max_feasible.tolist()
 
     @property
     def generation_profile(self) -> Sequence:
         if self.system_capacity_kwh:
-            return self.Outputs.gen
+            return list(self.Outputs.gen)
         else:
             return [0] * self.site.n_timesteps
 
@@ -342,6 +375,6 @@ class Battery(PowerSource):
     @property
     def annual_energy_kwh(self) -> float:
         if self.system_capacity_kw > 0:
-            return sum(self.Outputs.gen)
+            return float(np.sum(self.Outputs.gen))
         else:
             return 0
@@ -6,6 +6,55 @@ import numpy as np
 import pysolar
 import datetime
 
+from hybrid.resource.weather_cache import load_weather_file
+
+
+def get_solar_altitude(latitude_deg, longitude_deg, unix_seconds):
+    """
+    Solar altitude (deg) at an array of times, from the NOAA solar position equations and the refraction correction
+    used by pysolar.solar.get_altitude (within ~0.01 deg of pysolar)
+
+    unix_seconds = array of UTC times in seconds since 1970-01-01
+    """
+    jc = (np.asarray(unix_seconds, dtype=float) / 86400. + 2440587.5 - 2451545.) / 36525.  # Julian century
+    mean_long = np.radians((280.46646 + jc * (36000.76983 + jc * 0.0003032)) % 360)
+    mean_anom = np.radians(357.52911 + jc * (35999.05029 - 0.0001537 * jc))
+    ecc = 0.016708634 - jc * (0.000042037 + 0.0000001267 * jc)
+    eq_ctr = (np.sin(mean_anom) * (1.914602 - jc * (0.004817 + 0.000014 * jc))
+              + np.sin(2 * mean_anom) * (0.019993 - 0.000101 * jc) + np.sin(3 * mean_anom) * 0.000289)
+    omega = np.radians(125.04 - 1934.136 * jc)
+    app_long = np.radians(np.degrees(mean_long) + eq_ctr - 0.00569 - 0.00478 * np.sin(omega))
+    obliq = np.radians(23 + (26 + (21.448 - jc * (46.815 + jc * (0.00059 - jc * 0.001813))) / 60) / 60
+                       + 0.00256 * np.cos(omega))
+    declination = np.arcsin(np.sin(obliq) * np.sin(app_long))
+    y = np.tan(obliq / 2) ** 2
+    eq_time = 4 * np.degrees(y * np.sin(2 * mean_long) - 2 * ecc * np.sin(mean_anom)
+                             + 4 * ecc * y * np.sin(mean_anom) * np.cos(2 * mean_long)
+                             - 0.5 * y ** 2 * np.sin(4 * mean_long) - 1.25 * ecc ** 2 * np.sin(2 * mean_anom))  # min
+    true_solar_time = (np.asarray(unix_seconds, dtype=float) % 86400 / 60. + eq_time + 4 * longitude_deg) % 1440
+    hour_angle = np.radians(true_solar_time / 4 - 180)
+    lat = np.radians(latitude_deg)
+    cos_zenith = np.sin(lat) * np.sin(declination) + np.cos(lat) * np.cos(declination) * np.cos(hour_angle)
+    altitude = np.degrees(np.arcsin(np.clip(cos_zenith, -1, 1)))
+
+    # Refraction correction, as in pysolar.solar.get_refraction_correction at standard temperature and pressure
+    refraction = 101325.0 * 2.830 * 1.02 / (1010.0 * 288.15 * 60.0 * np.tan(np.radians(altitude + 10.3 / (altitude + 5.11))))
+    return altitude + np.where(altitude >= -(0.26667 + 0.5667), refraction, 0.)
+
+
+def get_clear_sky_direct(unix_seconds, altitude_deg):
+    """
+    Clear-sky direct normal irradiance (W/m2) at an array of times, as in pysolar.radiation.get_radiation_direct
+    """
+    day = (np.asarray(unix_seconds, dtype=float) // 86400).astype('datetime64[D]')
+    day_of_year = (day - day.astype('datetime64[Y]')).astype(int) + 1
+    flux = 1160 + 75 * np.sin(2 * np.pi / 365 * (day_of_year - 275))
+    optical_depth = 0.174 + 0.035 * np.sin(2 * np.pi / 365 * (day_of_year - 100))
+    altitude_deg = np.asarray(altitude_deg, dtype=float)
+    is_daytime = altitude_deg > 0
+    air_mass_ratio = 1 / np.sin(np.radians(np.where(is_daytime, altitude_deg, 90.)))
+    return np.where(is_daytime, flux * np.exp(-optical_depth * air_mass_ratio), 0.)
+
 
 class Clustering:
 
@@ -39,6 +88,7 @@ class Clustering:
         self.afp_enforce_Ncluster = True        # Iterate on afp_preference_mult to create the number of clusters specified in n_cluster?
         self.afp_enforce_Ncluster_tol = 0       # Tolerance for number of clusters
         self.afp_enforce_Ncluster_maxiter = 50  # Maximum number of iterations
+        self.afp_warm_start = False             # Start each iteration on afp_preference_mult from the previous converged responsibility/availability matrices? (faster, but can change the clusters found)
 
         # Results
         self.data = {}             # Classification data for complete groups (calculated in calculate_metrics())
@@ -50,6 +100,9 @@ class Clustering:
         self.index_last = -1       # Cluster index that best represents incomplete last group
         self.daily_resource = {}     # Daily DNI, GHI, and wind resource (used only for CSP initial charge state heuristic)
 
+        self._similarity = None      # (classification data, similarity matrix) reused across affinity propagation runs
+        self._afp_messages = None    # Converged (responsibility, availability) matrices of the last affinity propagation run
+
 
 
     def get_default_weights(self):
@@ -140,15 +193,11 @@ class Clustering:
         weather = {k:[] for k in ['year', 'month', 'day', 'hour', 'ghi', 'dhi', 'dni', 'tdry', 'wspd']}
 
         # Get header info
-        header = np.genfromtxt(self.solar_resource_file, delimiter = ',', dtype = 'str', skip_header = 0, max_rows = 2)
-        i = np.where(header[0,:] == 'Latitude')[0][0]
-        weather['lat' ] = float(header[1,i])
-        i = np.where(header[0,:] == 'Longitude')[0][0]
-        weather['lon'] = float(header[1,i])
-        i = np.where(header[0,:] == 'Time Zone')[0][0]
-        weather['tz'] = float(header[1,i])
-        i = np.where(header[0,:] == 'Elevation')[0][0]
-        weather['elev'] = float(header[1,i]) 
+        weather_file = load_weather_file(self.solar_resource_file)
+        weather['lat'] = weather_file.meta_float('Latitude')
+        weather['lon'] = weather_file.meta_float('Longitude')
+        weather['tz'] = weather_file.meta_float('Time Zone')
+        weather['elev'] = weather_file.meta_float('Elevation')
 
         # Read in weather data
         labels = {'year': ['Year'],
@@ -161,15 +210,12 @@ class Clustering:
                 'tdry': ['Tdry', 'Temperature'],
                 'wspd': ['Wspd', 'Wind Speed']}
 
-        header = np.genfromtxt(self.solar_resource_file, dtype=str, delimiter=',', max_rows=1, skip_header=2)
-        data = np.genfromtxt(self.solar_resource_file, dtype=float, delimiter=',', skip_header=3)
         for k in labels.keys():
             found = False
             for j in labels[k]:
-                if j in header:
+                if j in weather_file:
                     found = True
-                    c = header.tolist().index(j)
-                    weather[k] = data[:, c]
+                    weather[k] = np.array(weather_file[j])
             if not found:
                 print('Failed to find data for ' + k + ' in weather file')
 
@@ -194,24 +240,15 @@ class Clustering:
             sunset_local = datetime.datetime(year = location['year'], month = 1, day = 1) + datetime.timedelta(days = day_of_year) + datetime.timedelta(hours = sunset_idx/nperhour)
             sunrise_utc = (sunrise_local - datetime.timedelta(hours = location['tz'])).replace(tzinfo = datetime.timezone.utc)
             sunset_utc = (sunset_local - datetime.timedelta(hours = location['tz'])).replace(tzinfo = datetime.timezone.utc)
-            j = 0
-            found = [False, False]
-            while j<4*nperhour:
-                if not found[0]:
-                    time = sunrise_utc + datetime.timedelta(hours = j/nperhour)
-                    csky = pysolar.radiation.get_radiation_direct(time, pysolar.solar.get_altitude(location['lat'], location['lon'], time))
-                    if csky > csky_cutoff:
-                        sunrise_idx += j
-                        found[0] = True
-                if not found[1]:
-                    time = sunset_utc - datetime.timedelta(hours = j/nperhour)
-                    csky = pysolar.radiation.get_radiation_direct(time, pysolar.solar.get_altitude(location['lat'], location['lon'], time))
-                    if csky > csky_cutoff:
-                        sunset_idx -= (j-1)  
-                        found[1] = True
-                if found[0] and found[1]:
-                    break
-                j+=1
+            # Clear-sky DNI in the 4 hours after sunrise and before sunset, evaluated at once
+            offsets = np.arange(4*nperhour) * 3600. / nperhour
+            times = np.concatenate((sunrise_utc.timestamp() + offsets, sunset_utc.timestamp() - offsets))
+            csky = get_clear_sky_direct(times, get_solar_altitude(location['lat'], location['lon'], times))
+            above = csky.reshape(2, -1) > csky_cutoff
+            if above[0].any():
+                sunrise_idx += int(above[0].argmax())
+            if above[1].any():
+                sunset_idx -= int(above[1].argmax()) - 1
         return sunrise_idx, sunset_idx
 
     def limit_outliers(self, array, cutoff_iqr = 3.0, max_iqr = 3.5):
@@ -266,11 +303,12 @@ class Clustering:
                 print ('Warning: Wind speed data for wind generation was not supplied to clustering algorithm. Using wind speed from solar resource file')
         
  
-        self.daily_resource = {k:np.zeros(365) for k in ['dni', 'ghi', 'wspd']}
-        for d in range(365):
-            self.daily_resource['dni'][d] = hourly_data['dni'][d*n_pts_day : (d+1)*n_pts_day].sum() / 1000.  # kWh/m2/day
-            self.daily_resource['ghi'][d] = hourly_data['ghi'][d*n_pts_day : (d+1)*n_pts_day].sum() / 1000.  # kWh/m2/day
-            self.daily_resource['wspd'][d] = hourly_data['wspd'][d*n_pts_day : (d+1)*n_pts_day].sum()  
+        def daily_sum(data):  # Sum of each day, from (days x points per day) array
+            return np.asarray(data, dtype=float)[:365*n_pts_day].reshape(365, n_pts_day).sum(1)
+
+        self.daily_resource = {'dni': daily_sum(hourly_data['dni']) / 1000.,  # kWh/m2/day
+                               'ghi': daily_sum(hourly_data['ghi']) / 1000.,  # kWh/m2/day
+                               'wspd': daily_sum(hourly_data['wspd'])}
 
         #--- Replace dni, ghi or wind speed at all points with wind speed > stow limit
         csp_stow_wspd = None
@@ -346,30 +384,27 @@ class Clustering:
                 n_pts = n_pts_day if bounds[key] == 'fullday' else sunset_idx - sunrise_idx  # Total points
                 p1 = 0 if bounds[key] == 'fullday' else sunrise_idx    # First relevant point within this day
                 n = float(n_pts) / n_div  # Number of time points per division
-                pts = []
-                wts = []
+                div_wts = np.zeros((n_pts, n_div))  # Weighting factor of each point in the average of each division
                 for i in range(n_div):
                     pstart = i * n  # Start time pt
                     pend = (i + 1) * n  # End time pt
                     # Number of discrete hourly points included in the time period average
                     npt = int(pend) - int(pstart) + 1
                     # Discrete points which are at least partially included in the time period average
-                    pts.append(np.linspace(int(pstart), int(pend), npt, dtype=int))
-                    wts.append(1. / n * np.ones(npt))
-                    wts[i][0] = float(1.0 - (pstart - int(pstart))) / n  # Weighting factor for first point
-                    wts[i][npt - 1] = float(pend - int(pend)) / n  # Weighting factor for last point   
-
-                # Calculate metrics for each day and each division
-                for d in range(365):
-                    for i in range(n_div):
-                        for h in range(len(pts[i])):  # Loop over hours which are at least partially contained in division i
-                            if pts[i][h] == n_pts:
-                                # Hour falls outside of allowed number of hours in the day (allowed as long as weighting factor is 0)
-                                if wts[i][h] > 0.0:
-                                    print('Error calculating weighted average for key ' + key + ' and division ' + str(i))
-                            else:
-                                p = d * n_pts_day + p1 + pts[i][h]  # Point in yearly array
-                                daily_metrics[key][d, i] += (hourly_data[data_name][p] * wts[i][h])
+                    pts = np.linspace(int(pstart), int(pend), npt, dtype=int)
+                    wts = 1. / n * np.ones(npt)
+                    wts[0] = float(1.0 - (pstart - int(pstart))) / n  # Weighting factor for first point
+                    wts[npt - 1] = float(pend - int(pend)) / n  # Weighting factor for last point
+                    if pts[-1] == n_pts:
+                        # Hour falls outside of allowed number of hours in the day (allowed as long as weighting factor is 0)
+                        if wts[-1] > 0.0:
+                            print('Error calculating weighted average for key ' + key + ' and division ' + str(i))
+                        pts, wts = pts[:-1], wts[:-1]
+                    div_wts[pts, i] += wts
+
+                # Calculate metrics for each day and each division from the (days x points) array of relevant points
+                day_pts = np.arange(365)[:, None] * n_pts_day + p1 + np.arange(n_pts)[None, :]  # Points in yearly array
+                daily_metrics[key] = np.asarray(hourly_data[data_name], dtype=float)[day_pts] @ div_wts
 
                 # Normalize daily metrics
                 max_metric = daily_metrics[key].max()
@@ -380,23 +415,18 @@ class Clustering:
         
 
         #--- Create arrays of classification data for groups of days
-        def get_data_for_group(d1, name):  # Get data for metric "name" for group starting on day d1
+        def get_data_for_groups(d1, name):  # Get data for metric "name" for groups starting on days d1 (array)
             if '_prev' in name:
-                days = [d1-1]
+                offsets = [-1]
             elif '_next' in name:
-                days = [d1+self.ndays]
+                offsets = [self.ndays]
             else:
-                days = [d1+i for i in range(self.ndays)]
-            ndays = len(days)
-            ndiv = self.divisions[name]
-            data = np.zeros(ndiv*ndays)
-            for j in range(ndays):
-                d = days[j]
-                if (d >= 0) and (d < 365):
-                    data[j*ndiv:(j+1)*ndiv] = daily_metrics[name][d, :] * self.weights[name]
-                else:
-                    data[j*ndiv:(j+1)*ndiv] = -1e8  # Use a large neative value to designate metrics that don't exist for this group (all others are scaled between 0-1)
-            return data          
+                offsets = list(range(self.ndays))
+            days = np.asarray(d1)[:, None] + np.array(offsets)[None, :]  # (groups x days)
+            exists = (days >= 0) & (days < 365)
+            data = daily_metrics[name][np.clip(days, 0, 364), :] * self.weights[name]  # (groups x days x divisions)
+            data[~exists, :] = -1e8  # Use a large neative value to designate metrics that don't exist for this group (all others are scaled between 0-1)
+            return data.reshape(len(days), -1)
 
         n_group = int(((365-2) / self.ndays))            # Number of complete groups (with existing days before/after)
         self.data = np.zeros((n_group, int(n_metrics)))  # Classification data for complete groups
@@ -404,13 +434,11 @@ class Clustering:
         j = 0
         for k, wt in self.weights.items():
             if wt>0:
-                for g in range(n_group):
-                    d1 = g * self.ndays + 1
-                    groupdata = get_data_for_group(d1, k)
-                    n = len(groupdata)
-                    self.data[g,j:j+n] = groupdata
-                self.data_first[j:j+n] = get_data_for_group(0, k)
-                self.data_last[j:j+n] = get_data_for_group(self.ndays*n_group+1, k)
+                groupdata = get_data_for_groups(np.arange(n_group) * self.ndays + 1, k)
+                n = groupdata.shape[1]
+                self.data[:,j:j+n] = groupdata
+                self.data_first[j:j+n] = get_data_for_groups([0], k)[0]
+                self.data_last[j:j+n] = get_data_for_groups([self.ndays*n_group+1], k)[0]
                 j+=n
 
         return 
@@ -432,6 +460,7 @@ class Clustering:
             i = 0
             finished = False
             damping_original = self.afp_damping
+            self._afp_messages = None
 
             while i < maxiter and not finished:
                 self.afp_preference_mult = mult
@@ -523,16 +552,17 @@ class Clustering:
             clusters['exemplars'] = np.zeros(1, int)
             return clusters
 
+        distsqr, median_distsqr = self.get_similarity()
         if self.afp_preference_mult == 1.0:  # Run with default preference
             pref = None
         else:
-            distsqr = np.zeros((n_group,n_group))
-            for g in range(n_group):
-                distsqr[g,:] =  -((data[g,:] - data[:,:])**2).sum(1)  
-            pref = (np.median(distsqr)) * self.afp_preference_mult
+            pref = median_distsqr * self.afp_preference_mult
 
         alg = AffinityPropagation(damping = self.afp_damping, max_iter=self.Nmaxiter, convergence_iter=self.afp_Nconverge, preference=pref)
-        alg.fit_predict(data)
+        initial_messages = self._afp_messages if self.afp_warm_start else None
+        alg.fit_predict(data, similarity=distsqr, initial_messages=initial_messages)
+        if alg.converged:
+            self._afp_messages = (alg.responsibility, alg.availability)
         clusters['index'] = alg.cluster_index
         clusters['n_cluster'] = alg.n_clusters
         clusters['means'] = alg.cluster_means
@@ -567,6 +597,14 @@ class Clustering:
 
         return 
 
+    def get_similarity(self):
+        # Similarity (negative squared Euclidean distance) between all groups of the classification data and its median.
+        # Computed once per classification data set and reused by every affinity propagation run
+        if self._similarity is None or self._similarity[0] is not self.data:
+            distsqr = AffinityPropagation.compute_similarity(self.data)
+            self._similarity = (self.data, distsqr, np.median(distsqr))
+        return self._similarity[1], self._similarity[2]
+
     def set_sim_days(self):
         self.sim_start_days = (1 + self.clusters['exemplars']*self.ndays).tolist() 
         return
@@ -712,20 +750,18 @@ class Clustering:
         exemplardata = full-year hourly array with data existing only at days within exemplar groupings
         adjust_wt = adjust calculations with first/last days allocated to a Cluster
         """
+        exemplardata = np.asarray(exemplardata, dtype=float)
         npts = len(exemplardata)  # Total number of points in a year
         fulldata = np.zeros((npts))
         ngroup, ncluster = self.clusters['partition_matrix'].shape
         nptshr = int(npts / 8760)
         nptsday = nptshr * 24
 
-        data = np.zeros((nptsday * self.ndays, ncluster))  # Hourly data for each Cluster exemplar
-        for k in range(ncluster):
-            d = self.sim_start_days[k]   # Starting days for each exemplar grouping
-            data[:, k] = exemplardata[d * nptsday:(d + self.ndays) * nptsday]
+        # Hourly data for each Cluster exemplar (clusters x points)
+        data = exemplardata[np.asarray(self.sim_start_days)[:, None] * nptsday + np.arange(nptsday * self.ndays)[None, :]]
 
-        for g in range(ngroup):
-            d = g * self.ndays + 1  # Starting day for data group g
-            fulldata[d * nptsday:(d + self.ndays) * nptsday] = (self.clusters['partition_matrix'][g, :] * data).sum(1)  # Sum of partition matrix x exemplar data points for each hour
+        # Sum of partition matrix x exemplar data points for each hour, for the consecutive groups starting on day 1
+        fulldata[nptsday:(ngroup * self.ndays + 1) * nptsday] = (self.clusters['partition_matrix'] @ data).ravel()
 
         # Fill in first/last days 
         k1 = self.index_first
@@ -742,11 +778,7 @@ class Clustering:
                 print(
                     'First day of the year was not assigned to a Cluster and will be assigned average generation profile from the next ' + str(
                         navg) + ' days.')
-                hourly_avg = np.zeros((nptsday))
-                for d in range(1, navg + 1):
-                    for h in range(24 * nptshr):
-                        hourly_avg[h] += fulldata[d * nptsday + h] / navg
-                fulldata[0:nptsday] = hourly_avg
+                fulldata[0:nptsday] = fulldata[nptsday:(navg + 1) * nptsday].reshape(navg, nptsday).mean(0)
 
             nexclude = 364 - ngroup * self.ndays # Number of excluded days at the end of the year
             if nexclude > 0:
@@ -755,12 +787,9 @@ class Clustering:
                     print('Last ' + str(
                         nexclude) + ' days were not assigned to a Cluster and will be assigned average generation profile from prior ' + str(
                         navg) + ' days.')
-                    hourly_avg = np.zeros((nexclude * nptsday))
                     d1 = 365 - nexclude - navg  # First day to include in average
-                    for d in range(d1, d1 + navg):
-                        for h in range(nptsday):
-                            hourly_avg[h] += fulldata[d * nptsday + h] / navg
-                    fulldata[h1: h1 + nexclude * nptsday] = hourly_avg
+                    hourly_avg = fulldata[d1 * nptsday:(d1 + navg) * nptsday].reshape(navg, nptsday).mean(0)
+                    fulldata[h1: h1 + nexclude * nptsday] = np.tile(hourly_avg, nexclude)
 
         if dtype is bool:
             fulldata = np.array(fulldata, dtype=bool)
@@ -775,31 +804,19 @@ class Clustering:
         """
         Nprev = 1
         Nnext = 1
+        hourly = np.asarray(hourly, dtype=float)
         Ngroup, Ncluster = self.clusters['partition_matrix'].shape
         Ndaystot = self.ndays + Nprev + Nnext  # Number of days that will be included in the simulation (including previous / next days)
         Nptshr = int(len(hourly) / 8760)
 
-        avg = np.zeros((Ncluster, Ndaystot * 24 * Nptshr))
-        for g in range(Ngroup):
-            d = g * self.ndays + 1  # First day to be counted in simulation group g
-            d1 = max(0, d - Nprev)  # First day to be included in simulation group g (Nprev days before day d if possible)
-            Nprev_actual = d - d1   # Actual number of previous days that can be included
-            Ndaystot_actual = self.ndays + Nprev_actual + Nnext
-            h = d1 * 24 * Nptshr  # First time point included in simulation group g
-            if Nprev == Nprev_actual:
-                vals = np.array(hourly[h:h + Ndaystot * 24 * Nptshr])  # Hourly values for only the days included in the simulation for group g
-            else:  # Number of previous days was reduced (only occurs at beginning of the year)
-                Nvoid = Nprev - Nprev_actual  # Number of previous days which don't exist in the data file (only occurs when Nprev >1)
-                vals = []
-                for v in range(Nvoid):  # Days for which data doesn't exist
-                    vals = np.append(vals, hourly[0:24 * Nptshr])  # Use data from first day
-                vals = np.append(vals, hourly[h:h + Ndaystot_actual * 24 * Nptshr])
-
-            for k in range(Ncluster):
-                avg[k, :] += vals * self.clusters['partition_matrix'][g, k]  # Sum of hourly array * partition_matrix value for Cluster k over all points (g)
-
-        for k in range(Ncluster):
-            avg[k, :] = avg[k, :] / self.clusters['partition_matrix'].sum(0)[k]  # Divide by sum of partition matrix over all groups to normalize
+        # Hourly values for the days included in the simulation of each group (groups x points), starting Nprev days
+        # before the first counted day. Data from the first day is used for previous days which don't exist.
+        days = (np.arange(Ngroup) * self.ndays + 1 - Nprev)[:, None] + np.arange(Ndaystot)[None, :]
+        pts = np.maximum(days, 0)[:, :, None] * 24 * Nptshr + np.arange(24 * Nptshr)[None, None, :]
+        vals = hourly[pts.reshape(Ngroup, -1)]
+
+        # Sum of hourly array * partition_matrix value for each Cluster over all groups, divided by sum of partition matrix over all groups to normalize
+        avg = (self.clusters['partition_matrix'].T @ vals) / self.clusters['partition_matrix'].sum(0)[:, None]
 
         if self.ndays == 2:  # Adjust averages to include first/last days of the year (Not currently defined/tested except for 2-day clusters)
             k1 = self.index_first
@@ -835,6 +852,18 @@ class AffinityPropagation:
         self.wcss = None
         self.exemplars = None
         self.converged = None
+        self.responsibility = None
+        self.availability = None
+
+    @staticmethod
+    def compute_similarity(data, max_block_size=2**21):
+        # Negative squared Euclidean distance between all pairs of points, broadcast over blocks of rows to limit memory
+        n_obs, n_features = data.shape
+        S = np.empty((n_obs, n_obs))
+        rows_per_block = max(1, int(max_block_size / max(1, n_obs * n_features)))
+        for p in range(0, n_obs, rows_per_block):
+            S[p:p+rows_per_block, :] = -((data[p:p+rows_per_block, np.newaxis, :] - data[np.newaxis, :, :]) ** 2).sum(2)
+        return S
 
     def compute_wcss(self, data, cluster_index, means):
         # Computes the within-cluster sum-of-squares
@@ -844,15 +873,18 @@ class AffinityPropagation:
             dist = ((data - means[k, :]) ** 2).sum(1)  # Distance to Cluster k centroid
             self.wcss += (dist * (cluster_index == k)).sum()
 
-    def fit_predict(self, data):
+    def fit_predict(self, data, similarity=None, initial_messages=None):
+        # similarity: (optional) precomputed similarity matrix from compute_similarity(data), which is not modified
+        # initial_messages: (optional) (responsibility, availability) matrices to start from, e.g., from a converged run
+        #   with a different preference
         n_obs, n_features = data.shape  # Number of observations and features
 
         # Compute similarities between data points (negative of Euclidean distance)
-        S = np.zeros((n_obs, n_obs))
+        if similarity is None:
+            S = self.compute_similarity(data)
+        else:
+            S = similarity.copy()
         inds = np.arange(n_obs)
-        for p in range(n_obs):
-            # Negative squared Euclidean distance between pt p and all other points
-            S[p, :] = -((data[p, :] - data[:, :]) ** 2).sum(1)
 
         if self.preference:  # Preference is specified
             S[inds, inds] = self.preference
@@ -865,41 +897,44 @@ class AffinityPropagation:
         S += 1.e-8*mag * S * (np.random.random_sample((n_obs, n_obs)) - 0.5)
 
         # Initialize availability and responsibility matrices
-        A = np.zeros((n_obs, n_obs))
-        R = np.zeros((n_obs, n_obs))
+        if initial_messages is None:
+            A = np.zeros((n_obs, n_obs))
+            R = np.zeros((n_obs, n_obs))
+        else:
+            R, A = (m.copy() for m in initial_messages)
         exemplars = np.zeros(n_obs, bool)
+        M = np.empty((n_obs, n_obs))
+        update = np.empty((n_obs, n_obs))
+        posR = np.empty((n_obs, n_obs))
 
         q = 0
         count = 0
         while (q < self.max_iter) and (count < self.convergence_iter):
             exemplars_prev = exemplars
-            update = np.zeros((n_obs, n_obs))
 
             # Update responsibility
-            M = A + S
+            np.add(A, S, out=M)
             k = M.argmax(axis=1)  # Location of maximum value in each row of M
             maxval = M[inds, k]  # Maximum values in each row of M
-            update = S - np.reshape(maxval, (n_obs, 1))  # S - max value in each row
+            np.subtract(S, maxval[:, np.newaxis], out=update)  # S - max value in each row
             M[inds, k] = -np.inf
-            k2 = M.argmax(axis=1)  # Location of second highest value in each row of M
-            maxval = M[inds, k2]  # Second highest value in each row of M
+            maxval = M.max(axis=1)  # Second highest value in each row of M
             update[inds, k] = S[inds, k] - maxval
-            R = self.damping * R + (1. - self.damping) * update
+            R *= self.damping
+            R += (1. - self.damping) * update
 
             # Update availability
-            posR = R.copy()
-            posR[posR < 0] = 0.0  # Only positive values of R matrix
-            sumR = posR.sum(0)
-            values = sumR - np.diag(posR)
-            update[:] = values  # Sum positive values of R over all rows (i)
-            update -= posR
-            update[:, inds] += np.diag(R)
-            update[update > 0] = 0.0
+            np.maximum(R, 0.0, out=posR)  # Only positive values of R matrix
+            values = posR.sum(0) - posR.diagonal()  # Sum positive values of R over all rows (i)
+            np.subtract(values, posR, out=update)
+            update += R.diagonal()
+            np.minimum(update, 0.0, out=update)
             update[inds, inds] = values
-            A = self.damping * A + (1. - self.damping) * update
+            A *= self.damping
+            A += (1. - self.damping) * update
 
             # Identify exemplars
-            exemplars = (np.diag(A) + np.diag(R)) > 0
+            exemplars = (A.diagonal() + R.diagonal()) > 0
             #exemplars = (A + R).argmax(1) == inds  # Exemplar for point i is value of k that maximizes A[i,k]+R[i,k]
             diff = (exemplars != exemplars_prev).sum()
             if diff == 0:
@@ -922,12 +957,9 @@ class AffinityPropagation:
         clusters = S[:, exemplars].argmin(1)  # Assign points to clusters based on distance to the possible exemplars
         for k in range(found_exemplars):  # Loop over clusters
             pts = np.where(clusters == k)[0]  # All points in Cluster k
-            n_pts = len(pts)
-            if n_pts > 2:
-                dist_sum = np.zeros(n_pts)
-                for p in range(n_pts):
-                    # Calculate total distance between point p and all other points in Cluster k
-                    dist_sum[p] += (S[pts[p], pts]).sum()
+            if len(pts) > 2:
+                # Total distance between each point and all other points in Cluster k
+                dist_sum = S[np.ix_(pts, pts)].sum(1)
                 i = dist_sum.argmin()
                 exemplars[k] = pts[i]  # Replace exemplar k with point that minimizes wcss
 
@@ -942,6 +974,7 @@ class AffinityPropagation:
         self.cluster_index = cluster_index
         self.exemplars = exemplars
         self.converged = converged
+        self.responsibility = R
+        self.availability = A
 
         return self
-
@@ -0,0 +1,110 @@
+import copy
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from hybrid.log import hybrid_logger as logger
+
+
+_default_cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'resource_files', 'csp_cache')
+_cache_dir: Optional[str] = _default_cache_dir
+_loaded: Dict[str, dict] = {}
+
+
+def set_csp_cache_dir(cache_dir: Optional[str]):
+    """
+    Sets the directory of the on-disk CSP setup cache. ``None`` disables the on-disk cache, so setup results are only
+    reused within a process.
+    """
+    global _cache_dir
+    _cache_dir = cache_dir
+
+
+def get_csp_cache_dir() -> Optional[str]:
+    return _cache_dir
+
+
+def clear_csp_cache():
+    """Clears the in-process CSP setup cache. The on-disk cache is unaffected."""
+    _loaded.clear()
+
+
+def ssc_inputs_key(params: dict, exclude: Iterable[str] = (), **extra) -> str:
+    """
+    Hash identifying a set of SSC inputs, for content-addressed caching of SSC results.
+
+    :param params: SSC input parameters, {name: value}
+    :param exclude: names of parameters that do not affect the cached results
+    :param extra: other values the cached results depend on, e.g., the weather file key
+
+    :returns: hex digest
+    """
+    exclude = set(exclude)
+    h = hashlib.sha1()
+    for name, value in sorted(list(params.items()) + [('__' + k, v) for k, v in extra.items()]):
+        if name in exclude:
+            continue
+        h.update(name.encode())
+        h.update(b'\0')
+        if isinstance(value, (list, tuple, np.ndarray)):
+            try:
+                array = np.asarray(value, dtype=float)
+                h.update(str(array.shape).encode())
+                h.update(array.tobytes())
+                continue
+            except (TypeError, ValueError):
+                pass        # ragged or non-numeric
+            h.update(json.dumps(value, default=str).encode())
+        else:
+            h.update(repr(value).encode())
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def _cache_file(kind: str, key: str) -> str:
+    return os.path.join(_cache_dir, "{}_{}.pkl".format(kind, key))
+
+
+def get_cached(kind: str, key: str) -> Optional[dict]:
+    """
+    :param kind: kind of result, e.g., 'forecast' or 'field'
+    :param key: :func:`ssc_inputs_key` of the inputs
+
+    :returns: a copy of the cached results, or None if there are none
+    """
+    name = kind + '_' + key
+    if name not in _loaded and _cache_dir is not None and os.path.isfile(_cache_file(kind, key)):
+        try:
+            with open(_cache_file(kind, key), 'rb') as f:
+                _loaded[name] = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning("Ignoring unreadable CSP cache entry {}: {}".format(_cache_file(kind, key), e))
+    if name in _loaded:
+        return copy.deepcopy(_loaded[name])
+    return None
+
+
+def set_cached(kind: str, key: str, results: dict):
+    """
+    Caches results in process and, unless disabled, on disk so other processes such as parallel optimization workers
+    reuse them. Files are written atomically.
+
+    :param kind: kind of result, e.g., 'forecast' or 'field'
+    :param key: :func:`ssc_inputs_key` of the inputs
+    :param results: results to cache
+    """
+    _loaded[kind + '_' + key] = copy.deepcopy(results)
+    if _cache_dir is None:
+        return
+    try:
+        os.makedirs(_cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=_cache_dir, suffix='.pkl', delete=False) as f:
+            pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, _cache_file(kind, key))
+    except OSError as e:
+        logger.warning("Could not write CSP cache to {}: {}".format(_cache_dir, e))
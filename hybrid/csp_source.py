@@ -13,10 +13,23 @@ import PySAM.Singleowner as Singleowner
 from hybrid.dispatch.power_sources.csp_dispatch import CspDispatch
 from hybrid.power_source import *
 from hybrid.sites import SiteInfo
+from hybrid.resource.weather_cache import load_weather_file, weather_file_key
+from hybrid import csp_setup_cache
 
 
 class CspOutputs:
-    """Object for storing CSP outputs from SSC (SAM's Simulation Core) and dispatch optimization."""
+    """
+    Object for storing CSP outputs from SSC (SAM's Simulation Core) and dispatch optimization.
+
+    Time series are preallocated numpy arrays indexed by simulation time step and filled with one slice assignment per
+    dispatch horizon. Use :meth:`export` for plain lists.
+    """
+    dispatch_keys = ['available_thermal_generation', 'cycle_ambient_efficiency_correction', 'condenser_losses',
+                     'thermal_energy_storage', 'receiver_startup_inventory', 'receiver_thermal_power',
+                     'receiver_startup_consumption', 'is_field_generating', 'is_field_starting', 'incur_field_start',
+                     'cycle_startup_inventory', 'system_load', 'cycle_generation', 'cycle_thermal_ramp',
+                     'cycle_thermal_power', 'is_cycle_generating', 'is_cycle_starting', 'incur_cycle_start']
+
     def __init__(self):
         self.ssc_time_series = {}
         self.dispatch = {}
@@ -44,11 +57,11 @@ class CspOutputs:
 
         if is_empty:
             for name, val in ssc_outputs.items():
-                if isinstance(val, list) and len(val) == ntot:  
-                    self.ssc_time_series[name] = [0.0]*ntot
+                if isinstance(val, list) and len(val) == ntot:
+                    self.ssc_time_series[name] = np.zeros(ntot)
         
-        for name in self.ssc_time_series.keys():
-            self.ssc_time_series[name][i:i+n] = ssc_outputs[name][s1:s1+n]
+        for name, series in self.ssc_time_series.items():
+            series[i:i+n] = ssc_outputs[name][s1:s1+n]
 
     def store_dispatch_outputs(self, dispatch: CspDispatch, n_periods: int, sim_start_time: int):
         """
@@ -58,20 +71,21 @@ class CspOutputs:
         :param n_periods: Number of periods to store dispatch outputs
         :param sim_start_time: The first simulation hour of the dispatch horizon
         """
-        outputs_keys = ['available_thermal_generation', 'cycle_ambient_efficiency_correction', 'condenser_losses',
-                        'thermal_energy_storage', 'receiver_startup_inventory', 'receiver_thermal_power',
-                        'receiver_startup_consumption', 'is_field_generating', 'is_field_starting', 'incur_field_start',
-                        'cycle_startup_inventory', 'system_load', 'cycle_generation', 'cycle_thermal_ramp',
-                        'cycle_thermal_power', 'is_cycle_generating', 'is_cycle_starting', 'incur_cycle_start']
-
         is_empty = (len(self.dispatch) == 0)
         if is_empty:
-            for key in outputs_keys:
-                self.dispatch[key] = [0.0] * 8760
+            for key in self.dispatch_keys:
+                self.dispatch[key] = np.zeros(8760)
 
-        for key in outputs_keys:
+        for key in self.dispatch_keys:
             self.dispatch[key][sim_start_time: sim_start_time + n_periods] = getattr(dispatch, key)[0: n_periods]
 
+    def export(self) -> dict:
+        """
+        :returns: {'ssc_time_series': {name: list of values}, 'dispatch': {name: list of values}}
+        """
+        return {'ssc_time_series': {name: list(series) for name, series in self.ssc_time_series.items()},
+                'dispatch': {name: list(series) for name, series in self.dispatch.items()}}
+
 
 class CspPlant(PowerSource):
     _system_model: None
@@ -82,6 +96,15 @@ class CspPlant(PowerSource):
     param_files: dict
     """Files contain default SSC parameter values"""
 
+    # SSC inputs that do not change the forecast or field setup results, which are cached by their other inputs:
+    # the weather data (keyed by weather file instead), simulation times, dispatch targets and plant state
+    setup_cache_exclude = ['solar_resource_data', 'time_start', 'time_stop',
+                           'is_rec_su_allowed_in', 'is_rec_sb_allowed_in', 'is_pc_su_allowed_in',
+                           'is_pc_sb_allowed_in', 'q_pc_target_su_in', 'q_pc_target_on_in', 'q_pc_max_in']
+    # Thermal storage inputs, which are overridden or only change tank losses in the forecast
+    tes_cache_exclude = ['tshours', 'rec_su_delay', 'rec_qf_delay', 'cold_tank_max_heat', 'hot_tank_max_heat',
+                         'h_tank']
+
     def __init__(self,
                  name: str,
                  tech_name: str,
@@ -100,6 +123,12 @@ class CspPlant(PowerSource):
             #. ``cycle_capacity_kw``: float, Power cycle  design turbine gross output [kWe]
             #. ``solar_multiple``: float, Solar multiple [-]
             #. ``tes_hours``: float, Full load hours of thermal energy storage [hrs]
+            #. ``use_setup_cache``: (optional, default = True) bool, If True, the results of
+               :py:func:`run_year_for_max_thermal_gen` (and the tower field layout) are reused for identical SSC
+               inputs and weather, see :py:mod:`hybrid.csp_setup_cache`
+            #. ``warm_start_ssc``: (optional, default = False) bool, If True, SSC runs reuse a warm data container
+               and only set the parameters changed since the previous run, which reduces the overhead of each
+               dispatch horizon simulation
         """
 
         required_keys = ['cycle_capacity_kw', 'solar_multiple', 'tes_hours']
@@ -124,6 +153,8 @@ class CspPlant(PowerSource):
         self.cycle_capacity_kw: float = csp_config['cycle_capacity_kw']
         self.solar_multiple: float = csp_config['solar_multiple']
         self.tes_hours: float = csp_config['tes_hours']
+        self.use_setup_cache: bool = csp_config.get('use_setup_cache', True)
+        self.ssc.warm_start = csp_config.get('warm_start_ssc', False)
 
         # Set full annual weather data once
         self.set_weather(self.year_weather_df)
@@ -172,25 +203,22 @@ class CspPlant(PowerSource):
 
         :returns: Weather file data (DataFrame)
         """
-        df = pd.read_csv(self.site.solar_resource.filename, sep=',', skiprows=2, header=0)
+        weather = load_weather_file(self.site.solar_resource.filename)
+        df = pd.DataFrame({col: weather[col].astype(int) if col in weather.integer_columns else np.array(weather[col])
+                           for col in weather.columns})
         date_cols = ['Year', 'Month', 'Day', 'Hour', 'Minute']
         df.index = pd.to_datetime(df[date_cols])
         df.index.name = 'datetime'
         df.drop(date_cols, axis=1, inplace=True)
 
         df.index = df.index.map(lambda t: t.replace(year=df.index[0].year))  # normalize all years to that of 1/1
-        df = df[df.columns.drop(list(df.filter(regex='Unnamed')))]  # drop unnamed columns (which are empty)
-
-        def get_weatherfile_location(tmy3_path):
-            df_meta = pd.read_csv(tmy3_path, sep=',', header=0, nrows=1)
-            return {
-                'latitude': float(df_meta['Latitude'][0]),
-                'longitude': float(df_meta['Longitude'][0]),
-                'timezone': int(df_meta['Time Zone'][0]),
-                'elevation': float(df_meta['Elevation'][0])
-            }
 
-        location = get_weatherfile_location(self.site.solar_resource.filename)
+        location = {
+            'latitude': weather.meta_float('Latitude'),
+            'longitude': weather.meta_float('Longitude'),
+            'timezone': int(weather.meta_float('Time Zone')),
+            'elevation': weather.meta_float('Elevation')
+        }
         df.attrs.update(location)
         return df
 
@@ -417,6 +445,27 @@ class CspPlant(PowerSource):
         state.pop('heat_into_cycle')
         self.ssc.set(state)
 
+    def setup_copy(self, memo: dict):
+        """
+        Prepares a ``copy.deepcopy`` memo for copying this plant. In addition to :func:`PowerSource.setup_copy`, the
+        SSC library handle and the weather data, which are replaced rather than modified, are shared.
+
+        :param memo: memo dictionary passed to ``copy.deepcopy``
+        """
+        super().setup_copy(memo)
+        shared = [self.year_weather_df]
+        if self.ssc.wrapper == 'pyssc':
+            shared.append(self.ssc.ssc)
+            shared.extend(self.ssc.params[key] for key in ('solar_resource_data', 'wlim_series', 'dispatch_factors_ts')
+                          if key in self.ssc.params)
+        else:
+            tech_model = PowerSource.copy_model(self.ssc.tech_model)
+            memo[id(self.ssc.tech_model)] = tech_model
+            if hasattr(self.ssc, 'financial_model'):
+                memo[id(self.ssc.financial_model)] = PowerSource.copy_model(self.ssc.financial_model, tech_model)
+        for data in shared:
+            memo[id(data)] = data
+
     def setup_performance_model(self):
         """
         Runs a year long forecasting simulation of csp thermal generation, then sets power cycle efficiency tables and
@@ -426,6 +475,23 @@ class CspPlant(PowerSource):
         self.set_cycle_efficiency_tables(ssc_outputs)
         self.set_solar_thermal_resource(ssc_outputs)
 
+    def setup_cache_key(self, exclude: list = ()) -> str:
+        """
+        Key of the current SSC inputs and weather file, identifying cached setup results
+
+        :param exclude: names of additional SSC inputs that do not affect the cached results
+
+        :returns: key for :py:mod:`hybrid.csp_setup_cache`
+        """
+        exclude = self.setup_cache_exclude + list(self.get_plant_state_io_map().keys()) + list(exclude)
+        if self.ssc.wrapper == 'pyssc':
+            params, ssc_version = self.ssc.params, self.ssc.ssc.version()
+        else:
+            params, ssc_version = self.ssc.export_params(), None
+        return csp_setup_cache.ssc_inputs_key(params, exclude,
+                                              weather=weather_file_key(self.site.solar_resource.filename),
+                                              ssc_version=ssc_version)
+
     def run_year_for_max_thermal_gen(self):
         """
         Call PySSC to estimate solar thermal resource for the whole year for dispatch model
@@ -434,7 +500,11 @@ class CspPlant(PowerSource):
             Solar field production is "forecasted" by setting TES hours to 100 and receiver start-up time
             and energy to very small values.
 
-        :returns: ssc_outputs: dict, SSC's output dictionary containing the previous simulation results
+        If ``use_setup_cache``, the forecast is reused whenever the SSC inputs, apart from thermal storage size, and
+        the weather file are unchanged.
+
+        :returns: ssc_outputs: dict, SSC's output dictionary containing the previous simulation results, or only the
+            outputs used by the dispatch model if cached
         """
         self.value('is_dispatch_targets',  0)
         # Setting simulation times and simulate the horizon
@@ -444,10 +514,26 @@ class CspPlant(PowerSource):
         # Inflate TES capacity, set near-zero startup requirements, and run ssc estimates
         original_values = {k: self.ssc.get(k) for k in ['tshours', 'rec_su_delay', 'rec_qf_delay']}
         self.ssc.set({'tshours': 100, 'rec_su_delay': 0.001, 'rec_qf_delay': 0.001})
+
+        key = None
+        if self.use_setup_cache:
+            key = self.setup_cache_key(exclude=self.tes_cache_exclude)
+            ssc_outputs = csp_setup_cache.get_cached('forecast', key)
+            if ssc_outputs is not None:
+                self.ssc.set(original_values)
+                return ssc_outputs
+
         print("Forecasting CSP thermal energy production...")
-        ssc_outputs = self.ssc.execute()
+        with self.timer.phase('ssc_execute'):
+            ssc_outputs = self.ssc.execute()
         self.ssc.set(original_values)
 
+        if key is not None:
+            cached_outputs = ['Q_thermal', 'qsf_expected', 'cycle_eff_load_table', 'cycle_eff_Tdb_table',
+                              'cycle_wcond_Tdb_table', 'pc_config', 'ud_ind_od']
+            csp_setup_cache.set_cached('forecast', key, {k: ssc_outputs[k] for k in cached_outputs
+                                                         if k in ssc_outputs})
+
         return ssc_outputs
 
     def set_cycle_efficiency_tables(self, ssc_outputs):
@@ -533,7 +619,8 @@ class CspPlant(PowerSource):
         if not self.ssc:
             raise ValueError('SSC was not correctly setup...')
 
-        results = self.ssc.execute()
+        with self.timer.phase('ssc_execute'):
+            results = self.ssc.execute()
         if not results["cmod_success"]:
             raise ValueError('PySSC simulation failed...')
 
@@ -631,7 +718,8 @@ class CspPlant(PowerSource):
             params = rapidjson.load(f)
         cf.set(params)
         cf.set({'total_installed_cost': self.calculate_total_installed_cost()})
-        outputs = cf.execute()
+        with self.timer.phase('ssc_execute'):
+            outputs = cf.execute()
         construction_financing_cost = outputs['construction_financing_cost']
         return outputs['construction_financing_cost']
 
@@ -676,12 +764,14 @@ class CspPlant(PowerSource):
 
         if len(self.generation_profile) == self.site.n_timesteps:
             single_year_gen = self.generation_profile
-            self._financial_model.value('gen', list(single_year_gen) * project_life)
+            lifetime_gen = list(single_year_gen) * project_life
+            self._financial_model.value('gen', lifetime_gen)
 
-            self._financial_model.value('system_pre_curtailment_kwac', list(single_year_gen) * project_life)
-            self._financial_model.value('annual_energy_pre_curtailment_ac', sum(single_year_gen))
+            self._financial_model.value('system_pre_curtailment_kwac', lifetime_gen)
+            self._financial_model.value('annual_energy_pre_curtailment_ac', float(np.sum(single_year_gen)))
 
-        self._financial_model.execute(0)
+        with self.timer.phase('financial_execute'):
+            self._financial_model.execute(0)
         logger.info("{} simulation executed".format(str(type(self).__name__)))
 
     def calc_gen_max_feasible_kwh(self, interconnect_kw, cap_cred_avail_storage: bool = True) -> list:
@@ -699,118 +789,111 @@ class CspPlant(PowerSource):
 
         :returns: list of floats, maximum feasible generation [kWh]
         """
-        SIGMA = 1e-6
-
         # Verify power block startup does not span timesteps
         t_step = self.value("time_steps_per_hour")                            # [hr]
         if self.value("startup_time") > t_step:
             raise NotImplementedError("Capacity credit calculations have not been implemented \
                                       for power block startup times greater than one timestep.")
 
-        df = pd.DataFrame()
-        df['Q_pb_startup'] = [x * 1e3 for x in self.outputs.ssc_time_series["q_dot_pc_startup"]]    # [kWt]
-        df['E_pb_startup'] = [x * 1e3 for x in self.outputs.ssc_time_series["q_pc_startup"]]        # [kWht]
-        df['W_pb_gross'] = [x * 1e3 for x in self.outputs.ssc_time_series["P_cycle"]]               # [kWe] Always average over entire timestep
-        df['E_tes'] = [x * 1e3 for x in self.outputs.ssc_time_series["e_ch_tes"]]                   # [kWht]
-        df['eta_pb'] = self.outputs.ssc_time_series["eta"]                                          # [-]
-        df['W_pb_net'] = [x * 1e3 for x in self.outputs.ssc_time_series["P_out_net"]]  # kWe 
-        df['Q_pb'] = [x * 1e3 for x in self.outputs.ssc_time_series["q_pb"]]  # kWt 
-
-        def power_block_state(Q_pb_startup, W_pb_gross):
-            """Simplified power block operating states.
-
-            ===========   ==========================================
-            State         Condition
-            ===========   ==========================================
-            [off]         (startup == 0 and gross output power == 0)
-            [starting]    (startup  > 0 and gross output power == 0)
-            [started]     (startup  > 0 and gross output power  > 0)
-            [on]          (startup == 0 and gross output power  > 0) -> on to off transition still applicable
-            ===========   ==========================================
-
-            :returns: 'off'|'starting'|'started'|'on': string
-            """
-            if abs(Q_pb_startup) < SIGMA and abs(W_pb_gross) < SIGMA:
-                return 'off'
-            elif Q_pb_startup > SIGMA and abs(W_pb_gross) < SIGMA:
-                return 'starting'
-            elif Q_pb_startup > SIGMA and W_pb_gross > SIGMA:
-                return 'started'
-            elif abs(Q_pb_startup) < SIGMA and W_pb_gross > SIGMA:
-                return 'on'
-            else:
-                return None
-
-        def max_feasible_kwh(row):
-            """
-            [off]      = E_pb_possible|t_pb_on - E_startup
-            [starting] = 0
-            [started]  = E_pb_possible|t_pb_on
-            [on]       = E_pb_possible|t_step
-
-            :param row: Pandas Series of a row from main dataframe
-
-            :returns: maximum feasible energy from power block [kWhe]
-            """
-            state = power_block_state(row.Q_pb_startup, row.W_pb_gross)
-
-            if state == 'starting':
-                return 0    # [kWhe]
-
-            # 1. What's the maximum the power block could generate with unlimited resource, outside of startup time?
-            if state == 'off':
-                t_pb_startup = self.value("startup_time")                 # [hr]
-            elif state == 'started':
-                #t_pb_startup = row.E_pb_startup / row.Q_pb_startup \
-                #                if row.E_pb_startup > SIGMA and \
-                #                row.Q_pb_startup > SIGMA \
-                #                else 0  #TODO: reported q_dot_pc_startup is timestep average so t_pb_startup = t_step from this calculation
-
-                t_pb_startup  = t_step * (1.0 - row.eta_pb / (row.W_pb_gross / (row.Q_pb - row.Q_pb_startup)))  \
-                                if row.E_pb_startup > SIGMA and row.Q_pb_startup > SIGMA \
-                                else 0    # Fraction of timestep used for startup = 1.0 - (timestep-averaged efficiency / instantaneous efficiency while on)             
-
-            elif state == 'on':
-                t_pb_startup = 0
-            else:
-                return None
-            W_pb_nom = self.cycle_capacity_kw                                           # [kWe]
-            f_pb_max = self.value("cycle_max_frac")                       # [-]
-            W_pb_max = W_pb_nom * f_pb_max                                              # [kWe]
-            E_pb_max = max(W_pb_max * (t_step - t_pb_startup), row.W_pb_gross * t_step)  # [kWhe]  
-
-            # 2. What did the power block actually generate?
-            if state == 'off':
-                E_pb_gross = 0                                                          # [kWhe]
-            elif state == 'started' or state == 'on':
-                E_pb_gross = row.W_pb_gross * t_step                                    # [kWhe] W_pb_gross avg over entire timestep
-            else:
-                return None
-
-            # 3. What more could the power block generate if it used all the remaining TES (with no physical constraints)?
-            if state == 'off':
-                eta_pb_nom = self.cycle_nominal_efficiency                     # [-]
-                f_pb_startup_of_nominal = self.value("startup_frac")      # [-]
-                E_pb_startup = W_pb_nom / eta_pb_nom * f_pb_startup_of_nominal * t_pb_startup  # [kWht]
-                dE_pb_rest_of_tes = max(0, row.E_tes - E_pb_startup) * eta_pb_nom              # [kWht]
-            elif state == 'started' or state == 'on':
-                dE_pb_rest_of_tes = row.E_tes * row.eta_pb                              # [kWhe]
-            else:
-                return None
-
-            # 4. Thus, what could the power block have generated if it utilized more TES?
-            E_pb_gross_max_feasible = min(E_pb_max, E_pb_gross + dE_pb_rest_of_tes)     # [kWhe]
-            return E_pb_gross_max_feasible
+        ts = self.outputs.ssc_time_series
+        Q_pb_startup = np.asarray(ts["q_dot_pc_startup"], dtype=float) * 1e3     # [kWt]
+        E_pb_startup = np.asarray(ts["q_pc_startup"], dtype=float) * 1e3         # [kWht]
+        W_pb_gross = np.asarray(ts["P_cycle"], dtype=float) * 1e3                # [kWe] Always average over entire timestep
+        E_tes = np.asarray(ts["e_ch_tes"], dtype=float) * 1e3                    # [kWht]
+        eta_pb = np.asarray(ts["eta"], dtype=float)                              # [-]
+        W_pb_net = np.asarray(ts["P_out_net"], dtype=float) * 1e3                # [kWe]
+        Q_pb = np.asarray(ts["q_pb"], dtype=float) * 1e3                         # [kWt]
 
         if cap_cred_avail_storage:
-            E_pb_max_feasible = np.maximum(df['W_pb_net']*t_step, df.apply(max_feasible_kwh, axis=1)*self.value('gross_net_conversion_factor')) # [kWhe]
+            E_pb_max_feasible = np.maximum(W_pb_net * t_step,
+                                           self.calc_pb_max_feasible_kwh(Q_pb_startup, E_pb_startup, W_pb_gross,
+                                                                         E_tes, eta_pb, Q_pb, t_step)
+                                           * self.value('gross_net_conversion_factor'))  # [kWhe]
         else:
-            E_pb_max_feasible = df['W_pb_net']*t_step 
+            E_pb_max_feasible = W_pb_net * t_step
 
         W_ac_nom = self.calc_nominal_capacity(interconnect_kw)
         E_pb_max_feasible = np.minimum(E_pb_max_feasible, W_ac_nom*t_step)  # Limit to nominal capacity here, to avoid discrepancies between single-technology and hybrid capacity credits
 
-        return list(E_pb_max_feasible)
+        return E_pb_max_feasible.tolist()
+
+    def calc_pb_max_feasible_kwh(self, Q_pb_startup: np.ndarray, E_pb_startup: np.ndarray, W_pb_gross: np.ndarray,
+                                 E_tes: np.ndarray, eta_pb: np.ndarray, Q_pb: np.ndarray, t_step: float) -> np.ndarray:
+        """
+        Calculates the maximum feasible gross energy from the power block for every timestep at once.
+
+        Simplified power block operating states:
+
+        ===========   ==========================================
+        State         Condition
+        ===========   ==========================================
+        [off]         (startup == 0 and gross output power == 0)
+        [starting]    (startup  > 0 and gross output power == 0)
+        [started]     (startup  > 0 and gross output power  > 0)
+        [on]          (startup == 0 and gross output power  > 0) -> on to off transition still applicable
+        ===========   ==========================================
+
+        Maximum feasible energy by state:
+
+        [off]      = E_pb_possible|t_pb_on - E_startup
+        [starting] = 0
+        [started]  = E_pb_possible|t_pb_on
+        [on]       = E_pb_possible|t_step
+
+        Timesteps that do not fall in any of the above states are returned as NaN.
+
+        :param Q_pb_startup: power block startup thermal power [kWt]
+        :param E_pb_startup: power block startup thermal energy [kWht]
+        :param W_pb_gross: power block gross electrical output, timestep average [kWe]
+        :param E_tes: thermal energy storage charge state [kWht]
+        :param eta_pb: power block efficiency, timestep average [-]
+        :param Q_pb: power block thermal input [kWt]
+        :param t_step: timestep [hr]
+
+        :returns: maximum feasible energy from power block [kWhe]
+        """
+        SIGMA = 1e-6
+
+        startup_zero = np.abs(Q_pb_startup) < SIGMA
+        startup_pos = Q_pb_startup > SIGMA
+        gross_zero = np.abs(W_pb_gross) < SIGMA
+        gross_pos = W_pb_gross > SIGMA
+
+        off = startup_zero & gross_zero
+        starting = startup_pos & gross_zero
+        started = startup_pos & gross_pos
+        on = startup_zero & gross_pos
+        running = started | on
+
+        # 1. What's the maximum the power block could generate with unlimited resource, outside of startup time?
+        #    Fraction of timestep used for startup = 1.0 - (timestep-averaged efficiency / instantaneous efficiency while on)
+        t_pb_startup = np.zeros_like(W_pb_gross)                                        # [hr]
+        t_pb_startup[off] = self.value("startup_time")
+        started_su = started & (E_pb_startup > SIGMA)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_pb_startup[started_su] = t_step * (1.0 - eta_pb[started_su] / (W_pb_gross[started_su]
+                                                 / (Q_pb[started_su] - Q_pb_startup[started_su])))
+        W_pb_nom = self.cycle_capacity_kw                                               # [kWe]
+        f_pb_max = self.value("cycle_max_frac")                                         # [-]
+        W_pb_max = W_pb_nom * f_pb_max                                                  # [kWe]
+        E_pb_max = np.maximum(W_pb_max * (t_step - t_pb_startup), W_pb_gross * t_step)  # [kWhe]
+
+        # 2. What did the power block actually generate?
+        E_pb_gross = np.where(running, W_pb_gross * t_step, 0.)                         # [kWhe] W_pb_gross avg over entire timestep
+
+        # 3. What more could the power block generate if it used all the remaining TES (with no physical constraints)?
+        eta_pb_nom = self.cycle_nominal_efficiency                                      # [-]
+        f_pb_startup_of_nominal = self.value("startup_frac")                            # [-]
+        E_pb_startup_nom = W_pb_nom / eta_pb_nom * f_pb_startup_of_nominal * t_pb_startup  # [kWht]
+        dE_pb_rest_of_tes = np.where(off,
+                                     np.maximum(0, E_tes - E_pb_startup_nom) * eta_pb_nom,  # [kWht]
+                                     E_tes * eta_pb)                                    # [kWhe]
+
+        # 4. Thus, what could the power block have generated if it utilized more TES?
+        E_pb_gross_max_feasible = np.minimum(E_pb_max, E_pb_gross + dE_pb_rest_of_tes)  # [kWhe]
+        E_pb_gross_max_feasible[starting] = 0.
+        E_pb_gross_max_feasible[~(off | starting | running)] = np.nan
+        return E_pb_gross_max_feasible
 
     def value(self, var_name, var_value=None):
         """
@@ -833,17 +916,12 @@ class CspPlant(PowerSource):
         """
         attr_obj = None
         ssc_value = None
-        if var_name in self.__dir__():
+        if self._has_attribute(var_name):
             attr_obj = self
         if not attr_obj:
-            for a in self._financial_model.__dir__():
-                group_obj = getattr(self._financial_model, a)
-                try:
-                    if var_name in group_obj.__dir__():
-                        attr_obj = group_obj
-                        break
-                except:
-                    pass
+            group_name = PowerSource.find_model_group(self._financial_model, var_name)
+            if group_name is not None:
+                attr_obj = getattr(self._financial_model, group_name)
         if not attr_obj:
             try:
                 ssc_value = self.ssc.get(var_name)
@@ -970,7 +1048,7 @@ class CspPlant(PowerSource):
     @property
     def annual_energy_kwh(self) -> float:
         if self.system_capacity_kw > 0:
-            return sum(list(self.outputs.ssc_time_series['gen']))
+            return float(np.sum(self.outputs.ssc_time_series['gen']))
         else:
             return 0
 
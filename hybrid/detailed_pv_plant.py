@@ -33,6 +33,7 @@ class DetailedPVPlant(PowerSource):
             financial_model = Singleowner.from_existing(system_model, "FlatPlatePVSingleOwner")
 
         super().__init__("SolarPlant", site, system_model, financial_model)
+        self._financial_model_linked = 'fin_model' not in pv_config.keys()
 
         self._system_model.SolarResource.solar_resource_data = self.site.solar_resource.data
         self.dc_degradation = [0]
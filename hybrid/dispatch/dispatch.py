@@ -1,3 +1,4 @@
+import numpy as np
 import pyomo.environ as pyomo
 from pyomo.environ import units as u
 
@@ -6,6 +7,9 @@ class Dispatch:
     """
 
     """
+    # Binary variables of the dispatch blocks that can be relaxed, {binary Var name: name of the Var it switches on}
+    _relaxable_binaries = {}
+
     def __init__(self,
                  pyomo_model: pyomo.ConcreteModel,
                  index_set: pyomo.Set,
@@ -28,6 +32,9 @@ class Dispatch:
         self._system_model = system_model
         self._financial_model = financial_model
 
+        self._block_param_values = {}   # values last set by set_block_params, {Param name: np.ndarray}
+        self._time_series = {}          # year-long time series of the current simulation, {name: np.ndarray}
+
     @staticmethod
     def dispatch_block_rule(block, t):
         raise NotImplemented("This function must be overridden for specific dispatch model")
@@ -38,6 +45,92 @@ class Dispatch:
     def update_time_series_parameters(self, start_time: int):
         raise NotImplemented("This function must be overridden for specific dispatch model")
 
+    def set_block_params(self, **values):
+        """
+        Sets mutable Params indexed by the dispatch blocks, rounded to round_digits. Only the Params whose values
+        changed since they were last set are updated, so persistent solvers receive only the changed values.
+
+        NOTE: Params set by this method should not be set otherwise, as their values are not read back
+
+        :param values: Param name and its values over the dispatch horizon, or a single value for all blocks
+        """
+        n_horizon = len(self.blocks)
+        for name, value in values.items():
+            value = np.asarray(value, dtype=float)
+            if value.ndim == 0:
+                value = np.full(n_horizon, value)
+            elif len(value) != n_horizon:
+                raise ValueError("'{}' list must be the same length as time horizon".format(name))
+            value = np.round(value, self.round_digits)
+
+            previous = self._block_param_values.get(name)
+            if previous is None:
+                changed = range(n_horizon)
+            else:
+                changed = np.flatnonzero(value != previous)
+            if len(changed):
+                index = list(self.blocks.index_set())
+                for i in changed:
+                    getattr(self.blocks[index[i]], name).set_value(float(value[i]))
+            self._block_param_values[name] = value
+
+    def clear_time_series(self):
+        """Clears the year-long time series, which are recomputed for the next dispatch horizon update"""
+        self._time_series = {}
+
+    def horizon_indices(self, start_time: int, n_timesteps: int) -> np.ndarray:
+        """
+        :param start_time: first time step of the dispatch horizon
+        :param n_timesteps: number of time steps of the year-long time series
+
+        :returns: time step indices of the dispatch horizon, wrapping around to the start of the year
+        """
+        return np.arange(start_time, start_time + len(self.blocks)) % n_timesteps
+
+    def relax_binaries(self, relax: bool = True) -> list:
+        """
+        Relaxes the binary variables listed in _relaxable_binaries to continuous variables on [0, 1], or restores them
+        to binary variables.
+
+        :param relax: if True, the binaries are relaxed, otherwise they are restored
+
+        :returns: variables whose domain changed
+        """
+        domain = pyomo.UnitInterval if relax else pyomo.Binary
+        changed = []
+        for t in self.blocks.index_set():
+            for name in self._relaxable_binaries:
+                var = getattr(self.blocks[t], name)
+                if var.domain is not domain:
+                    var.domain = domain
+                    changed.append(var)
+        return changed
+
+    def round_relaxed_binaries(self, tol: float = 1e-5) -> bool:
+        """
+        Sets each relaxed binary variable to 1 where the variable it switches on is positive and to 0 otherwise, then
+        checks the block constraints still hold, i.e., whether the relaxed solution is also a solution with binaries.
+        This fails where, e.g., a battery charges and discharges in the same period.
+
+        :param tol: tolerance on switched variable values and constraint violations
+
+        :returns: True if all block constraints hold with the rounded binaries
+        """
+        for t in self.blocks.index_set():
+            block = self.blocks[t]
+            for name, switched in self._relaxable_binaries.items():
+                value = getattr(block, switched).value
+                getattr(block, name).set_value(1 if value is not None and value > tol else 0)
+            for constraint in block.component_data_objects(pyomo.Constraint, active=True):
+                body = pyomo.value(constraint.body, exception=False)
+                if body is None:
+                    continue
+                if constraint.has_lb() and body < pyomo.value(constraint.lower) - tol:
+                    return False
+                if constraint.has_ub() and body > pyomo.value(constraint.upper) + tol:
+                    return False
+        return True
+
     @staticmethod
     def _check_efficiency_value(efficiency):
         """Checks efficiency is between 0 and 1 or 0 and 100. Returns fractional value"""
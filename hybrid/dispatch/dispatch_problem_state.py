@@ -1,8 +1,15 @@
+import json
+import os
+
 from pyomo.opt import TerminationCondition
+from pyomo.opt.results.container import UndefinedData
 
 
 class DispatchProblemState:
-    """Class for tracking dispatch problem solve state and metrics"""
+    """
+    Class for tracking dispatch problem solve state and metrics. The metrics of each solve are kept in memory and can
+    be written, as records of JSON lines, to a file in batches, see set_record_file.
+    """
 
     def __init__(self):
         self._start_time = ()
@@ -16,9 +23,16 @@ class DispatchProblemState:
         self._variables = ()
         self._non_zeros = ()
         self._gap = ()
+        self._n_iterations = ()
         self._n_non_optimal_solves = 0
+        self._n_milp_fallback_solves = 0
+
+        self._record_file = ""
+        self._n_records_per_flush = 1
+        self._n_records_flushed = 0
 
-    def store_problem_metrics(self, solver_results, start_time, n_days, objective_value):
+    def store_problem_metrics(self, solver_results, start_time, n_days, objective_value,
+                              milp_fallback: bool = False):
         self.start_time = start_time
         self.n_days = n_days
         self.termination_condition = str(solver_results.solver.termination_condition)
@@ -41,9 +55,96 @@ class DispatchProblemState:
             self.gap = 0.0
         else:
             self.gap = float('inf')
+        self.n_iterations = self.get_solver_statistic(solver_results, 'black_box', 'number_of_iterations')
 
         if not solver_results.solver.termination_condition == TerminationCondition.optimal:
             self._n_non_optimal_solves += 1
+        if milp_fallback:
+            self._n_milp_fallback_solves += 1
+
+        if self._record_file != "" and len(self) - self._n_records_flushed >= self._n_records_per_flush:
+            self.flush_records()
+
+    @staticmethod
+    def get_solver_statistic(solver_results, *keys):
+        """
+        :param solver_results: results returned by the solver
+        :param keys: path of the statistic in solver_results.solver.statistics, e.g., ('black_box', 'number_of_iterations')
+
+        :returns: the statistic, or None if the solver does not report it
+        """
+        value = solver_results.solver.statistics
+        try:
+            for key in keys:
+                value = getattr(value, key)
+        except AttributeError:
+            return None
+        if isinstance(value, UndefinedData) or value is None:
+            return None
+        return value
+
+    def __len__(self):
+        return len(self._start_time)
+
+    def get_record(self, index: int) -> dict:
+        """
+        :param index: solve index
+
+        :returns: metrics of a solve, {metric name: value}, with None for metrics the solver does not report
+        """
+        record = {'start_time': self.start_time[index],
+                  'n_days': self.n_days[index],
+                  'termination_condition': self.termination_condition[index],
+                  'solve_time': self.solve_time[index],
+                  'objective': self.objective[index],
+                  'upper_bound': self.upper_bound[index],
+                  'lower_bound': self.lower_bound[index],
+                  'gap': self.gap[index],
+                  'n_iterations': self.n_iterations[index],
+                  'constraints': self.constraints[index],
+                  'variables': self.variables[index],
+                  'non_zeros': self.non_zeros[index]}
+        return {name: None if isinstance(value, UndefinedData) else value for name, value in record.items()}
+
+    @property
+    def records(self) -> list:
+        """Metrics of all solves, see get_record"""
+        return [self.get_record(i) for i in range(len(self))]
+
+    def set_record_file(self, filename: str, n_records_per_flush: int = 100):
+        """
+        Sets the file solve records are appended to, see record_file. Solves before this call are not written.
+
+        :param filename: file name, empty str disables writing records
+        :param n_records_per_flush: number of solve records written at once
+        """
+        self._record_file = filename
+        self._n_records_per_flush = max(n_records_per_flush, 1)
+        self._n_records_flushed = len(self)
+
+    @property
+    def record_file(self) -> str:
+        """
+        File the solve records are appended to, with the process id appended to the name set by set_record_file so
+        that processes, e.g., parallel clustering workers, write to their own file.
+        """
+        if self._record_file == "":
+            return ""
+        root, ext = os.path.splitext(self._record_file)
+        return "{}_{}{}".format(root, os.getpid(), ext)
+
+    def flush_records(self):
+        """
+        Appends the solve records not yet written to the record file as JSON lines.
+
+        NOTE: Records not yet written when a process is forked are written by both processes, so flush before forking
+        """
+        if self._record_file == "" or len(self) == self._n_records_flushed:
+            return
+        lines = [json.dumps(self.get_record(i), default=str) + "\n" for i in range(self._n_records_flushed, len(self))]
+        with open(self.record_file, 'a') as f:
+            f.writelines(lines)
+        self._n_records_flushed = len(self)
 
     def _update_metric(self, metric_name, value):
         data = list(getattr(self, metric_name))
@@ -138,6 +239,19 @@ class DispatchProblemState:
     def gap(self, mip_gap: int):
         self._update_metric('gap', mip_gap)
 
+    @property
+    def n_iterations(self) -> tuple:
+        return self._n_iterations
+
+    @n_iterations.setter
+    def n_iterations(self, iterations: int):
+        self._update_metric('n_iterations', iterations)
+
     @property
     def n_non_optimal_solves(self) -> int:
         return self._n_non_optimal_solves
+
+    @property
+    def n_milp_fallback_solves(self) -> int:
+        """Number of horizons re-solved with binaries because the LP relaxation solution was not valid"""
+        return self._n_milp_fallback_solves
@@ -1,3 +1,4 @@
+import numpy as np
 import pyomo.environ as pyomo
 from pyomo.network import Port, Arc
 from pyomo.environ import units as u
@@ -11,6 +12,7 @@ class GridDispatch(Dispatch):
     """
 
     """
+    _relaxable_binaries = {'is_generating': 'electricity_sold'}
 
     def __init__(self,
                  pyomo_model: pyomo.ConcreteModel,
@@ -135,22 +137,24 @@ class GridDispatch(Dispatch):
         grid.port.add(grid.electricity_purchased)
 
     def initialize_parameters(self):
+        self.clear_time_series()
         grid_limit_kw = self._system_model.value('grid_interconnection_limit_kwac')
         self.generation_transmission_limit = [grid_limit_kw / 1e3] * len(self.blocks.index_set())
         self.load_transmission_limit = [grid_limit_kw / 1e3] * len(self.blocks.index_set())
 
     def update_time_series_parameters(self, start_time: int):
-        n_horizon = len(self.blocks.index_set())
-        dispatch_factors = self._financial_model.value("dispatch_factors_ts")
-        ppa_price = self._financial_model.value("ppa_price_input")[0]
-        if start_time + n_horizon > len(dispatch_factors):
-            prices = list(dispatch_factors[start_time:])
-            prices.extend(list(dispatch_factors[0:n_horizon - len(prices)]))
-        else:
-            prices = dispatch_factors[start_time:start_time + n_horizon]
+        prices = self.get_annual_prices()
+        prices = prices[self.horizon_indices(start_time, len(prices))]
         # NOTE: Assuming the same prices
-        self.electricity_sell_price = [norm_price * ppa_price * 1e3 for norm_price in prices]
-        self.electricity_purchase_price = [norm_price * ppa_price * 1e3 for norm_price in prices]
+        self.set_block_params(electricity_sell_price=prices, electricity_purchase_price=prices)
+
+    def get_annual_prices(self) -> np.ndarray:
+        """Electricity price of the whole simulation [$/MWh]"""
+        if 'prices' not in self._time_series:
+            dispatch_factors = np.asarray(self._financial_model.value("dispatch_factors_ts"), dtype=float)
+            ppa_price = self._financial_model.value("ppa_price_input")[0]
+            self._time_series['prices'] = dispatch_factors * ppa_price * 1e3
+        return self._time_series['prices']
 
     @property
     def electricity_sell_price(self) -> list:
@@ -159,8 +163,7 @@ class GridDispatch(Dispatch):
     @electricity_sell_price.setter
     def electricity_sell_price(self, price_per_mwh: list):
         if len(price_per_mwh) == len(self.blocks):
-            for t, price in zip(self.blocks, price_per_mwh):
-                self.blocks[t].electricity_sell_price.set_value(round(price, self.round_digits))
+            self.set_block_params(electricity_sell_price=price_per_mwh)
         else:
             raise ValueError("'price_per_mwh' list must be the same length as time horizon")
 
@@ -171,8 +174,7 @@ class GridDispatch(Dispatch):
     @electricity_purchase_price.setter
     def electricity_purchase_price(self, price_per_mwh: list):
         if len(price_per_mwh) == len(self.blocks):
-            for t, price in zip(self.blocks, price_per_mwh):
-                self.blocks[t].electricity_purchase_price.set_value(round(price, self.round_digits))
+            self.set_block_params(electricity_purchase_price=price_per_mwh)
         else:
             raise ValueError("'price_per_mwh' list must be the same length as time horizon")
 
@@ -183,8 +185,7 @@ class GridDispatch(Dispatch):
     @generation_transmission_limit.setter
     def generation_transmission_limit(self, limit_mw: list):
         if len(limit_mw) == len(self.blocks):
-            for t, limit in zip(self.blocks, limit_mw):
-                self.blocks[t].generation_transmission_limit.set_value(round(limit, self.round_digits))
+            self.set_block_params(generation_transmission_limit=limit_mw)
         else:
             raise ValueError("'limit_mw' list must be the same length as time horizon")
 
@@ -195,8 +196,7 @@ class GridDispatch(Dispatch):
     @load_transmission_limit.setter
     def load_transmission_limit(self, limit_mw: list):
         if len(limit_mw) == len(self.blocks):
-            for t, limit in zip(self.blocks, limit_mw):
-                self.blocks[t].load_transmission_limit.set_value(round(limit, self.round_digits))
+            self.set_block_params(load_transmission_limit=limit_mw)
         else:
             raise ValueError("'limit_mw' list must be the same length as time horizon")
 
@@ -1,7 +1,10 @@
 from typing import Union
 import sys, os
+import io
+import multiprocessing
 from pathlib import Path
 import time
+import numpy as np
 
 import pyomo.environ as pyomo
 from pyomo.network import Port, Arc
@@ -11,6 +14,7 @@ from pyomo.util.check_units import assert_units_consistent
 from hybrid.sites import SiteInfo
 from hybrid.dispatch import HybridDispatch, HybridDispatchOptions, DispatchProblemState
 from hybrid.clustering import Clustering
+from hybrid.timing import PhaseTimer
 
 class HybridDispatchBuilderSolver:
     """Helper class for building hybrid system dispatch problem, solving dispatch problem, and simulating system
@@ -29,17 +33,42 @@ class HybridDispatchBuilderSolver:
 
         """
         self.opt = None
+        self._warm_start_available = False
         self.site: SiteInfo = site
         self.power_sources = power_sources
         self.options = HybridDispatchOptions(dispatch_options)
+        self._previous_roll_periods = self.options.n_roll_periods
+        self.timer = PhaseTimer()
 
         # deletes previous log file under same name
         if os.path.isfile(self.options.log_name):
             os.remove(self.options.log_name)
 
         self.needs_dispatch = any(item in ['battery', 'tower', 'trough'] for item in self.power_sources.keys())
+        # Heuristic dispatch of a battery without CSP is set with numpy, without building the Pyomo model
+        self.heuristic_dispatch = (self.needs_dispatch and self.options.battery_heuristic_class is not None
+                                   and not any(item in ['tower', 'trough'] for item in self.power_sources.keys()))
+        self._pyomo_model = None
+        self._dispatch = None
+
+        # LP relaxation of the battery and grid binaries, see solve_dispatch_model
+        self.battery_lp_relaxation = False
+        if self.options.battery_lp_relaxation:
+            self.battery_lp_relaxation = not any(item in ['tower', 'trough'] for item in self.power_sources.keys())
+            if not self.battery_lp_relaxation:
+                print("Warning: Battery LP relaxation is only used for dispatch optimization without CSP, "
+                      "solving with binaries.")
 
         if self.needs_dispatch:
+            self.problem_state = DispatchProblemState()
+            self.problem_state.set_record_file(self.options.solve_record_file, self.options.n_solve_records_per_flush)
+
+        if self.heuristic_dispatch:
+            battery = self.power_sources['battery']
+            battery._dispatch = self.options.battery_heuristic_class(self.options.n_look_ahead_periods,
+                                                                     battery._system_model,
+                                                                     battery._financial_model)
+        elif self.needs_dispatch:
             self._pyomo_model = self._create_dispatch_optimization_model()
             if self.site.follow_desired_schedule:
                 self.dispatch.create_min_operating_cost_objective()
@@ -47,7 +76,20 @@ class HybridDispatchBuilderSolver:
                 self.dispatch.create_max_gross_profit_objective()
             self.dispatch.create_arcs()
             assert_units_consistent(self.pyomo_model)
-            self.problem_state = DispatchProblemState()
+            if self.battery_lp_relaxation:
+                self.relax_binaries(True)
+
+        # Adaptive roll period, see get_roll_periods
+        self.adaptive_roll = False
+        if self.options.adaptive_roll:
+            self.adaptive_roll = ('battery' in self.power_sources.keys()
+                                  and 'heuristic' not in self.options.battery_dispatch
+                                  and not any(item in ['tower', 'trough'] for item in self.power_sources.keys())
+                                  and not self.site.follow_desired_schedule)
+            if not self.adaptive_roll:
+                print("Warning: Adaptive roll period is only used for battery dispatch optimization without CSP or "
+                      "a desired schedule, rolling forward {} periods.".format(self.options.n_roll_periods))
+        self._adaptive_roll_prices = None
         
         # Clustering (optional)
         self.clustering = None
@@ -107,7 +149,27 @@ class HybridDispatchBuilderSolver:
             self.options)
         return model
 
-    def solve_dispatch_model(self, start_time: int, n_days: int):
+    def solve_dispatch_model(self, start_time: int, n_days: float):
+        """
+        Solves the dispatch model of the current horizon and stores its solve metrics
+
+        :param start_time: Start time step of the horizon
+        :param n_days: Number of days simulated with the horizon's dispatch solution
+        """
+        solver_results = self.call_solver()
+
+        milp_fallback = False
+        if self.battery_lp_relaxation and not self.relaxed_solution_is_valid():
+            # LP solution is not valid with binaries (e.g., simultaneous charge and discharge), re-solve as a MILP
+            milp_fallback = True
+            self.relax_binaries(False)
+            solver_results = self.call_solver()
+            self.relax_binaries(True)
+
+        self.problem_state.store_problem_metrics(solver_results, start_time, n_days,
+                                                 self.dispatch.objective_value, milp_fallback)
+
+    def call_solver(self):
         # Solve dispatch model
         if self.options.solver == 'glpk':
             solver_results = self.glpk_solve()
@@ -121,11 +183,33 @@ class HybridDispatchBuilderSolver:
             solver_results = self.gurobi_ampl_solve()
         elif self.options.solver == 'gurobi':
             solver_results = self.gurobi_solve()
+        elif self.options.solver == 'highs_persistent':
+            solver_results = self.highs_persistent_solve()
         else:
             raise ValueError("{} is not a supported solver".format(self.options.solver))
+        return solver_results
 
-        self.problem_state.store_problem_metrics(solver_results, start_time, n_days,
-                                                 self.dispatch.objective_value)
+    @property
+    def relaxable_dispatches(self) -> list:
+        """Dispatch models whose binary variables are relaxed by the 'battery_lp_relaxation' option"""
+        return [self.power_sources[source].dispatch for source in ('battery', 'grid') if source in self.power_sources]
+
+    def relax_binaries(self, relax: bool = True):
+        """
+        Relaxes the battery and grid binary variables to continuous variables on [0, 1], or restores them
+
+        :param relax: if True, the binaries are relaxed, otherwise they are restored
+        """
+        for dispatch in self.relaxable_dispatches:
+            dispatch.relax_binaries(relax)
+
+    def relaxed_solution_is_valid(self) -> bool:
+        """
+        Rounds the relaxed binary variables of the LP solution and checks the solution is valid with binaries
+
+        :returns: True if the relaxed solution is a solution of the MILP
+        """
+        return all([dispatch.round_relaxed_binaries() for dispatch in self.relaxable_dispatches])
 
     @staticmethod
     def glpk_solve_call(pyomo_model: pyomo.ConcreteModel,
@@ -232,6 +316,87 @@ class HybridDispatchBuilderSolver:
                                                           self.options.log_name,
                                                           self.options.solver_options)
 
+    @staticmethod
+    def highs_persistent_solve_call(opt: pyomo.SolverFactory,
+                                    pyomo_model: pyomo.ConcreteModel,
+                                    log_name: str = "",
+                                    user_solver_options: dict = None,
+                                    warm_start: bool = False):
+        # In-process HiGHS interface, model updates are pushed to the solver without file I/O
+        # Ref. on solver options: https://ergo-code.github.io/HiGHS/dev/options/definitions/
+        highs_solver_options = {'time_limit': 60.}
+        solver_options = SolverOptions(highs_solver_options, "", user_solver_options)
+        if log_name != "":
+            print("Warning: Solver logging is not supported by the 'highs_persistent' solver.")
+
+        results = opt.solve(pyomo_model, options=solver_options.constructed, warmstart=warm_start)
+        HybridDispatchBuilderSolver.log_and_solution_check("", "", results.solver.termination_condition, pyomo_model)
+        return results
+
+    def highs_persistent_solve(self):
+        if self.opt is None:
+            self.opt = HybridDispatchBuilderSolver.create_persistent_solver('appsi_highs')
+
+        results = HybridDispatchBuilderSolver.highs_persistent_solve_call(self.opt,
+                                                                          self.pyomo_model,
+                                                                          self.options.log_name,
+                                                                          self.options.solver_options,
+                                                                          self._warm_start_available)
+        self._warm_start_available = True
+        return results
+
+    @staticmethod
+    def create_persistent_solver(solver_name: str):
+        """
+        Creates a persistent solver interface that, after the first solve, only pushes mutable parameter values and
+        variable changes (bounds, domains and values of fixed variables, e.g., the heuristic battery dispatch) to the
+        solver. The dispatch model structure is fixed after construction, so structural model checks are disabled.
+        """
+        opt = pyomo.SolverFactory(solver_name)
+        opt.update_config.check_for_new_or_removed_constraints = False
+        opt.update_config.check_for_new_or_removed_vars = False
+        opt.update_config.check_for_new_or_removed_params = False
+        opt.update_config.check_for_new_objective = False
+        opt.update_config.update_constraints = False
+        opt.update_config.update_vars = True
+        opt.update_config.update_named_expressions = False
+        opt.update_config.update_objective = False
+        opt.update_config.update_params = True
+        return opt
+
+    def shift_solution_for_warm_start(self, n_shift_periods: int):
+        """
+        Shifts the previous horizon's solution forward by n_shift_periods so it can be used as a MIP start
+        for the next horizon, see shift_solution.
+        """
+        HybridDispatchBuilderSolver.shift_solution(self.pyomo_model, n_shift_periods)
+
+    @staticmethod
+    def shift_solution(pyomo_model: pyomo.ConcreteModel, n_shift_periods: int):
+        """
+        Shifts the values of the variables of blocks indexed by the forecast horizon forward by n_shift_periods.
+        Periods beyond the previous horizon reuse the previous solution at the same position. Fixed variables and
+        periods without a previous value are unchanged.
+
+        :param pyomo_model: dispatch model
+        :param n_shift_periods: number of periods to shift the solution by
+        """
+        horizon = list(pyomo_model.forecast_horizon)
+        if n_shift_periods <= 0 or n_shift_periods >= len(horizon):
+            return
+        for block in pyomo_model.component_objects(pyomo.Block, descend_into=False):
+            if not block.is_indexed() or list(block.index_set()) != horizon:
+                continue
+            for var in block[horizon[0]].component_objects(pyomo.Var, descend_into=False):
+                name = var.local_name
+                values = [getattr(block[t], name).value for t in horizon]
+                shifted = values[n_shift_periods:] + values[len(values) - n_shift_periods:]
+                for t, value in zip(horizon, shifted):
+                    block_var = getattr(block[t], name)
+                    if value is None or block_var.fixed:
+                        continue
+                    block_var.set_value(value, skip_validation=True)
+
     @staticmethod
     def xpress_solve_call(pyomo_model: pyomo.ConcreteModel,
                           log_name: str = "",
@@ -321,19 +486,21 @@ class HybridDispatchBuilderSolver:
 
     @staticmethod
     def print_infeasible_problem(model: pyomo.ConcreteModel):
-        original_stdout = sys.stdout
-        with open('infeasible_instance.txt', 'w') as f:
-            sys.stdout = f
-            print('\n' + '#' * 20 + ' Model Parameter Values ' + '#' * 20 + '\n')
-            HybridDispatchBuilderSolver.print_all_parameters(model)
-            print('\n' + '#' * 20 + ' Model Blocks Display ' + '#' * 20 + '\n')
-            HybridDispatchBuilderSolver.display_all_blocks(model)
-            sys.stdout = original_stdout
+        # Written to a file of this process, as parallel workers may hit infeasible problems at once
+        diagnostics = io.StringIO()
+        print('\n' + '#' * 20 + ' Model Parameter Values ' + '#' * 20 + '\n', file=diagnostics)
+        HybridDispatchBuilderSolver.print_all_parameters(model, diagnostics)
+        print('\n' + '#' * 20 + ' Model Blocks Display ' + '#' * 20 + '\n', file=diagnostics)
+        HybridDispatchBuilderSolver.display_all_blocks(model, diagnostics)
+
+        filename = 'infeasible_instance_{}.txt'.format(os.getpid())
+        with open(filename, 'w') as f:
+            f.write(diagnostics.getvalue())
         raise ValueError("Dispatch optimization model is infeasible.\n"
-                         "See 'infeasible_instance.txt' for parameter values.")
+                         "See '{}' for parameter values.".format(filename))
 
     @staticmethod
-    def print_all_parameters(model: pyomo.ConcreteModel):
+    def print_all_parameters(model: pyomo.ConcreteModel, ostream=None):
         param_list = list()
         block_list = list()
         for param_object in model.component_objects(pyomo.Param, active=True):
@@ -343,17 +510,17 @@ class HybridDispatchBuilderSolver:
             if (name_to_print not in param_list) or (block_name not in block_list):
                 block_list.append(block_name)
                 param_list.append(name_to_print)
-                print("\nParent Block Name: ", block_name)
-                print("Parameter: ", name_to_print)
+                print("\nParent Block Name: ", block_name, file=ostream)
+                print("Parameter: ", name_to_print, file=ostream)
                 for index in parent_block.index_set():
                     val_to_print = pyomo.value(getattr(parent_block[index], param_object.getname()))
-                    print("\t", index, "\t", val_to_print)
+                    print("\t", index, "\t", val_to_print, file=ostream)
 
     @staticmethod
-    def display_all_blocks(model: pyomo.ConcreteModel):
+    def display_all_blocks(model: pyomo.ConcreteModel, ostream=None):
         for block_object in model.component_objects(pyomo.Block, active=True):
             for index in block_object.index_set():
-                block_object[index].display()
+                block_object[index].display(ostream=ostream)
 
     def simulate_power(self):
         if self.needs_dispatch:
@@ -363,9 +530,18 @@ class HybridDispatchBuilderSolver:
             print("Dispatch optimization not required...")
             return
         ti = list(range(0, self.site.n_timesteps, self.options.n_roll_periods))
-        self.dispatch.initialize_parameters()
-
-        if self.clustering is None:
+        if self.heuristic_dispatch:
+            self.set_annual_heuristic_dispatch()
+        else:
+            self.dispatch.initialize_parameters()
+
+        testing_year = self.options.is_test_start_year or self.options.is_test_end_year
+        if self.clustering is None and self.adaptive_roll and not testing_year:
+            # Solving the year in series, rolling forward depending on the look-ahead sensitivity of each horizon
+            self._adaptive_roll_prices = self.power_sources['grid'].dispatch.get_annual_prices()
+            self.simulate_with_dispatch(0, n_days=int(self.site.n_timesteps / self.site.n_periods_per_day))
+            self._adaptive_roll_prices = None
+        elif self.clustering is None:
             # Solving the year in series
             for i, t in enumerate(ti):
                 if self.options.is_test_start_year or self.options.is_test_end_year:
@@ -388,44 +564,135 @@ class HybridDispatchBuilderSolver:
             initial_states = {tech:{'day':[], 'soc':[], 'load':[]} for tech in ['trough', 'tower', 'battery'] if tech in self.power_sources.keys()}  # List of known charge states at 12 am from completed simulations
             npercluster = self.clustering.clusters['count']
             inds = sorted(range(len(npercluster)), key=npercluster.__getitem__)  # Indicies to sort clusters by low-to-high number of days represented
-            for i in range(self.clustering.clusters['n_cluster']):
-                j = inds[i]  # cluster index
-                time_start, time_stop = self.clustering.get_sim_start_end_times(j)
-                battery_soc = self.clustering.battery_soc_heuristic(j, initial_states['battery']) if 'battery' in self.power_sources.keys() else None
-
-                # Set CSP initial states (need to do this prior to update_time_series_parameters() or update_initial_conditions(), both pull from the stored plant state)
-                for tech in ['trough', 'tower']:
-                    if tech in self.power_sources.keys():
-                        self.power_sources[tech].plant_state = self.power_sources[tech].set_initial_plant_state()  # Reset to default initial state
-                        csp_soc, is_cycle_on, initial_cycle_load = self.clustering.csp_initial_state_heuristic(j, self.power_sources[tech].solar_multiple, initial_states[tech])
-                        self.power_sources[tech].set_tes_soc(csp_soc)  
-                        self.power_sources[tech].set_cycle_state(is_cycle_on)  
-                        self.power_sources[tech].set_cycle_load(initial_cycle_load)
-
-                self.simulate_with_dispatch(time_start, self.clustering.ndays+1, battery_soc, n_initial_sims = 1)  
-
-                # Update lists of known states at 12am
-                for tech in ['trough', 'tower', 'battery']: 
-                    if tech in self.power_sources.keys():
-                        for d in range(self.clustering.ndays):
-                            day  = self.clustering.sim_start_days[j]+d
-                            initial_states[tech]['day'].append(day)
-                            if tech in ['trough', 'tower']:
-                                initial_states[tech]['soc'].append(self.power_sources[tech].get_tes_soc(day*24))
-                                initial_states[tech]['load'].append(self.power_sources[tech].get_cycle_load(day*24))
-                            elif tech in ['battery']:
-                                step = day*24 * int(self.site.n_timesteps/8760)
-                                initial_states[tech]['soc'].append(self.power_sources[tech].Outputs.SOC[step])
+
+            if self.options.n_clustering_workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+                self.simulate_clusters_in_parallel(inds, initial_states)
+            else:
+                if self.options.n_clustering_workers > 1:
+                    print("Warning: Parallel clustering simulation requires the 'fork' start method, "
+                          "simulating exemplars in series.")
+                for i in range(self.clustering.clusters['n_cluster']):
+                    j = inds[i]  # cluster index
+                    self.simulate_cluster_exemplar(j, initial_states)
+
+                    # Update lists of known states at 12am
+                    for tech in ['trough', 'tower', 'battery']:
+                        if tech in self.power_sources.keys():
+                            for d in range(self.clustering.ndays):
+                                day  = self.clustering.sim_start_days[j]+d
+                                initial_states[tech]['day'].append(day)
+                                if tech in ['trough', 'tower']:
+                                    initial_states[tech]['soc'].append(self.power_sources[tech].get_tes_soc(day*24))
+                                    initial_states[tech]['load'].append(self.power_sources[tech].get_cycle_load(day*24))
+                                elif tech in ['battery']:
+                                    step = day*24 * int(self.site.n_timesteps/8760)
+                                    initial_states[tech]['soc'].append(self.power_sources[tech].Outputs.SOC[step])
 
             # After exemplar simulations, update to full annual generation array for dispatchable technologies
             for tech in self.power_sources.keys():
                 if tech in ['battery']:
                     for key in ['gen', 'P', 'SOC']:
                         val = getattr(self.power_sources[tech].Outputs, key)
-                        setattr(self.power_sources[tech].Outputs, key, list(self.clustering.compute_annual_array_from_cluster_exemplar_data(val)))
+                        setattr(self.power_sources[tech].Outputs, key, np.asarray(self.clustering.compute_annual_array_from_cluster_exemplar_data(val), dtype=float))
                 elif tech in ['trough', 'tower']:
                     for key in ['gen', 'P_out_net', 'P_cycle', 'q_dot_pc_startup', 'q_pc_startup', 'e_ch_tes', 'eta', 'q_pb']:  # Data quantities used in capacity value calculations
-                        self.power_sources[tech].outputs.ssc_time_series[key] = list(self.clustering.compute_annual_array_from_cluster_exemplar_data(self.power_sources[tech].outputs.ssc_time_series[key])) 
+                        self.power_sources[tech].outputs.ssc_time_series[key] = np.asarray(self.clustering.compute_annual_array_from_cluster_exemplar_data(self.power_sources[tech].outputs.ssc_time_series[key]), dtype=float)
+
+        self.problem_state.flush_records()
+
+    def simulate_cluster_exemplar(self, cluster_id: int, initial_states: dict):
+        """
+        Sets the initial states of dispatchable technologies and simulates the exemplar days of a cluster
+
+        :param cluster_id: Cluster index
+        :param initial_states: Known charge states at 12 am from completed exemplar simulations
+        """
+        time_start, time_stop = self.clustering.get_sim_start_end_times(cluster_id)
+        battery_soc = self.clustering.battery_soc_heuristic(cluster_id, initial_states['battery']) if 'battery' in self.power_sources.keys() else None
+
+        # Set CSP initial states (need to do this prior to update_time_series_parameters() or update_initial_conditions(), both pull from the stored plant state)
+        for tech in ['trough', 'tower']:
+            if tech in self.power_sources.keys():
+                self.power_sources[tech].plant_state = self.power_sources[tech].set_initial_plant_state()  # Reset to default initial state
+                csp_soc, is_cycle_on, initial_cycle_load = self.clustering.csp_initial_state_heuristic(cluster_id, self.power_sources[tech].solar_multiple, initial_states[tech])
+                self.power_sources[tech].set_tes_soc(csp_soc)
+                self.power_sources[tech].set_cycle_state(is_cycle_on)
+                self.power_sources[tech].set_cycle_load(initial_cycle_load)
+
+        self.simulate_with_dispatch(time_start, self.clustering.ndays+1, battery_soc, n_initial_sims = 1)
+
+    def simulate_clusters_in_parallel(self, cluster_ids: list, initial_states: dict):
+        """
+        Simulates cluster exemplars concurrently in forked worker processes. Each worker holds its own copy of the
+        dispatch model and technology simulators, and returns the stored outputs of its exemplar days, which are
+        then copied into this process' outputs.
+
+        .. note::
+            Exemplars are independent in this mode, so initial states are estimated without the known states from
+            other exemplar simulations.
+
+        :param cluster_ids: Cluster indices to simulate
+        :param initial_states: Known charge states at 12 am (empty when simulating in parallel)
+        """
+        global _cluster_builder, _cluster_initial_states
+        self.problem_state.flush_records()  # otherwise written by each worker, see DispatchProblemState.flush_records
+        _cluster_builder = self
+        _cluster_initial_states = initial_states
+        n_workers = min(self.options.n_clustering_workers, len(cluster_ids))
+        try:
+            with multiprocessing.get_context('fork').Pool(processes=n_workers) as pool:
+                exemplar_outputs = pool.map(_simulate_cluster_exemplar_worker, cluster_ids)
+        finally:
+            _cluster_builder = None
+            _cluster_initial_states = None
+
+        for cluster_id, outputs in zip(cluster_ids, exemplar_outputs):
+            self.store_cluster_exemplar_outputs(cluster_id, outputs)
+
+    def get_cluster_exemplar_outputs(self, cluster_id: int) -> dict:
+        """
+        Gets stored outputs of dispatchable technologies over the exemplar days of a cluster
+
+        :param cluster_id: Cluster index
+        :returns: Dictionary of technology outputs over the exemplar days
+        """
+        soln_start, soln_end = self.clustering.get_soln_start_end_times(cluster_id)
+        time_slice = slice(soln_start, soln_end)
+        outputs = {}
+        for tech in self.power_sources.keys():
+            if tech in ['battery']:
+                battery_outputs = self.power_sources[tech].Outputs
+                attrs = battery_outputs.stateful_attributes + battery_outputs.dispatch_attributes
+                outputs[tech] = {attr: np.array(getattr(battery_outputs, attr)[time_slice]) for attr in attrs}
+            elif tech in ['trough', 'tower']:
+                csp_outputs = self.power_sources[tech].outputs
+                outputs[tech] = {'ssc_time_series': {k: np.array(v[time_slice]) for k, v in csp_outputs.ssc_time_series.items()},
+                                 'dispatch': {k: np.array(v[time_slice]) for k, v in csp_outputs.dispatch.items()}}
+        return outputs
+
+    def store_cluster_exemplar_outputs(self, cluster_id: int, outputs: dict):
+        """
+        Stores outputs of dispatchable technologies over the exemplar days of a cluster
+
+        :param cluster_id: Cluster index
+        :param outputs: Dictionary of technology outputs from get_cluster_exemplar_outputs()
+        """
+        soln_start, soln_end = self.clustering.get_soln_start_end_times(cluster_id)
+        time_slice = slice(soln_start, soln_end)
+        for tech, tech_outputs in outputs.items():
+            if tech in ['battery']:
+                for attr, values in tech_outputs.items():
+                    getattr(self.power_sources[tech].Outputs, attr)[time_slice] = values
+            elif tech in ['trough', 'tower']:
+                csp_outputs = self.power_sources[tech].outputs
+                for key, values in tech_outputs['ssc_time_series'].items():
+                    if key not in csp_outputs.ssc_time_series:
+                        csp_outputs.ssc_time_series[key] = np.zeros(self.site.n_timesteps)
+                    csp_outputs.ssc_time_series[key][time_slice] = values
+                for key, values in tech_outputs['dispatch'].items():
+                    if key not in csp_outputs.dispatch:
+                        csp_outputs.dispatch[key] = np.zeros(8760)
+                    csp_outputs.dispatch[key][time_slice] = values
 
     def simulate_with_dispatch(self,
                                start_time: int,
@@ -433,44 +700,33 @@ class HybridDispatchBuilderSolver:
                                initial_soc: float = None,
                                n_initial_sims: int = 0):
         # this is needed for clustering effort
-        update_dispatch_times = list(range(start_time,
-                                           start_time + n_days * self.site.n_periods_per_day,
-                                           self.options.n_roll_periods))
-
-        for i, sim_start_time in enumerate(update_dispatch_times):
-            # Update battery initial state of charge
-            if 'battery' in self.power_sources.keys():
-                self.power_sources['battery'].dispatch.update_dispatch_initial_soc(initial_soc=initial_soc)
-                initial_soc = None
-
-            for model in self.power_sources.values():
-                if model.system_capacity_kw == 0:
-                    continue
-                model.dispatch.update_time_series_parameters(sim_start_time)
-
-            if self.site.follow_desired_schedule:
-                n_horizon = len(self.power_sources['grid'].dispatch.blocks.index_set())
-                if start_time + n_horizon > len(self.site.desired_schedule):
-                    system_limit = list(self.site.desired_schedule[start_time:])
-                    system_limit.extend(list(self.site.desired_schedule[0:n_horizon - len(system_limit)]))
+        end_time = start_time + n_days * self.site.n_periods_per_day
+        sim_start_time = start_time
+        i = 0
+        while sim_start_time < end_time:
+            n_roll_periods = self.get_roll_periods(sim_start_time, end_time)
+            with self.timer.phase('update_parameters'):
+                # Update battery initial state of charge
+                if 'battery' in self.power_sources.keys():
+                    self.power_sources['battery'].dispatch.update_dispatch_initial_soc(initial_soc=initial_soc)
+                    initial_soc = None
+
+                if self.heuristic_dispatch:
+                    # Sets the horizon's fixed dispatch from the annual heuristic dispatch
+                    self.power_sources['battery'].dispatch.update_time_series_parameters(sim_start_time)
                 else:
-                    system_limit = self.site.desired_schedule[start_time:start_time + n_horizon]
-
-                transmission_limit = self.power_sources['grid'].value('grid_interconnection_limit_kwac') / 1e3
-                for count, value in enumerate(system_limit):
-                    if value > transmission_limit:
-                        print('Warning: Desired schedule is greater than transmission limit. '
-                              'Overwriting schedule to transmission limit')
-                        system_limit[count] = transmission_limit
-
-                self.power_sources['grid'].dispatch.generation_transmission_limit = system_limit
-
-            if 'heuristic' in self.options.battery_dispatch:
-                # TODO: this is not a good way to do this... This won't work with CSP addition...
-                self.battery_heuristic()
-                # TODO: we could just run the csp model without dispatch here
-            else:
-                self.solve_dispatch_model(start_time, n_days)
+                    self.update_time_series_parameters(start_time, sim_start_time)
+
+            if not self.heuristic_dispatch:
+                with self.timer.phase('solve'):
+                    if 'heuristic' in self.options.battery_dispatch:
+                        # TODO: this is not a good way to do this... This won't work with CSP addition...
+                        self.battery_heuristic()
+                        # TODO: we could just run the csp model without dispatch here
+                    else:
+                        if self._warm_start_available:
+                            self.shift_solution_for_warm_start(self._previous_roll_periods)
+                        self.solve_dispatch_model(sim_start_time, n_roll_periods / self.site.n_periods_per_day)
             
             store_outputs = True
             battery_sim_start_time = sim_start_time
@@ -479,18 +735,141 @@ class HybridDispatchBuilderSolver:
                 battery_sim_start_time = None
 
             # simulate using dispatch solution
-            if 'battery' in self.power_sources.keys():
-                self.power_sources['battery'].simulate_with_dispatch(self.options.n_roll_periods,
-                                                                     sim_start_time=battery_sim_start_time)
-
-            if 'trough' in self.power_sources.keys():
-                self.power_sources['trough'].simulate_with_dispatch(self.options.n_roll_periods,
-                                                                    sim_start_time=sim_start_time,
-                                                                    store_outputs=store_outputs)
-            if 'tower' in self.power_sources.keys():
-                self.power_sources['tower'].simulate_with_dispatch(self.options.n_roll_periods,
-                                                                   sim_start_time=sim_start_time,
-                                                                   store_outputs=store_outputs)
+            with self.timer.phase('simulate'):
+                if 'battery' in self.power_sources.keys():
+                    self.power_sources['battery'].simulate_with_dispatch(n_roll_periods,
+                                                                         sim_start_time=battery_sim_start_time)
+
+                if 'trough' in self.power_sources.keys():
+                    self.power_sources['trough'].simulate_with_dispatch(n_roll_periods,
+                                                                        sim_start_time=sim_start_time,
+                                                                        store_outputs=store_outputs)
+                if 'tower' in self.power_sources.keys():
+                    self.power_sources['tower'].simulate_with_dispatch(n_roll_periods,
+                                                                       sim_start_time=sim_start_time,
+                                                                       store_outputs=store_outputs)
+
+            self._previous_roll_periods = n_roll_periods
+            sim_start_time += n_roll_periods
+            i += 1
+
+    def get_roll_periods(self, sim_start_time: int, end_time: int) -> int:
+        """
+        Number of periods simulated with the dispatch solution of the horizon starting at sim_start_time. With the
+        adaptive roll period, the whole horizon is simulated where its dispatch solution is insensitive to the
+        look-ahead, see is_insensitive_to_look_ahead.
+
+        :param sim_start_time: Start time step of the dispatch horizon
+        :param end_time: Time step the simulation ends at
+
+        :returns: number of periods to simulate
+        """
+        n_roll_periods = self.options.n_roll_periods
+        n_horizon = self.options.n_look_ahead_periods
+        if self._adaptive_roll_prices is not None and n_roll_periods < n_horizon:
+            prices = self._adaptive_roll_prices
+            window = np.arange(sim_start_time, sim_start_time + 2 * n_horizon - n_roll_periods) % len(prices)
+            if self.is_insensitive_to_look_ahead(prices[window], n_horizon, n_roll_periods,
+                                                 self.power_sources['battery'].dispatch.maximum_power):
+                n_roll_periods = max(n_roll_periods, min(n_horizon, end_time - sim_start_time))
+        return n_roll_periods
+
+    @staticmethod
+    def is_insensitive_to_look_ahead(prices: np.ndarray,
+                                     n_horizon: int,
+                                     n_roll_periods: int,
+                                     battery_power: float) -> bool:
+        """
+        Checks whether the dispatch solution of a horizon can be simulated in whole rather than for n_roll_periods.
+
+        With a fixed roll period, every simulated period has at least n_horizon - n_roll_periods look-ahead periods.
+        Lacking look-ahead, the battery empties towards the end of a horizon, so simulating past n_roll_periods only
+        changes the dispatch if energy would instead be kept for the periods after the horizon. It is not kept if no
+        price after the horizon, within the look-ahead of the horizon's last period, is greater than the highest
+        price in the horizon's periods after n_roll_periods. This includes flat prices and batteries with no power.
+
+        :param prices: Electricity sell price from the start of the horizon to the end of the look-ahead of its last
+            period [$/MWh], i.e., 2 * n_horizon - n_roll_periods values
+        :param n_horizon: Number of periods of the dispatch horizon
+        :param n_roll_periods: Number of periods simulated with a fixed roll period
+        :param battery_power: Battery maximum power [MW]
+
+        :returns: True if the dispatch solution is insensitive to the look-ahead after the horizon
+        """
+        if battery_power <= 0 or len(prices) <= n_horizon:
+            return True
+        return prices[n_horizon:].max() <= prices[n_roll_periods:n_horizon].max()
+
+    def update_time_series_parameters(self, start_time: int, sim_start_time: int):
+        """
+        Updates the time series parameters of the dispatch model for the horizon starting at sim_start_time
+
+        :param start_time: Start time step of the simulation, used for the desired schedule
+        :param sim_start_time: Start time step of the dispatch horizon
+        """
+        for model in self.power_sources.values():
+            if model.system_capacity_kw == 0:
+                continue
+            model.dispatch.update_time_series_parameters(sim_start_time)
+
+        if self.site.follow_desired_schedule:
+            n_horizon = len(self.power_sources['grid'].dispatch.blocks.index_set())
+            if start_time + n_horizon > len(self.site.desired_schedule):
+                system_limit = list(self.site.desired_schedule[start_time:])
+                system_limit.extend(list(self.site.desired_schedule[0:n_horizon - len(system_limit)]))
+            else:
+                system_limit = self.site.desired_schedule[start_time:start_time + n_horizon]
+
+            transmission_limit = self.power_sources['grid'].value('grid_interconnection_limit_kwac') / 1e3
+            for count, value in enumerate(system_limit):
+                if value > transmission_limit:
+                    print('Warning: Desired schedule is greater than transmission limit. '
+                          'Overwriting schedule to transmission limit')
+                    system_limit[count] = transmission_limit
+
+            self.power_sources['grid'].dispatch.generation_transmission_limit = system_limit
+
+    def set_annual_heuristic_dispatch(self):
+        """
+        Initializes the Pyomo-free battery heuristic dispatch and sets its annual dispatch from the available generation
+        of the non-dispatchable systems, the grid generation limits and the electricity sell prices
+        """
+        n_timesteps = self.site.n_timesteps
+        steps = np.arange(n_timesteps)
+        battery_dispatch = self.power_sources['battery'].dispatch
+        battery_dispatch.initialize_parameters()
+
+        tot_gen = np.zeros(n_timesteps)
+        for source in ('pv', 'wind'):
+            if source not in self.power_sources.keys() or self.power_sources[source].system_capacity_kw == 0:
+                continue
+            generation = np.asarray(self.power_sources[source]._system_model.value("gen"), dtype=float)
+            if len(generation) == 0:
+                raise RuntimeError(f"Dispatch parameter update error: {source} generation profile is empty")
+            available_generation = np.round(generation[steps % len(generation)] / 1e3, battery_dispatch.round_digits)
+            if source == 'pv':
+                available_generation = np.maximum(available_generation, 0)  # zero out any negative load
+            tot_gen += available_generation
+
+        grid = self.power_sources['grid']
+        transmission_limit = grid.value('grid_interconnection_limit_kwac') / 1e3
+        if self.site.follow_desired_schedule:
+            desired_schedule = np.asarray(self.site.desired_schedule, dtype=float)
+            grid_limit = desired_schedule[steps % len(desired_schedule)]
+            if np.any(grid_limit > transmission_limit):
+                print('Warning: Desired schedule is greater than transmission limit. '
+                      'Overwriting schedule to transmission limit')
+                grid_limit = np.minimum(grid_limit, transmission_limit)
+        else:
+            grid_limit = np.full(n_timesteps, transmission_limit)
+        grid_limit = np.round(grid_limit, battery_dispatch.round_digits)
+
+        dispatch_factors = np.asarray(grid._financial_model.value("dispatch_factors_ts"), dtype=float)
+        ppa_price = grid._financial_model.value("ppa_price_input")[0]
+        prices = np.round(dispatch_factors[steps % len(dispatch_factors)] * ppa_price * 1e3,
+                          battery_dispatch.round_digits)
+
+        battery_dispatch.set_annual_dispatch(tot_gen, grid_limit, prices)
 
     def battery_heuristic(self):
         tot_gen = [0.0]*self.options.n_look_ahead_periods
@@ -510,6 +889,23 @@ class HybridDispatchBuilderSolver:
 
         self.power_sources['battery'].dispatch.set_fixed_dispatch(tot_gen, grid_limit)
 
+    def setup_copy(self, memo: dict):
+        """
+        Prepares a ``copy.deepcopy`` memo for copying the dispatch builder, see
+        :func:`hybrid.hybrid_simulation.HybridSimulation.copy`. The dispatch model is cloned into the memo, so the power
+        sources must have set up their memo entries beforehand. The clustering is shared and solver interfaces are not
+        copied.
+
+        :param memo: memo dictionary passed to ``copy.deepcopy``
+        """
+        memo[id(self.site)] = self.site
+        if self.clustering is not None:
+            memo[id(self.clustering)] = self.clustering
+        if self.opt is not None:
+            memo[id(self.opt)] = None
+        if self.pyomo_model is not None:
+            self.pyomo_model.clone(memo)
+
     @property
     def pyomo_model(self) -> pyomo.ConcreteModel:
         return self._pyomo_model
@@ -518,6 +914,20 @@ class HybridDispatchBuilderSolver:
     def dispatch(self) -> HybridDispatch:
         return self._dispatch
 
+_cluster_builder = None
+_cluster_initial_states = None
+
+
+def _simulate_cluster_exemplar_worker(cluster_id: int) -> dict:
+    """Simulates a cluster exemplar within a forked worker process and returns its outputs"""
+    builder = _cluster_builder
+    builder.opt = None  # Persistent solver interfaces are not shared across processes
+    builder._warm_start_available = False
+    builder.simulate_cluster_exemplar(cluster_id, _cluster_initial_states)
+    builder.problem_state.flush_records()
+    return builder.get_cluster_exemplar_outputs(cluster_id)
+
+
 class SolverOptions:
     """Class for housing solver options"""
     def __init__(self, solver_spec_options: dict, log_name: str="", user_solver_options: dict = None, solver_spec_log_key: str="logfile"):
@@ -1,5 +1,7 @@
 from hybrid.dispatch import (OneCycleBatteryDispatchHeuristic,
                              SimpleBatteryDispatchHeuristic,
+                             OneCycleHeuristicBatteryDispatch,
+                             HeuristicBatteryDispatch,
                              SimpleBatteryDispatch,
                              NonConvexLinearVoltageBatteryDispatch,
                              ConvexLinearVoltageBatteryDispatch)
@@ -20,33 +22,60 @@ class HybridDispatchOptions:
 
             dict: {
                 'solver': str (default='glpk'), MILP solver used for dispatch optimization problem
-                    options: ('glpk', 'cbc')
+                    options: ('glpk', 'cbc', 'highs_persistent', 'xpress', 'xpress_persistent', 'gurobi',
+                              'gurobi_ampl')
+                    NOTE: 'highs_persistent' keeps the dispatch model in the in-process HiGHS solver between horizons,
+                    only updates changed parameters and variables and uses the shifted previous solution as a MIP start.
+                    It requires highspy and Pyomo>=6.9.1. The 'glpk' and 'cbc' solvers are not persistent: the model
+                    is written to a file and solved from scratch by the solver executable for every horizon.
                 'solver_options': dict, Dispatch solver options
                 'battery_dispatch': str (default='simple'), sets the battery dispatch model to use for dispatch
                     options: ('simple', 'one_cycle_heuristic', 'heuristic', 'non_convex_LV', 'convex_LV'),
+                    NOTE: heuristic dispatch of a battery without CSP does not build a Pyomo model, see
+                    HeuristicBatteryDispatch
+                'battery_lp_relaxation': bool (default=False), relaxes the battery and grid binary variables so each
+                    horizon is solved as a linear program. Horizons where the relaxed solution is not valid with
+                    binaries, e.g., the battery charges and discharges at once, are re-solved with binaries
+                    NOTE: not used with CSP, whose dispatch model keeps its binaries
                 'grid_charging': bool (default=True), can the battery charge from the grid,
                 'pv_charging_only': bool (default=False), whether restricted to only charge from PV (ITC qualification)
                 'include_lifecycle_count': bool (default=True), should battery lifecycle counting be included,
                 'n_look_ahead_periods': int (default=48), number of time periods dispatch looks ahead
                 'n_roll_periods': int (default=24), number of time periods simulation rolls forward after each dispatch,
+                'adaptive_roll': bool (default=False), if True, the whole look-ahead horizon is simulated with its dispatch
+                    solution where the solution is insensitive to the look-ahead, otherwise the simulation rolls
+                    forward n_roll_periods. See HybridDispatchBuilderSolver.is_insensitive_to_look_ahead. Only used for
+                    full-year battery dispatch optimization without CSP or a desired schedule.
+                    NOTE: The dispatch model size is unchanged
                 'log_name': str (default=''), dispatch log file name, empty str will result in no log (for development)
+                    NOTE: solver logs are appended to the log file after every solve
+                'solve_record_file': str (default=''), file the metrics of each dispatch solve, e.g., solve time, gap,
+                    termination condition and iteration count, are appended to as JSON lines. The process id is
+                    appended to the file name. Empty str will result in the metrics only being kept in memory, see
+                    DispatchProblemState
+                'n_solve_records_per_flush': int (default=100), number of solve records written to file at once
                 'is_test_start_year' : bool (default=False), if True, simulation solves for first 5 days of the year
                 'is_test_end_year' : bool (default=False), if True, simulation solves for last 5 days of the year
                 'use_clustering' : bool (default = False), if True, the simulation will be run for a selected set of "exemplar" days
                 'n_clusters': int (default = 30)
                 'clustering_weights' : dict (default = {}). Custom weights used for classification metrics for data clustering.  If empty, default weights will be used.  
                 'clustering_divisions' : dict (default = {}).  Custom number of averaging periods for classification metrics for data clustering.  If empty, default values will be used.  
+                'n_clustering_workers' : int (default = 1). Number of worker processes used to simulate cluster exemplars concurrently. If 1, exemplars are simulated in series.
                 }
         """
         self.solver: str = 'cbc'
         self.solver_options: dict = {}   # used to update solver options, look at specific solver for option names
         self.battery_dispatch: str = 'simple'
         self.include_lifecycle_count: bool = True
+        self.battery_lp_relaxation: bool = False
         self.grid_charging: bool = True
         self.pv_charging_only: bool = False
         self.n_look_ahead_periods: int = 48
         self.n_roll_periods: int = 24
+        self.adaptive_roll: bool = False
         self.log_name: str = ''  # NOTE: Logging is not thread safe
+        self.solve_record_file: str = ''
+        self.n_solve_records_per_flush: int = 100
         self.is_test_start_year: bool = False
         self.is_test_end_year: bool = False
 
@@ -54,6 +83,7 @@ class HybridDispatchOptions:
         self.n_clusters: int = 30
         self.clustering_weights: dict = {}
         self.clustering_divisions: dict = {}
+        self.n_clustering_workers: int = 1
 
         if dispatch_options is not None:
             for key, value in dispatch_options.items():
@@ -81,8 +111,13 @@ class HybridDispatchOptions:
             'simple': SimpleBatteryDispatch,
             'non_convex_LV': NonConvexLinearVoltageBatteryDispatch,
             'convex_LV': ConvexLinearVoltageBatteryDispatch}
+        # Pyomo-free heuristic dispatch models, used when no other technology needs dispatch optimization
+        self._battery_heuristic_model_options = {
+            'one_cycle_heuristic': OneCycleHeuristicBatteryDispatch,
+            'heuristic': HeuristicBatteryDispatch}
         if self.battery_dispatch in self._battery_dispatch_model_options:
             self.battery_dispatch_class = self._battery_dispatch_model_options[self.battery_dispatch]
+            self.battery_heuristic_class = self._battery_heuristic_model_options.get(self.battery_dispatch)
             if 'heuristic' in self.battery_dispatch:
                 # FIXME: This should be set to the number of time steps within a day.
                 #  Dispatch time duration is not set as of now...
@@ -623,6 +623,7 @@ class CspDispatch(Dispatch):
             rule=cycle_starting_linking_rule)
 
     def initialize_parameters(self):
+        self.clear_time_series()
         csp = self._system_model
 
         cycle_rated_thermal = csp.cycle_thermal_rating
@@ -663,27 +664,35 @@ class CspDispatch(Dispatch):
         """
         n_horizon = len(self.blocks.index_set())
         self.time_duration = [1.0] * n_horizon  # assume hourly for now
+        if len(self._time_series) == 0:
+            self.set_annual_time_series()
 
-        # Set available thermal energy based on forecast
-        thermal_resource = self._system_model.solar_thermal_resource
-        temperature = list(self._system_model.year_weather_df.Temperature.values)
-        if start_time + n_horizon > len(thermal_resource):
-            field_gen = list(thermal_resource[start_time:])
-            field_gen.extend(list(thermal_resource[0:n_horizon - len(field_gen)]))
-
-            dry_bulb_temperature = list(temperature[start_time:])
-            dry_bulb_temperature.extend(list(temperature[0:n_horizon - len(dry_bulb_temperature)]))
-        else:
-            field_gen = thermal_resource[start_time:start_time + n_horizon]
-            dry_bulb_temperature = temperature[start_time:start_time + n_horizon]
-
-        self.available_thermal_generation = field_gen
-        # Set cycle performance parameters that depend on ambient temperature
-        self.set_ambient_temperature_cycle_parameters(dry_bulb_temperature)
-        self.set_receiver_require_startup_time_fraction(field_gen)
+        # Set available thermal energy based on forecast, the time series are computed once for the whole simulation
+        horizon = self.horizon_indices(start_time, len(self._time_series['available_thermal_generation']))
+        self.set_block_params(**{name: series[horizon] for name, series in self._time_series.items()})
+        self.min_receiver_start_time = self._system_model.value('rec_su_delay')
 
         self.update_initial_conditions()  # other dispatch models do not have this method
 
+    def set_annual_time_series(self):
+        """
+        Computes the forecast and ambient temperature dependent parameters of the whole simulation, assuming hourly
+        time steps
+        """
+        field_gen = np.asarray(self._system_model.solar_thermal_resource, dtype=float)
+        dry_bulb_temperature = np.asarray(self._system_model.year_weather_df.Temperature.values, dtype=float)
+        if len(dry_bulb_temperature) != len(field_gen):
+            dry_bulb_temperature = dry_bulb_temperature[np.arange(len(field_gen)) % len(dry_bulb_temperature)]
+
+        cycle_ambient_efficiency_correction, condenser_losses = self.get_ambient_temperature_cycle_parameters(
+            dry_bulb_temperature)
+        self._time_series = {
+            'available_thermal_generation': field_gen,
+            'cycle_ambient_efficiency_correction': cycle_ambient_efficiency_correction,
+            'condenser_losses': condenser_losses,
+            'receiver_startup_fraction': self.get_receiver_require_startup_time_fraction(field_gen,
+                                                                                         np.ones(len(field_gen)))}
+
     def set_part_load_cycle_parameters(self):
         """Set parameters in dispatch model for off-design cycle performance."""
         # --- Cycle part-load efficiency
@@ -728,6 +737,16 @@ class CspDispatch(Dispatch):
 
     def set_ambient_temperature_cycle_parameters(self, dry_bulb_temperature):
         """Set ambient temperature dependent cycle performance parameters."""
+        cycle_ambient_efficiency_correction, condenser_losses = self.get_ambient_temperature_cycle_parameters(
+            dry_bulb_temperature)
+        self.cycle_ambient_efficiency_correction = cycle_ambient_efficiency_correction
+        self.condenser_losses = condenser_losses
+
+    def get_ambient_temperature_cycle_parameters(self, dry_bulb_temperature) -> tuple:
+        """
+        :returns: cycle ambient temperature efficiency correction and normalized condenser losses at each ambient
+            temperature
+        """
         # --- Cycle ambient-temperature efficiency corrections
         tables = self._system_model.cycle_efficiency_tables
         if 'cycle_eff_Tdb_table' in tables:
@@ -735,7 +754,7 @@ class CspDispatch(Dispatch):
             Tpts = [tables['cycle_eff_Tdb_table'][i][0] for i in range(nT)]
             efficiency_pts = [tables['cycle_eff_Tdb_table'][i][1] * self._system_model.cycle_nominal_efficiency for i in range(nT)]  # Efficiency
             wcondfpts = [tables['cycle_wcond_Tdb_table'][i][1] for i in range(nT)]  # Fraction of cycle design gross output consumed by cooling
-            self.set_cycle_ambient_corrections(dry_bulb_temperature, Tpts, efficiency_pts, wcondfpts)
+            return self.get_cycle_ambient_corrections(dry_bulb_temperature, Tpts, efficiency_pts, wcondfpts)
         elif 'ud_ind_od' in tables:
             # Tables not returned from ssc, but can be taken from user-defined cycle inputs
             D = self.interpret_user_defined_cycle_data(tables['ud_ind_od'])
@@ -746,28 +765,40 @@ class CspDispatch(Dispatch):
                               for j in range(k, k + npts)]  # Efficiency
             wcondfpts = [(self._system_model.value('ud_f_W_dot_cool_des') / 100.) * tables['ud_ind_od'][j][5] for j in
                          range(k, k + npts)]  # Fraction of cycle design gross output consumed by cooling
-            self.set_cycle_ambient_corrections(dry_bulb_temperature, D['Tambpts'], efficiency_pts, wcondfpts)
+            return self.get_cycle_ambient_corrections(dry_bulb_temperature, D['Tambpts'], efficiency_pts, wcondfpts)
         else:
             print('WARNING: Dispatch optimization cycle ambient temperature corrections are not set up.')
             n = len(dry_bulb_temperature)
-            self.cycle_ambient_efficiency_correction = [self._system_model.cycle_nominal_efficiency] * n
-            self.condenser_losses = [0.0] * n
-        return
+            return np.full(n, self._system_model.cycle_nominal_efficiency), np.zeros(n)
 
     def set_cycle_ambient_corrections(self, Tdb, Tpts, etapts, wcondfpts):
-        n = len(Tdb)            # Tdb = set of ambient temperature points for each dispatch time step
-        npts = len(Tpts)        # Tpts = ambient temperature points with tabulated values
-        cycle_ambient_efficiency_correction = [1.0]*n
-        condenser_losses = [0.0]*n
-        Tstep = Tpts[1] - Tpts[0]
-        for j in range(n):
-            i = max(0, min( int((Tdb[j] - Tpts[0]) / Tstep), npts-2) )
-            r = (Tdb[j] - Tpts[i]) / Tstep
-            cycle_ambient_efficiency_correction[j] = etapts[i] + (etapts[i + 1] - etapts[i]) * r
-            condenser_losses[j] = wcondfpts[i] + (wcondfpts[i + 1] - wcondfpts[i]) * r
+        cycle_ambient_efficiency_correction, condenser_losses = self.get_cycle_ambient_corrections(Tdb, Tpts, etapts,
+                                                                                                   wcondfpts)
         self.cycle_ambient_efficiency_correction = cycle_ambient_efficiency_correction
         self.condenser_losses = condenser_losses
-        return
+
+    @staticmethod
+    def get_cycle_ambient_corrections(Tdb, Tpts, etapts, wcondfpts) -> tuple:
+        """
+        Linearly interpolates, and extrapolates from the end intervals, tabulated cycle efficiencies and condenser losses
+
+        :param Tdb: ambient temperature of each dispatch time step
+        :param Tpts: ambient temperature points with tabulated values, evenly spaced
+        :param etapts: cycle efficiency at each ambient temperature point
+        :param wcondfpts: fraction of cycle design gross output consumed by cooling at each ambient temperature point
+
+        :returns: cycle ambient efficiency correction and condenser losses at each time step
+        """
+        Tdb = np.asarray(Tdb, dtype=float)
+        Tpts = np.asarray(Tpts, dtype=float)
+        etapts = np.asarray(etapts, dtype=float)
+        wcondfpts = np.asarray(wcondfpts, dtype=float)
+        Tstep = Tpts[1] - Tpts[0]
+        i = np.clip(((Tdb - Tpts[0]) / Tstep).astype(int), 0, len(Tpts) - 2)
+        r = (Tdb - Tpts[i]) / Tstep
+        cycle_ambient_efficiency_correction = etapts[i] + (etapts[i + 1] - etapts[i]) * r
+        condenser_losses = wcondfpts[i] + (wcondfpts[i + 1] - wcondfpts[i]) * r
+        return cycle_ambient_efficiency_correction, condenser_losses
 
     @staticmethod
     def interpret_user_defined_cycle_data(ud_ind_od):
@@ -794,20 +825,21 @@ class CspDispatch(Dispatch):
     def set_receiver_require_startup_time_fraction(self, field_gen: list):
         """Estimates the fraction of time period required for receiver start-up."""
         self.min_receiver_start_time = self._system_model.value('rec_su_delay')
+        self.receiver_startup_fraction = self.get_receiver_require_startup_time_fraction(field_gen, self.time_duration)
 
-        su_fraction = [1.0] * len(field_gen)
-        epsilon = 1e-6
-        time_duration = self.time_duration
-
-        for i in range(len(field_gen)):
-            su_fraction[i] = min(1.0,
-                                 max(self.min_receiver_start_time / time_duration[i],
-                                     self.receiver_required_startup_energy / max(1e-6,
-                                                                                 field_gen[i] * time_duration[i])
-                                     )
-                                 )
+    def get_receiver_require_startup_time_fraction(self, field_gen, time_duration) -> np.ndarray:
+        """
+        :param field_gen: available solar thermal generation from the csp field [MWt]
+        :param time_duration: time step durations [hour]
 
-        self.receiver_startup_fraction = su_fraction
+        :returns: estimated fraction of each time period required for receiver start-up
+        """
+        field_gen = np.asarray(field_gen, dtype=float)
+        time_duration = np.asarray(time_duration, dtype=float)
+        min_receiver_start_time = self._system_model.value('rec_su_delay')
+        return np.minimum(1.0, np.maximum(min_receiver_start_time / time_duration,
+                                          self.receiver_required_startup_energy
+                                          / np.maximum(1e-6, field_gen * time_duration)))
 
     def update_initial_conditions(self):
         csp = self._system_model
@@ -885,8 +917,7 @@ class CspDispatch(Dispatch):
     def time_duration(self, time_duration: list):
         """Dispatch horizon time steps [hour]"""
         if len(time_duration) == len(self.blocks):
-            for t, delta in zip(self.blocks, time_duration):
-                self.blocks[t].time_duration = round(delta, self.round_digits)
+            self.set_block_params(time_duration=time_duration)
         else:
             raise ValueError(self.time_duration.__name__ + " list must be the same length as time horizon")
 
@@ -899,8 +930,7 @@ class CspDispatch(Dispatch):
     def available_thermal_generation(self, available_thermal_generation: list):
         """Available solar thermal generation from the csp field [MWt]"""
         if len(available_thermal_generation) == len(self.blocks):
-            for t, value in zip(self.blocks, available_thermal_generation):
-                self.blocks[t].available_thermal_generation = round(value, self.round_digits)
+            self.set_block_params(available_thermal_generation=available_thermal_generation)
         else:
             raise ValueError(self.available_thermal_generation.__name__ + " list must be the same length as time horizon")
 
@@ -913,8 +943,7 @@ class CspDispatch(Dispatch):
     def cycle_ambient_efficiency_correction(self, cycle_ambient_efficiency_correction: list):
         """Cycle efficiency ambient temperature adjustment factor [-]"""
         if len(cycle_ambient_efficiency_correction) == len(self.blocks):
-            for t, value in zip(self.blocks, cycle_ambient_efficiency_correction):
-                self.blocks[t].cycle_ambient_efficiency_correction = round(value, self.round_digits)
+            self.set_block_params(cycle_ambient_efficiency_correction=cycle_ambient_efficiency_correction)
         else:
             raise ValueError(self.cycle_ambient_efficiency_correction.__name__ + " list must be the same length as time horizon")
 
@@ -927,8 +956,7 @@ class CspDispatch(Dispatch):
     def condenser_losses(self, condenser_losses: list):
         """Normalized condenser parasitic losses [-]"""
         if len(condenser_losses) == len(self.blocks):
-            for t, value in zip(self.blocks, condenser_losses):
-                self.blocks[t].condenser_losses = round(value, self.round_digits)
+            self.set_block_params(condenser_losses=condenser_losses)
         else:
             raise ValueError(self.condenser_losses.__name__ + " list must be the same length as time horizon")
 
@@ -941,8 +969,7 @@ class CspDispatch(Dispatch):
     def receiver_startup_fraction(self, receiver_startup_fraction: list):
         """Estimated fraction of time period required for receiver start-up [-]"""
         if len(receiver_startup_fraction) == len(self.blocks):
-            for t, value in zip(self.blocks, receiver_startup_fraction):
-                self.blocks[t].receiver_startup_fraction = round(value, self.round_digits)
+            self.set_block_params(receiver_startup_fraction=receiver_startup_fraction)
         else:
             raise ValueError(self.receiver_startup_fraction.__name__ + " list must be the same length as time horizon")
 
@@ -955,8 +982,7 @@ class CspDispatch(Dispatch):
     @min_receiver_start_time.setter
     def min_receiver_start_time(self, min_receiver_start_time_hr: float):
         """Minimum time to start the receiver [hr]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].min_receiver_start_time.set_value(round(min_receiver_start_time_hr, self.round_digits))
+        self.set_block_params(min_receiver_start_time=min_receiver_start_time_hr)
 
     @property
     def cost_per_field_generation(self) -> float:
@@ -967,8 +993,7 @@ class CspDispatch(Dispatch):
     @cost_per_field_generation.setter
     def cost_per_field_generation(self, om_dollar_per_mwh_thermal: float):
         """Generation cost for the csp field [$/MWht]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].cost_per_field_generation.set_value(round(om_dollar_per_mwh_thermal, self.round_digits))
+        self.set_block_params(cost_per_field_generation=om_dollar_per_mwh_thermal)
 
     @property
     def cost_per_field_start(self) -> float:
@@ -979,8 +1004,7 @@ class CspDispatch(Dispatch):
     @cost_per_field_start.setter
     def cost_per_field_start(self, dollars_per_start: float):
         """Penalty for field start-up [$/start]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].cost_per_field_start.set_value(round(dollars_per_start, self.round_digits))
+        self.set_block_params(cost_per_field_start=dollars_per_start)
 
     @property
     def cost_per_cycle_generation(self) -> float:
@@ -991,8 +1015,7 @@ class CspDispatch(Dispatch):
     @cost_per_cycle_generation.setter
     def cost_per_cycle_generation(self, om_dollar_per_mwh_electric: float):
         """Generation cost for power cycle [$/MWhe]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].cost_per_cycle_generation.set_value(round(om_dollar_per_mwh_electric, self.round_digits))
+        self.set_block_params(cost_per_cycle_generation=om_dollar_per_mwh_electric)
 
     @property
     def cost_per_cycle_start(self) -> float:
@@ -1003,8 +1026,7 @@ class CspDispatch(Dispatch):
     @cost_per_cycle_start.setter
     def cost_per_cycle_start(self, dollars_per_start: float):
         """Penalty for power cycle start [$/start]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].cost_per_cycle_start.set_value(round(dollars_per_start, self.round_digits))
+        self.set_block_params(cost_per_cycle_start=dollars_per_start)
 
     @property
     def cost_per_change_thermal_input(self) -> float:
@@ -1015,8 +1037,7 @@ class CspDispatch(Dispatch):
     @cost_per_change_thermal_input.setter
     def cost_per_change_thermal_input(self, dollars_per_thermal_power: float):
         """Penalty for change in power cycle thermal input [$/MWt]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].cost_per_change_thermal_input.set_value(round(dollars_per_thermal_power, self.round_digits))
+        self.set_block_params(cost_per_change_thermal_input=dollars_per_thermal_power)
 
     @property
     def field_startup_losses(self) -> float:
@@ -1027,8 +1048,7 @@ class CspDispatch(Dispatch):
     @field_startup_losses.setter
     def field_startup_losses(self, field_startup_losses: float):
         """Solar field startup or shutdown parasitic loss [MWhe]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].field_startup_losses.set_value(round(field_startup_losses, self.round_digits))
+        self.set_block_params(field_startup_losses=field_startup_losses)
 
     @property
     def receiver_required_startup_energy(self) -> float:
@@ -1039,8 +1059,7 @@ class CspDispatch(Dispatch):
     @receiver_required_startup_energy.setter
     def receiver_required_startup_energy(self, energy: float):
         """Required energy expended to start receiver [MWht]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].receiver_required_startup_energy.set_value(round(energy, self.round_digits))
+        self.set_block_params(receiver_required_startup_energy=energy)
 
     @property
     def storage_capacity(self) -> float:
@@ -1051,8 +1070,7 @@ class CspDispatch(Dispatch):
     @storage_capacity.setter
     def storage_capacity(self, energy: float):
         """Thermal energy storage capacity [MWht]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].storage_capacity.set_value(round(energy, self.round_digits))
+        self.set_block_params(storage_capacity=energy)
 
     @property
     def receiver_pumping_losses(self) -> float:
@@ -1063,8 +1081,7 @@ class CspDispatch(Dispatch):
     @receiver_pumping_losses.setter
     def receiver_pumping_losses(self, electric_per_thermal: float):
         """Solar field and/or receiver pumping power per unit power produced [MWe/MWt]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].receiver_pumping_losses.set_value(round(electric_per_thermal, self.round_digits))
+        self.set_block_params(receiver_pumping_losses=electric_per_thermal)
 
     @property
     def minimum_receiver_power(self) -> float:
@@ -1075,8 +1092,7 @@ class CspDispatch(Dispatch):
     @minimum_receiver_power.setter
     def minimum_receiver_power(self, thermal_power: float):
         """Minimum operational thermal power delivered by receiver [MWt]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].minimum_receiver_power.set_value(round(thermal_power, self.round_digits))
+        self.set_block_params(minimum_receiver_power=thermal_power)
 
     @property
     def allowable_receiver_startup_power(self) -> float:
@@ -1087,8 +1103,7 @@ class CspDispatch(Dispatch):
     @allowable_receiver_startup_power.setter
     def allowable_receiver_startup_power(self, thermal_power: float):
         """Allowable power per period for receiver start-up [MWt]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].allowable_receiver_startup_power.set_value(round(thermal_power, self.round_digits))
+        self.set_block_params(allowable_receiver_startup_power=thermal_power)
 
     @property
     def field_track_losses(self) -> float:
@@ -1099,8 +1114,7 @@ class CspDispatch(Dispatch):
     @field_track_losses.setter
     def field_track_losses(self, electric_power: float):
         """Solar field tracking parasitic loss [MWe]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].field_track_losses.set_value(round(electric_power, self.round_digits))
+        self.set_block_params(field_track_losses=electric_power)
 
     # @property
     # def heat_trace_losses(self) -> float:
@@ -1123,8 +1137,7 @@ class CspDispatch(Dispatch):
     @cycle_required_startup_energy.setter
     def cycle_required_startup_energy(self, thermal_energy: float):
         """Required energy expended to start cycle [MWht]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].cycle_required_startup_energy.set_value(round(thermal_energy, self.round_digits))
+        self.set_block_params(cycle_required_startup_energy=thermal_energy)
 
     @property
     def cycle_nominal_efficiency(self) -> float:
@@ -1136,8 +1149,7 @@ class CspDispatch(Dispatch):
     def cycle_nominal_efficiency(self, efficiency: float):
         """Power cycle nominal efficiency [-]"""
         efficiency = self._check_efficiency_value(efficiency)
-        for t in self.blocks.index_set():
-            self.blocks[t].cycle_nominal_efficiency.set_value(round(efficiency, self.round_digits))
+        self.set_block_params(cycle_nominal_efficiency=efficiency)
 
     @property
     def cycle_performance_slope(self) -> float:
@@ -1148,8 +1160,7 @@ class CspDispatch(Dispatch):
     @cycle_performance_slope.setter
     def cycle_performance_slope(self, slope: float):
         """Slope of linear approximation of power cycle performance curve [MWe/MWt]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].cycle_performance_slope.set_value(round(slope, self.round_digits))
+        self.set_block_params(cycle_performance_slope=slope)
 
     @property
     def cycle_pumping_losses(self) -> float:
@@ -1160,8 +1171,7 @@ class CspDispatch(Dispatch):
     @cycle_pumping_losses.setter
     def cycle_pumping_losses(self, electric_per_thermal: float):
         """Cycle heat transfer fluid pumping power per unit energy expended [MWe/MWt]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].cycle_pumping_losses.set_value(round(electric_per_thermal, self.round_digits))
+        self.set_block_params(cycle_pumping_losses=electric_per_thermal)
 
     @property
     def allowable_cycle_startup_power(self) -> float:
@@ -1172,8 +1182,7 @@ class CspDispatch(Dispatch):
     @allowable_cycle_startup_power.setter
     def allowable_cycle_startup_power(self, thermal_power: float):
         """Allowable power per period for cycle start-up [MWt]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].allowable_cycle_startup_power.set_value(round(thermal_power, self.round_digits))
+        self.set_block_params(allowable_cycle_startup_power=thermal_power)
 
     @property
     def minimum_cycle_thermal_power(self) -> float:
@@ -1184,8 +1193,7 @@ class CspDispatch(Dispatch):
     @minimum_cycle_thermal_power.setter
     def minimum_cycle_thermal_power(self, thermal_power: float):
         """Minimum operational thermal power delivered to the power cycle [MWt]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].minimum_cycle_thermal_power.set_value(round(thermal_power, self.round_digits))
+        self.set_block_params(minimum_cycle_thermal_power=thermal_power)
 
     @property
     def maximum_cycle_thermal_power(self) -> float:
@@ -1196,8 +1204,7 @@ class CspDispatch(Dispatch):
     @maximum_cycle_thermal_power.setter
     def maximum_cycle_thermal_power(self, thermal_power: float):
         """Maximum operational thermal power delivered to the power cycle [MWt]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].maximum_cycle_thermal_power.set_value(round(thermal_power, self.round_digits))
+        self.set_block_params(maximum_cycle_thermal_power=thermal_power)
 
     # @property
     # def minimum_cycle_power(self) -> float:
@@ -1220,8 +1227,7 @@ class CspDispatch(Dispatch):
     @maximum_cycle_power.setter
     def maximum_cycle_power(self, electric_power: float):
         """Maximum cycle electric power output [MWe]"""
-        for t in self.blocks.index_set():
-            self.blocks[t].maximum_cycle_power.set_value(round(electric_power, self.round_digits))
+        self.set_block_params(maximum_cycle_power=electric_power)
 
     # INITIAL CONDITIONS
     @property
@@ -1,4 +1,5 @@
 from typing import Union
+import numpy as np
 from pyomo.environ import ConcreteModel, Set
 
 import PySAM.Pvsamv1 as Pvsam
@@ -22,6 +23,5 @@ class PvDispatch(PowerSourceDispatch):
                  block_set_name: str = 'pv'):
         super().__init__(pyomo_model, indexed_set, system_model, financial_model, block_set_name=block_set_name)
 
-    def update_time_series_parameters(self, start_time: int):
-        super().update_time_series_parameters(start_time)
-        self.available_generation = [max(0, i) for i in self.available_generation]  # zero out any negative load
+    def get_annual_available_generation(self) -> np.ndarray:
+        return np.maximum(super().get_annual_available_generation(), 0)  # zero out any negative load
@@ -0,0 +1,354 @@
+from typing import Optional, Sequence, Tuple
+import numpy as np
+
+import PySAM.BatteryStateful as BatteryModel
+import PySAM.Singleowner as Singleowner
+
+
+class HeuristicBatteryDispatch:
+    """Fixes battery dispatch operations based on user input, without building a Pyomo model.
+
+    Pure-numpy counterpart of :class:`SimpleBatteryDispatchHeuristic` used by :class:`HybridDispatchBuilderSolver`
+    when the battery is the only dispatchable technology. The charge and discharge power limits and the fixed dispatch
+    of the whole simulation are computed in one vectorized pass by :func:`set_annual_dispatch`, and each dispatch
+    horizon is then a slice of the annual schedule. Provides the dispatch outputs used by
+    :func:`hybrid.battery.Battery.simulate_with_dispatch`.
+
+    Currently, enforces available generation and grid limit assuming no battery charging from grid
+    """
+    def __init__(self,
+                 n_horizon: int,
+                 system_model: BatteryModel.BatteryStateful,
+                 financial_model: Singleowner.Singleowner,
+                 fixed_dispatch: list = None,
+                 block_set_name: str = 'heuristic_battery'):
+        """
+
+        :param n_horizon: number of time periods in a dispatch horizon
+        :param fixed_dispatch: list of normalized values [-1, 1] (Charging (-), Discharging (+)), either one value per
+            horizon period, which is repeated every horizon, or one value per simulation time step
+        """
+        self.block_set_name = block_set_name
+        self.round_digits = int(4)
+        self.n_horizon = n_horizon
+
+        self._system_model = system_model
+        self._financial_model = financial_model
+
+        self.time_duration = [1.0] * n_horizon
+        self.maximum_power = 0.0
+        self.minimum_soc = 0.0
+        self.maximum_soc = 100.0
+        self.capacity = 0.0
+        self.charge_efficiency = 100.0
+        self.discharge_efficiency = 100.0
+        self._initial_soc = 0.0
+
+        # Annual arrays, set by set_annual_dispatch
+        self.annual_generation = np.zeros(0)
+        self.annual_prices = np.zeros(0)
+        self.annual_max_charge_fraction = np.zeros(0)
+        self.annual_max_discharge_fraction = np.zeros(0)
+        self._annual_fixed_dispatch = np.zeros(0)
+
+        self.max_charge_fraction = np.zeros(n_horizon)
+        self.max_discharge_fraction = np.zeros(n_horizon)
+        self._fixed_dispatch = np.zeros(n_horizon)
+        self._soc = np.zeros(n_horizon)
+        self.user_fixed_dispatch = [0.0] * n_horizon if fixed_dispatch is None else fixed_dispatch
+
+    def initialize_parameters(self):
+        # FIXME: Change C_rate call to user set system_capacity_kw
+        self.maximum_power = round(self._financial_model.value("system_capacity") / 1e3, self.round_digits)
+        self.minimum_soc = round(self._system_model.value('minimum_SOC') / 100., self.round_digits) * 100.
+        self.maximum_soc = round(self._system_model.value('maximum_SOC') / 100., self.round_digits) * 100.
+        self.initial_soc = self._system_model.value('initial_SOC')
+
+        self._system_model.value("control_mode", 1.0)  # Power control
+        self._system_model.value("input_power", 0.)
+        self.control_variable = "input_power"
+
+        self.round_trip_efficiency = 88.0  # Including converter efficiency
+        self.capacity = round(self._system_model.value('nominal_energy') / 1e3, self.round_digits)  # [MWh]
+
+    def set_annual_dispatch(self, generation: Sequence, grid_limit: Sequence, prices: Sequence = None):
+        """Sets battery charge and discharge power fraction limits of every time step based on available generation
+        and grid capacity, respectively, and the fixed dispatch of the whole simulation.
+
+        NOTE: This method assumes that battery cannot be charged by the grid.
+
+        :param generation: available generation of non-dispatchable systems [MW]
+        :param grid_limit: grid transmission limit for generation [MW]
+        :param prices: electricity sell prices [$/MWh]
+        """
+        generation = np.asarray(generation, dtype=float)
+        grid_limit = np.asarray(grid_limit, dtype=float)
+        if len(grid_limit) != len(generation):
+            raise ValueError("grid_limit must be the same length as generation.")
+        if prices is not None and len(prices) != len(generation):
+            raise ValueError("prices must be the same length as generation.")
+
+        self.annual_generation = generation
+        self.annual_prices = np.zeros(len(generation)) if prices is None else np.asarray(prices, dtype=float)
+        self.annual_max_charge_fraction = np.clip(generation / self.maximum_power, 0.0, 1.0)
+        self.annual_max_discharge_fraction = np.clip((grid_limit - generation) / self.maximum_power, 0.0, 1.0)
+        self._annual_fixed_dispatch = self._enforce_power_fraction_limits(self._annual_user_fixed_dispatch(),
+                                                                          self.annual_max_charge_fraction,
+                                                                          self.annual_max_discharge_fraction)
+
+    def _annual_user_fixed_dispatch(self) -> np.ndarray:
+        user_fixed_dispatch = np.asarray(self.user_fixed_dispatch, dtype=float)
+        n_timesteps = len(self.annual_generation)
+        if len(user_fixed_dispatch) == n_timesteps:
+            return user_fixed_dispatch
+        return np.resize(user_fixed_dispatch, n_timesteps)
+
+    @staticmethod
+    def _enforce_power_fraction_limits(fixed_dispatch: np.ndarray,
+                                       max_charge_fraction: np.ndarray,
+                                       max_discharge_fraction: np.ndarray) -> np.ndarray:
+        """ Limits fixed dispatch (Charging (-), Discharging (+)) to the battery power fraction limits"""
+        return np.where(fixed_dispatch > 0.0,
+                        np.minimum(fixed_dispatch, max_discharge_fraction),
+                        np.maximum(fixed_dispatch, -max_charge_fraction))
+
+    def update_time_series_parameters(self, start_time: int):
+        """Sets the fixed dispatch and state-of-charge of the horizon starting at start_time, wrapping around to the
+        start of the simulation at its end"""
+        if len(self.annual_generation) == 0:
+            raise RuntimeError("set_annual_dispatch must be called before updating dispatch time series parameters.")
+        horizon = np.arange(start_time, start_time + self.n_horizon) % len(self.annual_generation)
+        # TODO: provide more control
+        self.time_duration = [1.0] * self.n_horizon
+        self.max_charge_fraction = self.annual_max_charge_fraction[horizon]
+        self.max_discharge_fraction = self.annual_max_discharge_fraction[horizon]
+        self._fixed_dispatch = self._horizon_fixed_dispatch(horizon)
+        self._soc = self._soc_profile(self._fixed_dispatch)
+
+    def _horizon_fixed_dispatch(self, horizon: np.ndarray) -> np.ndarray:
+        return self._annual_fixed_dispatch[horizon]
+
+    def update_dispatch_initial_soc(self, initial_soc: float = None):
+        if initial_soc is not None:
+            self._system_model.value("initial_SOC", initial_soc)
+            self._system_model.setup()  # TODO: Do I need to re-setup stateful battery?
+        self.initial_soc = self._system_model.value('SOC')
+
+    def update_soc(self, power_fraction, soc0) -> float:
+        if power_fraction > 0.0:
+            discharge_power = power_fraction * self.maximum_power
+            soc = soc0 - self.time_duration[0] * (1/(self.discharge_efficiency/100.) * discharge_power) / self.capacity
+        elif power_fraction < 0.0:
+            charge_power = - power_fraction * self.maximum_power
+            soc = soc0 + self.time_duration[0] * (self.charge_efficiency / 100. * charge_power) / self.capacity
+        else:
+            soc = soc0
+        soc = max(0, min(1, soc))
+        return soc
+
+    def _soc_profile(self, fixed_dispatch) -> np.ndarray:
+        """State-of-charge [-] at the end of each period of fixed_dispatch, starting from the initial state-of-charge"""
+        soc = np.zeros(len(fixed_dispatch))
+        soc0 = self._initial_soc
+        for t, fd in enumerate(fixed_dispatch):
+            soc0 = self.update_soc(fd, soc0)
+            soc[t] = soc0
+        return soc
+
+    @property
+    def fixed_dispatch(self) -> list:
+        return self._fixed_dispatch.tolist()
+
+    @property
+    def user_fixed_dispatch(self) -> list:
+        return self._user_fixed_dispatch
+
+    @user_fixed_dispatch.setter
+    def user_fixed_dispatch(self, fixed_dispatch: list):
+        if len(fixed_dispatch) != self.n_horizon and \
+                (len(self.annual_generation) == 0 or len(fixed_dispatch) != len(self.annual_generation)):
+            raise ValueError("fixed_dispatch must be the same length as dispatch horizon.")
+        elif max(fixed_dispatch) > 1.0 or min(fixed_dispatch) < -1.0:
+            raise ValueError("fixed_dispatch must be normalized values between -1 and 1.")
+        else:
+            self._user_fixed_dispatch = fixed_dispatch
+
+    @property
+    def round_trip_efficiency(self) -> float:
+        return self.charge_efficiency * self.discharge_efficiency / 100.
+
+    @round_trip_efficiency.setter
+    def round_trip_efficiency(self, round_trip_efficiency: float):
+        if round_trip_efficiency > 1:
+            round_trip_efficiency /= 100.
+        efficiency = round(round_trip_efficiency ** (1 / 2), self.round_digits) * 100.  # Assumes equal efficiencies
+        self.charge_efficiency = efficiency
+        self.discharge_efficiency = efficiency
+
+    @property
+    def initial_soc(self) -> float:
+        return self._initial_soc * 100.
+
+    @initial_soc.setter
+    def initial_soc(self, initial_soc: float):
+        if initial_soc > 1:
+            initial_soc /= 100.
+        initial_soc = round(initial_soc, self.round_digits)
+        if initial_soc > self.maximum_soc / 100:
+            print("Warning: Storage dispatch was initialized with a state-of-charge greater than maximum value!")
+            print("Initial SOC = {}".format(initial_soc))
+            print("Initial SOC was set to maximum value.")
+            initial_soc = self.maximum_soc / 100
+        elif initial_soc < self.minimum_soc / 100:
+            print("Warning: Storage dispatch was initialized with a state-of-charge less than minimum value!")
+            print("Initial SOC = {}".format(initial_soc))
+            print("Initial SOC was set to minimum value.")
+            initial_soc = self.minimum_soc / 100
+        self._initial_soc = initial_soc
+
+    # OUTPUTS
+    @property
+    def soc(self) -> list:
+        return (self._soc * 100.0).tolist()
+
+    @property
+    def charge_power(self) -> list:
+        return (np.maximum(-self._fixed_dispatch, 0.0) * self.maximum_power).tolist()
+
+    @property
+    def discharge_power(self) -> list:
+        return (np.maximum(self._fixed_dispatch, 0.0) * self.maximum_power).tolist()
+
+    @property
+    def is_charging(self) -> list:
+        return (self._fixed_dispatch < 0.0).astype(float).tolist()
+
+    @property
+    def is_discharging(self) -> list:
+        return (self._fixed_dispatch > 0.0).astype(float).tolist()
+
+    @property
+    def power(self) -> list:
+        return (self._fixed_dispatch * self.maximum_power).tolist()
+
+    @property
+    def current(self) -> list:
+        return [0.0] * self.n_horizon
+
+    @property
+    def generation(self) -> list:
+        return self.power
+
+
+class OneCycleHeuristicBatteryDispatch(HeuristicBatteryDispatch):
+    """Pure-numpy counterpart of :class:`OneCycleBatteryDispatchHeuristic`.
+
+    The power fraction limits and prices of the whole simulation are set in one pass, while the one cycle per horizon
+    dispatch is found when each horizon is updated, as its state-of-charge feasibility depends on the battery's
+    state-of-charge at the start of the horizon.
+    """
+    def __init__(self,
+                 n_horizon: int,
+                 system_model: BatteryModel.BatteryStateful,
+                 financial_model: Singleowner.Singleowner,
+                 block_set_name: str = 'one_cycle_heuristic_battery'):
+        super().__init__(n_horizon,
+                         system_model,
+                         financial_model,
+                         block_set_name=block_set_name)
+        self.prices = np.zeros(n_horizon)
+
+    def set_annual_dispatch(self, generation: Sequence, grid_limit: Sequence, prices: Sequence = None):
+        if prices is None or not np.any(prices):
+            raise ValueError("prices must be set before calling heuristic method.")
+        super().set_annual_dispatch(generation, grid_limit, prices)
+
+    def _horizon_fixed_dispatch(self, horizon: np.ndarray) -> np.ndarray:
+        self.prices = self.annual_prices[horizon]
+        return self._heuristic_method(self.annual_generation[horizon])
+
+    def _heuristic_method(self, gen: np.ndarray) -> np.ndarray:
+        """This sets battery dispatch using a 1 cycle per day assumption.
+
+        Method:
+         1. Sort input prices
+         2. Determine the duration required to fully discharge and charge the battery
+         3. Set discharge and charge operations based on sorted prices
+         3. Check SOC feasibility
+         4. If infeasible, find infeasibility, shift operation to the next sorted price periods
+         5. Repeat step 4 until SOC feasible
+                NOTE: If operation is tried on half of time periods, then operation defaults to 'do nothing'
+        """
+        discharge_time, charge_time = self._get_duration_battery_full_cycle()
+        fixed_dispatch = np.zeros(len(self.prices))
+        # Ascending prices, with descending generation among equal prices
+        sorted_idx = np.lexsort((-gen, self.prices))
+
+        # Set initial fixed dispatch
+        next_charge_idx = self._charge_battery(charge_time, 0, sorted_idx, fixed_dispatch)
+        next_discharge_idx = self._discharge_battery(discharge_time, 0, sorted_idx, fixed_dispatch)
+
+        # test feasibility and find infeasibility
+        feasible = self.test_soc_feasibility(fixed_dispatch)
+        while not feasible[0]:
+            idx_infeasible = feasible[1]
+            infeasible_value = fixed_dispatch[idx_infeasible]
+            if infeasible_value > 0:  # Discharging
+                discharge_remaining = fixed_dispatch[idx_infeasible] * self.time_duration[idx_infeasible]
+                fixed_dispatch[idx_infeasible] = 0
+                if next_discharge_idx < len(sorted_idx)/2:
+                    next_discharge_idx = self._discharge_battery(discharge_remaining, next_discharge_idx,
+                                                                 sorted_idx, fixed_dispatch)
+            elif infeasible_value < 0:    # Charging
+                charge_remaining = -fixed_dispatch[idx_infeasible] * self.time_duration[idx_infeasible]
+                fixed_dispatch[idx_infeasible] = 0
+                if next_charge_idx < len(sorted_idx)/2:
+                    next_charge_idx = self._charge_battery(charge_remaining, next_charge_idx,
+                                                           sorted_idx, fixed_dispatch)
+            feasible = self.test_soc_feasibility(fixed_dispatch)
+        return fixed_dispatch
+
+    def _discharge_battery(self, discharge_remaining, next_discharge_idx, sorted_idx, fixed_dispatch) -> int:
+        """Discharge battery using the remaining discharge and the next best discharge periods, in place.
+
+        Returns next discharge index to be tried."""
+        period_count = next_discharge_idx
+        while discharge_remaining > 0 and period_count < len(sorted_idx):
+            idx = sorted_idx[-(period_count + 1)]
+            fixed_dispatch[idx] = min(self.max_discharge_fraction[idx], discharge_remaining)
+            discharge_remaining -= fixed_dispatch[idx] * self.time_duration[idx]
+            period_count += 1
+        return period_count
+
+    def _charge_battery(self, charge_remaining, next_charge_idx, sorted_idx, fixed_dispatch) -> int:
+        """Charge battery using the remaining charge and the next best charge periods, in place.
+
+        Returns next charge index to be tried."""
+        period_count = next_charge_idx
+        while charge_remaining > 0 and period_count < len(sorted_idx):
+            idx = sorted_idx[period_count]
+            fixed_dispatch[idx] = - min(self.max_charge_fraction[idx], charge_remaining)
+            charge_remaining += fixed_dispatch[idx] * self.time_duration[idx]
+            period_count += 1
+        return period_count
+
+    def _get_duration_battery_full_cycle(self) -> Tuple[float, float]:
+        """ Calculates discharge and charge hours required to fully cycle the battery."""
+        true_capacity = (self.maximum_soc - self.minimum_soc) * self.capacity / 100.0
+
+        n_discharge = true_capacity / (1/(self.discharge_efficiency/100.) * self.maximum_power)
+        n_charge = true_capacity / (self.charge_efficiency / 100. * self.maximum_power)
+        return n_discharge, n_charge
+
+    def test_soc_feasibility(self, fixed_dispatch) -> Tuple[bool, Optional[int]]:
+        """Steps through fixed_dispatch and test SOC feasibility.
+
+        If fixed_dispatch is infeasible, return index of first infeasibility operation.
+        """
+        soc0 = self._initial_soc
+        for idx, fd in enumerate(fixed_dispatch):
+            soc = self.update_soc(fd, soc0)
+            if round(soc, 6)*100. < self.minimum_soc or round(soc, 6)*100. > self.maximum_soc:
+                return False, idx
+            soc0 = soc
+        return True, None
@@ -9,6 +9,8 @@ class PowerStorageDispatch(Dispatch):
     """
 
     """
+    _relaxable_binaries = {'is_charging': 'charge_power',
+                           'is_discharging': 'discharge_power'}
 
     def __init__(self,
                  pyomo_model: pyomo.ConcreteModel,
@@ -277,8 +279,7 @@ class PowerStorageDispatch(Dispatch):
     @time_duration.setter
     def time_duration(self, time_duration: list):
         if len(time_duration) == len(self.blocks):
-            for t, delta in zip(self.blocks, time_duration):
-                self.blocks[t].time_duration = round(delta, self.round_digits)
+            self.set_block_params(time_duration=time_duration)
         else:
             raise ValueError(self.time_duration.__name__ + " list must be the same length as time horizon")
 
@@ -289,8 +290,7 @@ class PowerStorageDispatch(Dispatch):
 
     @cost_per_charge.setter
     def cost_per_charge(self, om_dollar_per_mwh: float):
-        for t in self.blocks.index_set():
-            self.blocks[t].cost_per_charge = round(om_dollar_per_mwh, self.round_digits)
+        self.set_block_params(cost_per_charge=om_dollar_per_mwh)
 
     @property
     def cost_per_discharge(self) -> float:
@@ -299,8 +299,7 @@ class PowerStorageDispatch(Dispatch):
 
     @cost_per_discharge.setter
     def cost_per_discharge(self, om_dollar_per_mwh: float):
-        for t in self.blocks.index_set():
-            self.blocks[t].cost_per_discharge = round(om_dollar_per_mwh, self.round_digits)
+        self.set_block_params(cost_per_discharge=om_dollar_per_mwh)
 
     @property
     def minimum_power(self) -> float:
@@ -309,8 +308,7 @@ class PowerStorageDispatch(Dispatch):
 
     @minimum_power.setter
     def minimum_power(self, minimum_power_mw: float):
-        for t in self.blocks.index_set():
-            self.blocks[t].minimum_power = round(minimum_power_mw, self.round_digits)
+        self.set_block_params(minimum_power=minimum_power_mw)
 
     @property
     def maximum_power(self) -> float:
@@ -319,8 +317,7 @@ class PowerStorageDispatch(Dispatch):
 
     @maximum_power.setter
     def maximum_power(self, maximum_power_mw: float):
-        for t in self.blocks.index_set():
-            self.blocks[t].maximum_power = round(maximum_power_mw, self.round_digits)
+        self.set_block_params(maximum_power=maximum_power_mw)
 
     @property
     def minimum_soc(self) -> float:
@@ -331,8 +328,7 @@ class PowerStorageDispatch(Dispatch):
     def minimum_soc(self, minimum_soc: float):
         if minimum_soc > 1:
             minimum_soc /= 100.
-        for t in self.blocks.index_set():
-            self.blocks[t].minimum_soc = round(minimum_soc, self.round_digits)
+        self.set_block_params(minimum_soc=minimum_soc)
 
     @property
     def maximum_soc(self) -> float:
@@ -343,8 +339,7 @@ class PowerStorageDispatch(Dispatch):
     def maximum_soc(self, maximum_soc: float):
         if maximum_soc > 1:
             maximum_soc /= 100.
-        for t in self.blocks.index_set():
-            self.blocks[t].maximum_soc = round(maximum_soc, self.round_digits)
+        self.set_block_params(maximum_soc=maximum_soc)
 
     @property
     def charge_efficiency(self) -> float:
@@ -354,8 +349,7 @@ class PowerStorageDispatch(Dispatch):
     @charge_efficiency.setter
     def charge_efficiency(self, efficiency: float):
         efficiency = self._check_efficiency_value(efficiency)
-        for t in self.blocks.index_set():
-            self.blocks[t].charge_efficiency = round(efficiency, self.round_digits)
+        self.set_block_params(charge_efficiency=efficiency)
 
     @property
     def discharge_efficiency(self) -> float:
@@ -365,8 +359,7 @@ class PowerStorageDispatch(Dispatch):
     @discharge_efficiency.setter
     def discharge_efficiency(self, efficiency: float):
         efficiency = self._check_efficiency_value(efficiency)
-        for t in self.blocks.index_set():
-            self.blocks[t].discharge_efficiency = round(efficiency, self.round_digits)
+        self.set_block_params(discharge_efficiency=efficiency)
 
     @property
     def round_trip_efficiency(self) -> float:
@@ -386,8 +379,7 @@ class PowerStorageDispatch(Dispatch):
 
     @capacity.setter
     def capacity(self, capacity_mwh: float):
-        for t in self.blocks.index_set():
-            self.blocks[t].capacity = round(capacity_mwh, self.round_digits)
+        self.set_block_params(capacity=capacity_mwh)
 
     @property
     def initial_soc(self) -> float:
@@ -154,6 +154,8 @@ class CustomFinancialModel():
 
     :param fin_config: dictionary of financial parameters
     """
+    _subclass_index_cache: dict = {}
+
     def __init__(self,
                  fin_config: dict) -> None:
 
@@ -276,13 +278,12 @@ class CustomFinancialModel():
 
     def value(self, var_name, var_value=None):
         attr_obj = None
-        if var_name in self.__dir__():
+        if var_name in self.__dict__ or hasattr(type(self), var_name):
             attr_obj = self
         if not attr_obj:
-            for sc in self.subclasses:
-                if var_name in sc.__dir__():
-                    attr_obj = sc
-                    break
+            subclass_index = self._find_subclass_index(var_name)
+            if subclass_index is not None:
+                attr_obj = self.subclasses[subclass_index]
         if not attr_obj:
             raise ValueError("Variable {} not found in CustomFinancialModel".format(var_name))
 
@@ -298,6 +299,22 @@ class CustomFinancialModel():
                 raise IOError(f"{self.__class__}'s attribute {var_name} could not be set to {var_value}: {e}")
 
     
+    def _find_subclass_index(self, var_name):
+        """
+        Finds the index of the subclass containing the variable, caching the result by subclass types so that
+        replacing a subclass with one of another type invalidates the cached lookups
+        """
+        subclass_types = tuple(type(sc) for sc in self.subclasses)
+        cache = CustomFinancialModel._subclass_index_cache.setdefault(subclass_types, {})
+        if var_name not in cache:
+            cache[var_name] = None
+            for i, sc in enumerate(self.subclasses):
+                if var_name in sc.__dir__():
+                    cache[var_name] = i
+                    break
+        return cache[var_name]
+
+    
     def assign(self, input_dict):
         for k, v in input_dict.items():
             if not isinstance(v, dict):
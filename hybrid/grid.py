@@ -33,6 +33,7 @@ class Grid(PowerSource):
             financial_model.value("add_om_num_types", 1)
 
         super().__init__("Grid", site, system_model, financial_model)
+        self._financial_model_linked = 'fin_model' not in grid_config.keys()
 
         self._system_model.GridLimits.enable_interconnection_limit = 1
         self._system_model.GridLimits.grid_interconnection_limit_kwac = grid_config['interconnect_kw']
@@ -61,17 +62,18 @@ class Grid(PowerSource):
         """
         if self.site.follow_desired_schedule:
             # Desired schedule sets the upper bound of the system output, any over generation is curtailed
-            lifetime_schedule = np.tile([x * 1e3 for x in self.site.desired_schedule],
-                                        int(project_life / (len(self.site.desired_schedule) // self.site.n_timesteps)))
-            self.generation_profile = np.minimum(total_gen, lifetime_schedule)
-
-            self.missed_load = [schedule - gen if gen > 0 else schedule for (schedule, gen) in
-                                     zip(lifetime_schedule, self.generation_profile)]
-            self.missed_load_percentage = sum(self.missed_load)/sum(lifetime_schedule)
-
-            self.schedule_curtailed = [gen - schedule if gen > schedule else 0. for (gen, schedule) in
-                                            zip(total_gen, lifetime_schedule)]
-            self.schedule_curtailed_percentage = sum(self.schedule_curtailed)/sum(lifetime_schedule)
+            schedule = np.asarray(self.site.desired_schedule, dtype=float) * 1e3
+            # Generation of each repetition of the schedule over the project life, which the schedule is broadcast to
+            total_gen = np.asarray(total_gen, dtype=float).reshape(-1, len(schedule))
+            lifetime_schedule_sum = schedule.sum() * len(total_gen)
+            generation = np.minimum(total_gen, schedule)
+            self.generation_profile = generation.ravel()
+
+            self.missed_load = np.where(generation > 0, schedule - generation, schedule).ravel()
+            self.missed_load_percentage = self.missed_load.sum() / lifetime_schedule_sum
+
+            self.schedule_curtailed = np.maximum(total_gen - schedule, 0.).ravel()
+            self.schedule_curtailed_percentage = self.schedule_curtailed.sum() / lifetime_schedule_sum
         else:
             self.generation_profile = total_gen
         self.system_capacity_kw = hybrid_size_kw  # TODO: Should this be interconnection limit?
@@ -91,8 +93,8 @@ class Grid(PowerSource):
         """
         W_ac_nom = self.calc_nominal_capacity(interconnect_kw)
         t_step = self.site.interval / 60                                                # hr
-        E_net_max_feasible = [min(x,W_ac_nom) * t_step for x in self.total_gen_max_feasible_year1[0:self.site.n_timesteps]]      # [kWh]
-        return E_net_max_feasible
+        E_net_max_feasible = np.minimum(self.total_gen_max_feasible_year1[0:self.site.n_timesteps], W_ac_nom) * t_step      # [kWh]
+        return E_net_max_feasible.tolist()
 
     @property
     def system_capacity_kw(self) -> float:
@@ -146,9 +148,9 @@ class Grid(PowerSource):
     @property
     def generation_curtailed(self) -> Sequence:
         """Generation curtailed due to interconnect limit [kW]"""
-        curtailed = self.generation_profile
-        pre_curtailed = self.generation_profile_pre_curtailment
-        return [pre_curtailed[i] - curtailed[i] for i in range(len(curtailed))]
+        curtailed = np.asarray(self.generation_profile)
+        pre_curtailed = np.asarray(self.generation_profile_pre_curtailment)
+        return (pre_curtailed[:len(curtailed)] - curtailed).tolist()
 
     @property
     def curtailment_percent(self) -> float:
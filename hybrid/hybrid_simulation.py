@@ -4,6 +4,7 @@ import csv
 from pathlib import Path
 from typing import Union
 import json
+import copy
 from collections import OrderedDict
 
 import numpy as np
@@ -23,6 +24,7 @@ from hybrid.reopt import REopt
 from hybrid.layout.hybrid_layout import HybridLayout
 from hybrid.dispatch.hybrid_dispatch_builder_solver import HybridDispatchBuilderSolver
 from hybrid.log import hybrid_logger as logger
+from hybrid.timing import PhaseTimer
 
 
 class HybridSimulationOutput:
@@ -197,6 +199,12 @@ class HybridSimulation:
         self.dispatch_builder = HybridDispatchBuilderSolver(self.site,
                                                             self.power_sources,
                                                             dispatch_options=dispatch_options)
+
+        # Per-phase timings, disabled unless ``self.timer.enabled`` is set
+        self.timer = PhaseTimer()
+        for model in self.power_sources.values():
+            model.timer = self.timer
+        self.dispatch_builder.timer = self.timer
         
         # Default cost calculator, can be overwritten
         self.cost_model = create_cost_calculator(self.interconnect_kw, **cost_info if cost_info else {})
@@ -520,16 +528,19 @@ class HybridSimulation:
         for system in non_dispatchable_systems:
             model = getattr(self, system)
             if model:
-                model.simulate_power(project_life, lifetime_sim)
+                with self.timer.phase(system):
+                    model.simulate_power(project_life, lifetime_sim)
 
         # simulate dispatchable systems using dispatch optimization
-        self.dispatch_builder.simulate_power()
+        with self.timer.phase('dispatch'):
+            self.dispatch_builder.simulate_power()
 
         # Put the hybrid together for grid simulation
         hybrid_size_kw = 0
         hybrid_nominal_capacity = 0
-        total_gen = np.zeros(self.site.n_timesteps * project_life)
-        total_gen_before_battery = np.zeros(self.site.n_timesteps * project_life)
+        # (year, timestep) arrays, to which single year or multi-year generation profiles are broadcast
+        total_gen = np.zeros((project_life, self.site.n_timesteps))
+        total_gen_before_battery = np.zeros((project_life, self.site.n_timesteps))
         total_gen_max_feasible_year1 = np.zeros(self.site.n_timesteps)
 
         for system in self.power_sources.keys():
@@ -538,21 +549,25 @@ class HybridSimulation:
                 if model:
                     hybrid_size_kw += model.system_capacity_kw
                     hybrid_nominal_capacity += model.calc_nominal_capacity(self.interconnect_kw)
-                    project_life_gen = np.tile(model.generation_profile, int(project_life / (len(model.generation_profile) // self.site.n_timesteps)))
-                    if len(project_life_gen) != len(total_gen):
+                    gen = np.asarray(model.generation_profile, dtype=float)
+                    n_years = len(gen) // self.site.n_timesteps
+                    if n_years == 0 or len(gen) % self.site.n_timesteps or project_life % n_years:
                         raise ValueError("Generation profile, `gen`, from system {} should have length that divides"
                                         " n_timesteps {} * project_life {}".format(system, self.site.n_timesteps,
                                                                                     project_life))
+                    gen = gen.reshape(n_years, self.site.n_timesteps)
                     if system in non_dispatchable_systems:
-                        total_gen_before_battery += project_life_gen
-                    total_gen += project_life_gen
+                        total_gen_before_battery.reshape(-1, n_years, self.site.n_timesteps)[:] += gen
+                    total_gen.reshape(-1, n_years, self.site.n_timesteps)[:] += gen
                     model.gen_max_feasible = model.calc_gen_max_feasible_kwh(self.interconnect_kw)
                     total_gen_max_feasible_year1 += model.gen_max_feasible
 
         # Consolidate grid generation by copying over power and storage generation information
         if self.battery:
-            self.grid.generation_profile_wo_battery = total_gen_before_battery
-        self.grid.simulate_grid_connection(hybrid_size_kw, total_gen, project_life, lifetime_sim, total_gen_max_feasible_year1)
+            self.grid.generation_profile_wo_battery = total_gen_before_battery.ravel()
+        with self.timer.phase('grid'):
+            self.grid.simulate_grid_connection(hybrid_size_kw, total_gen.ravel(), project_life, lifetime_sim,
+                                               total_gen_max_feasible_year1)
         self.grid.hybrid_nominal_capacity = hybrid_nominal_capacity
         self.grid.total_gen_max_feasible_year1 = total_gen_max_feasible_year1
         logger.info(f"Hybrid Peformance Simulation Complete. AEPs are {self.annual_energies}.")
@@ -575,10 +590,11 @@ class HybridSimulation:
                             continue
                         if 'storage_capacity_credit' in self.sim_options[system].keys():
                             storage_cc = self.sim_options[system]['storage_capacity_credit']
-                    try:
-                        model.simulate_financials(self.interconnect_kw, project_life, storage_cc)
-                    except TypeError:
-                        model.simulate_financials(self.interconnect_kw, project_life)
+                    with self.timer.phase(system):
+                        try:
+                            model.simulate_financials(self.interconnect_kw, project_life, storage_cc)
+                        except TypeError:
+                            model.simulate_financials(self.interconnect_kw, project_life)
 
         # Consolidate grid financials by copying over power and storage financial information
         if self.battery:
@@ -599,7 +615,8 @@ class HybridSimulation:
             self.grid._financial_model.value('batt_annual_charge_energy', self.battery._financial_model.value('batt_annual_charge_energy')[system_year_start:])
             self.grid._financial_model.value('batt_annual_charge_from_system', self.battery._financial_model.value('batt_annual_charge_from_system')[system_year_start:])
 
-        self.grid.simulate_financials(self.interconnect_kw, project_life)
+        with self.timer.phase('grid'):
+            self.grid.simulate_financials(self.interconnect_kw, project_life)
         logger.info(f"Hybrid Financials Complete. NPVs are {self.net_present_values}.")
 
 
@@ -613,10 +630,14 @@ class HybridSimulation:
             For simulation modules which support simulating each year of the project_life, whether or not to do so; otherwise the first year data is repeated
         :return:
         """
-        self.simulate_power(project_life, lifetime_sim)
-        self.calculate_installed_cost()
-        self.calculate_financials()
-        self.simulate_financials(project_life)
+        with self.timer.phase('simulate_power'):
+            self.simulate_power(project_life, lifetime_sim)
+        with self.timer.phase('calculate_installed_cost'):
+            self.calculate_installed_cost()
+        with self.timer.phase('calculate_financials'):
+            self.calculate_financials()
+        with self.timer.phase('simulate_financials'):
+            self.simulate_financials(project_life)
 
     @property
     def interconnect_kw(self) -> float:
@@ -964,9 +985,9 @@ class HybridSimulation:
             # outputs['Grid Capacity Factor After Curtailment (%)'] = self.grid.capacity_factor_after_curtailment
             outputs['Grid Capacity Factor at Interconnect (%)'] = self.grid.capacity_factor_at_interconnect
             if self.site.follow_desired_schedule:
-                outputs['Missed Load year 1 (MWh)'] = sum(self.grid.missed_load[0:8760])/1.e3
+                outputs['Missed Load year 1 (MWh)'] = float(np.sum(self.grid.missed_load[0:8760]))/1.e3
                 outputs['Missed Scheduled Load (%)'] = self.grid.missed_load_percentage * 100
-                outputs['Schedule Curtailment year 1 (MWh)'] = sum(self.grid.schedule_curtailed[0:8760])/1.e3
+                outputs['Schedule Curtailment year 1 (MWh)'] = float(np.sum(self.grid.schedule_curtailed[0:8760]))/1.e3
                 outputs['Schedule Curtailment (%)'] = self.grid.schedule_curtailed_percentage * 100
 
         attr_map = {'annual_energies': {'name': 'AEP (GWh)', 'scale': 1/1e6},
@@ -1089,10 +1110,28 @@ class HybridSimulation:
 
     def copy(self):
         """
+        Creates an independent copy of the hybrid simulation, which is much faster than constructing a new one.
+
+        Site and resource data, the flicker heat map and the clustering are shared with the copy. PySAM models are
+        copied through their exported inputs (their outputs are not copied), and the dispatch model is cloned with its
+        current parameter values. The copy creates its own solver interface.
+
         :return: a clone
         """
-        # TODO implement deep copy
-        raise NotImplementedError
+        memo = {id(self.site): self.site}
+        site_data = [self.site.data, self.site.capacity_hours, self.site.desired_schedule, self.site.elec_prices.data]
+        for resource_name in ('solar_resource', 'wind_resource'):
+            if hasattr(self.site, resource_name):
+                site_data.append(getattr(self.site, resource_name).data)
+        for data in site_data:
+            memo[id(data)] = data
+
+        for model in self.power_sources.values():
+            model.setup_copy(memo)
+        if self.layout._flicker_data is not None:
+            memo[id(self.layout._flicker_data)] = self.layout._flicker_data
+        self.dispatch_builder.setup_copy(memo)
+        return copy.deepcopy(self, memo)
 
     def plot_layout(self,
                     figure=None,
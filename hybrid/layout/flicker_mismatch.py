@@ -15,7 +15,8 @@ import PySAM.Pvwattsv8 as pv
 
 from hybrid.log import flicker_logger as logger
 from hybrid.resource import SolarResource
-from hybrid.layout.shadow_flicker import get_sun_pos, get_turbine_shadows_timeseries, create_pv_string_points
+from hybrid.layout.shadow_flicker import get_sun_pos, get_turbine_shadows_timeseries, create_pv_string_points, \
+    points_in_convex_polygons, rasterize_convex_polygons
 from hybrid.layout.pv_module import *
 
 # global variables
@@ -55,6 +56,10 @@ class FlickerMismatch:
     :var diam_mult_s: similarly, the number of turbine diameters the heatmap extends from (0, 0) south
     :var periodic: if true, then the top of the heatmap continues onto the bottom, and vice versa for the east / west
     :var turbine_tower_shadow: if true, then include the tower shadow
+    :var raster: if true, rasterize the shadows onto the heat map grid with numpy array math instead of intersecting
+            shapely geometries. The 'poa' and 'power' heat maps are the same as with shapely, while the area-weighted
+            'time' heat map is approximated by sampling each cell at raster_subsamples^2 points
+    :var raster_subsamples: number of sample points per grid cell side for the rasterized 'time' heat map
 
     """
     # model properties
@@ -67,6 +72,9 @@ class FlickerMismatch:
     periodic: bool = False
     # shadow properties
     turbine_tower_shadow: bool = True
+    # shadow calculation engine
+    raster: bool = False
+    raster_subsamples: int = 4
 
     def __init__(self,
                  lat: float,
@@ -458,11 +466,150 @@ class FlickerMismatch:
         # print(suns_memo)
         heat_map_flicker += heat_map_flicker_new
 
+    @staticmethod
+    def _calculate_shading_raster(weight: float,
+                                  shadows: list,
+                                  heat_map: np.ndarray,
+                                  xs: np.ndarray,
+                                  ys: np.ndarray,
+                                  gridcell_width: float,
+                                  gridcell_height: float,
+                                  normalize_by_area=False,
+                                  subsamples: int = 4
+                                  ) -> None:
+        """
+        Update the heat_map with shading losses in POA irradiance by rasterizing the shadows onto the grid
+
+        :param weight: loss to apply to shaded cells
+        :param shadows: list of shadows for each blade angle, each a list of vertex arrays of its convex parts
+        :param heat_map: array with shading losses
+        :param xs: x coordinates of the heat map's cell centers
+        :param ys: y coordinates of the heat map's cell centers
+        :param gridcell_width: width of cells in the heat map
+        :param gridcell_height: height of cells in the heat map
+        :param normalize_by_area: if True, normalize weight per cell by how much area is shaded
+        :param subsamples: number of sample points per cell side when normalizing by area
+        """
+        if not shadows:
+            return
+
+        if not normalize_by_area:
+            subsamples = 1
+        for shadow in shadows:
+            raster = rasterize_convex_polygons(shadow, xs, ys, gridcell_width, gridcell_height, subsamples)
+            if raster is None:
+                continue
+            rows, cols, coverage = raster
+            heat_map[rows, cols] += weight * coverage
+
+    @staticmethod
+    def _setup_string_point_indices(array_points: list,
+                                    gridcell_width: float,
+                                    gridcell_height: float,
+                                    xs_min: float,
+                                    ys_min: float
+                                    ) -> list:
+        """
+        Convert the panels of each string into coordinate and heat map index arrays for the raster engine
+
+        :param array_points: list of solar panels, [# strands, # strings per strand, FlickerMismatch.modules_per_string]
+        :return: list of (x coordinates, y coordinates, x indices, y indices) per string
+        """
+        strings = []
+        for array in array_points:
+            if not array:
+                continue
+            for string in array:
+                pts_x = np.array([pt.x for pt in string])
+                pts_y = np.array([pt.y for pt in string])
+                x_ind = np.array([int(round((x - xs_min) / gridcell_width)) for x in pts_x])
+                y_ind = np.array([int(round((y - ys_min) / gridcell_height)) for y in pts_y])
+                strings.append((pts_x, pts_y, x_ind, y_ind))
+        return strings
+
+    @staticmethod
+    def _calculate_power_loss_raster(poa: float,
+                                     elv_ang: float,
+                                     shadows: list,
+                                     strings: list,
+                                     heat_map_flicker: np.ndarray
+                                     ):
+        """
+        Update the heat map with flicker losses, using an unshaded string as baseline for normalizing. Shaded panels
+        are found by testing each panel's point against the shadows' convex parts.
+
+        :param poa: irradiance
+        :param elv_ang: solar elevation degree
+        :param shadows: list of shadows for each blade angle, each a list of vertex arrays of its convex parts
+        :param strings: list of (x coordinates, y coordinates, x indices, y indices) of each string's panels
+        :param heat_map_flicker: array with flicker losses
+        """
+        poa_suns = poa/1000
+        if elv_ang < 0 or poa_suns < 1e-3 or not strings:
+            return 0, 0
+
+        heat_map_flicker_new = np.zeros(heat_map_flicker.shape)
+
+        mods_per_string = len(strings[0][0])
+
+        # set unshaded string for baseline
+        pvsys = pvsystem.PVsystem(numberStrs=1, numberMods=mods_per_string)
+        sun_dict_unshaded = dict()
+        for index in range(mods_per_string):
+            sun_dict_unshaded[index] = [(poa_suns,) * 96, range(0, 96)]
+        pvsys.setSuns({0: sun_dict_unshaded})
+        kwh_unshaded = pvsys.Pmp
+
+        suns_memo = dict()
+        shaded_poa_suns = poa_suns * 0.1
+
+        all_x = np.concatenate([string[0] for string in strings])
+        all_y = np.concatenate([string[1] for string in strings])
+        string_starts = np.cumsum([0] + [len(string[0]) for string in strings])
+
+        for shadow in shadows:
+            ht_map = np.zeros(heat_map_flicker.shape)
+            shaded = points_in_convex_polygons(shadow, all_x, all_y)
+            if not shaded.any():
+                continue
+
+            for n, (_, _, x_ind, y_ind) in enumerate(strings):
+                shaded_indices = tuple(np.flatnonzero(shaded[string_starts[n]:string_starts[n + 1]]))
+                if not shaded_indices:
+                    continue
+
+                if shaded_indices in suns_memo.keys():
+                    flicker_loss = suns_memo[shaded_indices]
+                else:
+                    sun_dict = copy.deepcopy(sun_dict_unshaded)
+                    for index in shaded_indices:
+                        sun_dict[index] = [(shaded_poa_suns,) * 96, cell_num_map_flat]
+                    pvsys.setSuns({0: sun_dict})
+                    flicker_loss = (kwh_unshaded - pvsys.Pmp) / kwh_unshaded
+                    suns_memo[shaded_indices] = flicker_loss
+
+                if FlickerMismatch.periodic:
+                    for x, y in zip(x_ind, y_ind):
+                        if ht_map[y, x] == 0:
+                            ht_map[y, x] = flicker_loss
+                        else:
+                            # if reusing a module, take the average
+                            ht_map[y, x] = (ht_map[y, x] + flicker_loss) / 2
+                else:
+                    ht_map[y_ind, x_ind] = flicker_loss
+            heat_map_flicker_new += ht_map
+        heat_map_flicker += heat_map_flicker_new
+
     def _calculate_turbine_shadow(self,
                                   ind: int
                                   ) -> List[Union[None, Polygon, MultiPolygon]]:
         return self.turbine_shadow[ind]
 
+    def _calculate_turbine_shadow_vertices(self,
+                                           ind: int
+                                           ) -> Optional[List[List[np.ndarray]]]:
+        return self.turbine_shadow[ind]
+
     def create_heat_maps(self,
                          steps: range,
                          weight_option: tuple,
@@ -492,7 +639,8 @@ class FlickerMismatch:
                                                              self.azi_ang,
                                                              self.elv_ang,
                                                              self.wind_dir,
-                                                             FlickerMismatch.turbine_tower_shadow)
+                                                             FlickerMismatch.turbine_tower_shadow,
+                                                             vertices=self.raster)
 
         by_poa = by_power = by_time = False
 
@@ -518,6 +666,14 @@ class FlickerMismatch:
                 self._setup_irradiance()
             total_poa = sum(self.poa[steps])
 
+        raster = self.raster
+        if raster:
+            grid_xs, grid_ys = self.heat_map_template[1], self.heat_map_template[2]
+            if by_power:
+                strings = FlickerMismatch._setup_string_point_indices(self.array_string_points,
+                                                                      self.gridcell_width, self.gridcell_height,
+                                                                      np.min(grid_xs), np.min(grid_ys))
+
         progress_size = int(len(steps) / min(10, len(steps)))
         for i, step in enumerate(steps):
             if i % progress_size == 0:
@@ -525,6 +681,24 @@ class FlickerMismatch:
 
             hr = int(step / FlickerMismatch.steps_per_hour)
 
+            if raster:
+                shadows = self._calculate_turbine_shadow_vertices(i)
+                if not shadows:
+                    continue
+                if by_poa:
+                    poa_weight = self.poa[hr] / total_poa
+                    FlickerMismatch._calculate_shading_raster(poa_weight, shadows, heat_map_shadow, grid_xs, grid_ys,
+                                                              self.gridcell_width, self.gridcell_height)
+                if by_power:
+                    FlickerMismatch._calculate_power_loss_raster(self.poa[hr], self.elv_ang[i], shadows, strings,
+                                                                 heat_map_flicker)
+                if by_time:
+                    FlickerMismatch._calculate_shading_raster(1, shadows, heat_map_time, grid_xs, grid_ys,
+                                                              self.gridcell_width, self.gridcell_height,
+                                                              normalize_by_area=True,
+                                                              subsamples=self.raster_subsamples)
+                continue
+
             shadows = self._calculate_turbine_shadow(i)
 
             if not shadows:
@@ -1,5 +1,6 @@
 from hybrid.layout.flicker_mismatch import *
-from hybrid.layout.shadow_flicker import create_turbines_in_grid, get_turbine_grid_shadow
+from hybrid.layout.shadow_flicker import create_turbines_in_grid, get_turbine_grid_shadow, \
+    get_turbine_grid_shadow_vertices
 
 from hybrid.log import flicker_logger as logger
 sys.path.append('.')
@@ -120,6 +121,10 @@ class FlickerMismatchGrid(FlickerMismatch):
                                   ind: int):
         return get_turbine_grid_shadow(self.turbine_shadow[ind], self.turb_pos)
 
+    def _calculate_turbine_shadow_vertices(self,
+                                           ind: int):
+        return get_turbine_grid_shadow_vertices(self.turbine_shadow[ind], self.turb_pos)
+
     def plot_on_site(self,
                      plot_points=True,
                      plot_array=True):
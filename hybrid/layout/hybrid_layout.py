@@ -79,6 +79,7 @@ class HybridLayout:
                                                blade_length=flicker_diam // 2,
                                                angles_per_step=None,
                                                gridcell_height=90, gridcell_width=90, gridcells_per_string=1)
+            flicker_no_tower.raster = True
 
             (flicker_heatmap,) = flicker_no_tower.create_heat_maps(range(8760), ("power",))
             heatmap_template = flicker_no_tower.heat_map_template
@@ -84,22 +84,16 @@ def blade_pos_of_rotated_ellipse(radius_x: float,
     return x, y
 
 
-def get_turbine_shadow_polygons(blade_length: float,
+def get_turbine_shadow_vertices(blade_length: float,
                                 blade_angle: Optional[float],
                                 azi_ang: float,
                                 elv_ang: float,
                                 wind_dir,
                                 tower_shadow: bool = True
-                                ) -> Tuple[Union[None, Polygon, MultiPolygon], float]:
+                                ) -> Tuple[Optional[List[np.ndarray]], Optional[float]]:
     """
-    Calculates the (x, y) coordinates of a wind turbine's shadow, which depends on the sun azimuth and elevation.
-
-    The dimensions of the tower and blades are in fixed ratios to the blade_length. The blade angle is the degrees from
-    z-axis, whereas the wind direction is where the turbine is pointing towards (if None, north is assumed).
-
-    In spherical coordinates, blade angle is phi and wind direction is theta, with 0 at north, moving clockwise.
-
-    The output shadow polygon is relative to the turbine located at (0, 0).
+    Calculates the vertices of the convex parts of a wind turbine's shadow: the tower's shadow and each blade's shadow
+    (or the rotor's swept area). The union of the parts is the shadow returned by `get_turbine_shadow_polygons`.
 
     :param blade_length: meters, radius in spherical coords
     :param blade_angle: degrees from z-axis, or None to use ellipse as swept area
@@ -107,7 +101,7 @@ def get_turbine_shadow_polygons(blade_length: float,
     :param elv_ang: elevation degrees, from x-y plane as 0
     :param wind_dir: degrees from north, clockwise, determines which direction rotor is facing
     :param tower_shadow: if false, do not include the tower's shadow
-    :returns: (shadow polygon, shadow angle from north) if shadow exists, otherwise (None, None)
+    :returns: (list of (n, 2) vertex arrays, shadow angle from north) if shadow exists, otherwise (None, None)
     """
     # "Shadow analysis of wind turbines for dual use of land for combined wind and solar photovoltaic power generation":
     # the average tower_height=2.5R; average tower_width=R/16; average blade_width=R/16
@@ -154,13 +148,12 @@ def get_turbine_shadow_polygons(blade_length: float,
     top_rght_x, top_rght_y = tower_dy * sin_theta + base_rght_x, tower_dy * cos_theta + base_rght_y
     top_left_x, top_left_y = tower_dy * sin_theta + base_left_x, tower_dy * cos_theta + base_left_y
 
+    parts = []
     if tower_shadow:
-        turbine_shadow = Polygon(((base_left_x, base_left_y),
-                                  (base_rght_x, base_rght_y),
-                                  (top_rght_x, top_rght_y),
-                                  (top_left_x, top_left_y)))
-    else:
-        turbine_shadow = Polygon()
+        parts.append(np.array(((base_left_x, base_left_y),
+                               (base_rght_x, base_rght_y),
+                               (top_rght_x, top_rght_y),
+                               (top_left_x, top_left_y))))
 
     # calculate the blade shadows of swept area using parametric eq of general ellipse
     radius_x = shadow_width_blade
@@ -174,7 +167,7 @@ def get_turbine_shadow_polygons(blade_length: float,
     if blade_angle is None:
         degs = np.linspace(0, 2 * np.pi, 50)
         x, y = blade_pos_of_rotated_ellipse(radius_y, radius_x, rotation_theta, degs, center_x, center_y)
-        turbine_shadow = unary_union([turbine_shadow, Polygon(zip(x, y))])
+        parts.append(np.column_stack((x, y)))
     else:
         turbine_blade_angles = (blade_angle, blade_angle + 120, blade_angle - 120)
 
@@ -194,10 +187,51 @@ def get_turbine_shadow_polygons(blade_length: float,
             blade_base_left_x, blade_base_left_y = tower_dx * np.cos(blade_1_dr) + x, \
                                                    tower_dx * np.sin(blade_1_dr) + y
 
-            turbine_shadow = unary_union([turbine_shadow, Polygon(((blade_tip_left_x, blade_tip_left_y),
-                                                                      (blade_tip_rght_x, blade_tip_rght_y),
-                                                                      (blade_base_rght_x, blade_base_rght_y),
-                                                                      (blade_base_left_x, blade_base_left_y)))])
+            parts.append(np.array(((blade_tip_left_x, blade_tip_left_y),
+                                   (blade_tip_rght_x, blade_tip_rght_y),
+                                   (blade_base_rght_x, blade_base_rght_y),
+                                   (blade_base_left_x, blade_base_left_y))))
+    return parts, shadow_ang
+
+
+def get_turbine_shadow_polygons(blade_length: float,
+                                blade_angle: Optional[float],
+                                azi_ang: float,
+                                elv_ang: float,
+                                wind_dir,
+                                tower_shadow: bool = True
+                                ) -> Tuple[Union[None, Polygon, MultiPolygon], float]:
+    """
+    Calculates the (x, y) coordinates of a wind turbine's shadow, which depends on the sun azimuth and elevation.
+
+    The dimensions of the tower and blades are in fixed ratios to the blade_length. The blade angle is the degrees from
+    z-axis, whereas the wind direction is where the turbine is pointing towards (if None, north is assumed).
+
+    In spherical coordinates, blade angle is phi and wind direction is theta, with 0 at north, moving clockwise.
+
+    The output shadow polygon is relative to the turbine located at (0, 0).
+
+    :param blade_length: meters, radius in spherical coords
+    :param blade_angle: degrees from z-axis, or None to use ellipse as swept area
+    :param azi_ang: azimuth degrees, clockwise from north as 0
+    :param elv_ang: elevation degrees, from x-y plane as 0
+    :param wind_dir: degrees from north, clockwise, determines which direction rotor is facing
+    :param tower_shadow: if false, do not include the tower's shadow
+    :returns: (shadow polygon, shadow angle from north) if shadow exists, otherwise (None, None)
+    """
+    parts, shadow_ang = get_turbine_shadow_vertices(blade_length, blade_angle, azi_ang, elv_ang, wind_dir,
+                                                    tower_shadow)
+    if parts is None:
+        return None, None
+
+    if tower_shadow:
+        turbine_shadow = Polygon(parts[0])
+        blade_parts = parts[1:]
+    else:
+        turbine_shadow = Polygon()
+        blade_parts = parts
+    for blade in blade_parts:
+        turbine_shadow = unary_union([turbine_shadow, Polygon(blade)])
     return turbine_shadow, shadow_ang
 
 
@@ -207,12 +241,16 @@ def get_turbine_shadows_timeseries(blade_length: float,
                                    azi_ang: Union[list, np.ndarray],
                                    elv_ang: Union[list, np.ndarray],
                                    wind_ang: Optional[list] = None,
-                                   tower_shadow: bool = True
-                                   ) -> List[List[Union[None, Polygon, MultiPolygon]]]:
+                                   tower_shadow: bool = True,
+                                   vertices: bool = False
+                                   ) -> List[List[Union[None, Polygon, MultiPolygon, List[np.ndarray]]]]:
     """
     Calculate turbine shadows for a number of equally-spaced blade angles per time step.
     Returns a list of turbine shadows per time step, where each entry has a shadow for each angle.
 
+    If `vertices`, each shadow is given as the list of vertex arrays of its convex parts (see
+    `get_turbine_shadow_vertices`) instead of as a shapely geometry.
+
     :param blade_length: meters
     :param steps: which timesteps to calculate
     :param angles_per_step: number of blade angles per timestep
@@ -220,6 +258,7 @@ def get_turbine_shadows_timeseries(blade_length: float,
     :param azi_ang: array of azimuth angles, degrees
     :param wind_ang: array of wind direction degrees with 0 as north, degrees
     :param tower_shadow: if false, do not include the tower's shadow
+    :param vertices: if true, return the vertices of the shadows' convex parts rather than polygons
 
     :returns: list of turbine shadows per time step
     """
@@ -239,13 +278,14 @@ def get_turbine_shadows_timeseries(blade_length: float,
             continue
         shadows = []
         wind_dir = None if wind_ang is None else wind_ang[step]
+        shadow_func = get_turbine_shadow_vertices if vertices else get_turbine_shadow_polygons
         for angle in angles_range:
-            turbine_shadow, shadow_ang = get_turbine_shadow_polygons(blade_length,
-                                                                     angle,
-                                                                     azi_ang=azi_ang[n],
-                                                                     elv_ang=elv_ang[n],
-                                                                     wind_dir=wind_dir,
-                                                                     tower_shadow=tower_shadow)
+            turbine_shadow, shadow_ang = shadow_func(blade_length,
+                                                     angle,
+                                                     azi_ang=azi_ang[n],
+                                                     elv_ang=elv_ang[n],
+                                                     wind_dir=wind_dir,
+                                                     tower_shadow=tower_shadow)
             if turbine_shadow and shadow_ang:
                 shadows.append(turbine_shadow)
         turbine_shadows_per_timestep.append(shadows)
@@ -364,6 +404,99 @@ def get_turbine_grid_shadow(shadow_polygons: Union[MultiPolygon, None],
     return turbine_grid_shadows
 
 
+def get_turbine_grid_shadow_vertices(shadow_parts: Optional[List[List[np.ndarray]]],
+                                     turb_pos: list
+                                     ) -> Optional[List[List[np.ndarray]]]:
+    """
+    Translate the convex shadow parts for each step in simulation to each turbine in the grid
+
+    :return: list with dimension [step_per_hour, angles_per_step], each a list of vertex arrays
+    """
+    if not shadow_parts:
+        return None
+    return [[part + np.array(offset) for offset in turb_pos for part in parts] for parts in shadow_parts]
+
+
+def points_in_convex_polygons(parts: List[np.ndarray],
+                              px: np.ndarray,
+                              py: np.ndarray
+                              ) -> np.ndarray:
+    """
+    Tests which points are inside (or on the boundary of) any of the convex polygons
+
+    :param parts: list of (n, 2) vertex arrays of convex polygons, either orientation
+    :param px: x coordinates of points, any shape broadcastable with py
+    :param py: y coordinates of points
+    :return: boolean array, True where the point is within a polygon
+    """
+    inside_any = np.zeros(np.broadcast(px, py).shape, dtype=bool)
+    for part in parts:
+        x0, y0 = part[:, 0], part[:, 1]
+        x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+        all_left = np.ones_like(inside_any)
+        all_right = np.ones_like(inside_any)
+        for i in range(len(part)):
+            if x0[i] == x1[i] and y0[i] == y1[i]:
+                continue
+            cross = (x1[i] - x0[i]) * (py - y0[i]) - (y1[i] - y0[i]) * (px - x0[i])
+            all_left &= cross >= 0
+            all_right &= cross <= 0
+        inside_any |= all_left | all_right
+    return inside_any
+
+
+def rasterize_convex_polygons(parts: List[np.ndarray],
+                              xs: np.ndarray,
+                              ys: np.ndarray,
+                              gridcell_width: float,
+                              gridcell_height: float,
+                              subsamples: int = 1
+                              ) -> Optional[Tuple[slice, slice, np.ndarray]]:
+    """
+    Rasterize the union of convex polygons onto a grid of cells centered at (xs, ys).
+
+    With subsamples == 1, a cell is covered (1) if its center is within a polygon, as in a point-in-polygon test.
+    Otherwise, each cell is sampled on a (subsamples x subsamples) grid of points, giving the approximate fraction of
+    its area that is covered.
+
+    Only the grid window around the polygons' bounding box is evaluated.
+
+    :param parts: list of (n, 2) vertex arrays of convex polygons
+    :param xs: sorted x coordinates of cell centers
+    :param ys: sorted y coordinates of cell centers
+    :param gridcell_width: width of cells
+    :param gridcell_height: height of cells
+    :param subsamples: number of sample points per cell along each axis
+    :return: (row slice, column slice, coverage fraction within that window) or None if no cell is covered
+    """
+    if not parts:
+        return None
+    vertices = np.concatenate(parts)
+    min_x, min_y = vertices.min(axis=0)
+    max_x, max_y = vertices.max(axis=0)
+    margin_x = gridcell_width / 2 if subsamples > 1 else 0
+    margin_y = gridcell_height / 2 if subsamples > 1 else 0
+    i0, i1 = np.searchsorted(xs, min_x - margin_x, side='left'), np.searchsorted(xs, max_x + margin_x, side='right')
+    j0, j1 = np.searchsorted(ys, min_y - margin_y, side='left'), np.searchsorted(ys, max_y + margin_y, side='right')
+    if i0 >= i1 or j0 >= j1:
+        return None
+
+    sub_xs = xs[i0:i1][np.newaxis, :]
+    sub_ys = ys[j0:j1][:, np.newaxis]
+    if subsamples <= 1:
+        coverage = points_in_convex_polygons(parts, sub_xs, sub_ys).astype(float)
+    else:
+        offsets = ((np.arange(subsamples) + 0.5) / subsamples - 0.5)
+        coverage = np.zeros((j1 - j0, i1 - i0))
+        for dx in offsets * gridcell_width:
+            for dy in offsets * gridcell_height:
+                coverage += points_in_convex_polygons(parts, sub_xs + dx, sub_ys + dy)
+        coverage /= subsamples ** 2
+    if not coverage.any():
+        return None
+    return slice(j0, j1), slice(i0, i1), coverage
+
+
 def create_module_cells_mesh(mod_x: float,
                              mod_y: float,
                              mod_width: float,
@@ -1,4 +1,5 @@
 from typing import Iterable, Sequence
+import sys
 import numpy as np
 from hybrid.sites import SiteInfo
 import PySAM.Singleowner as Singleowner
@@ -6,6 +7,7 @@ import PySAM.Pvsamv1 as Pvsamv1
 import pandas as pd
 from tools.utils import flatten_dict, array_not_scalar
 from hybrid.log import hybrid_logger as logger
+from hybrid.timing import PhaseTimer
 from hybrid.dispatch.power_sources.power_source_dispatch import PowerSourceDispatch
 
 
@@ -20,6 +22,7 @@ class PowerSource:
     site : :class:`hybrid.sites.SiteInfo`
         Power source site information
     """
+    _model_group_cache: dict = {}    # model type -> {variable name: model group name}, see find_model_group
 
     def __init__(self, name, site: SiteInfo, system_model, financial_model):
         """
@@ -36,6 +39,8 @@ class PowerSource:
         self._financial_model = financial_model
         self._layout = None
         self._dispatch = PowerSourceDispatch
+        self._financial_model_linked = False    # whether financial model was created from the system model's data
+        self.timer = PhaseTimer()
         if isinstance(self._financial_model, Singleowner.Singleowner):
             self.initialize_financial_values()
         self.gen_max_feasible = [0.] * self.site.n_timesteps
@@ -85,26 +90,16 @@ class PowerSource:
         """
         var_name = var_name.replace('adjust:', '')
         attr_obj = None
-        if var_name in self.__dir__():
+        if self._has_attribute(var_name):
             attr_obj = self
         if not attr_obj:
-            for a in self._system_model.__dir__():
-                group_obj = getattr(self._system_model, a)
-                try:
-                    if var_name in group_obj.__dir__():
-                        attr_obj = group_obj
-                        break
-                except:
-                    pass
+            group_name = PowerSource.find_model_group(self._system_model, var_name)
+            if group_name is not None:
+                attr_obj = getattr(self._system_model, group_name)
         if not attr_obj:
-            for a in self._financial_model.__dir__():
-                try:
-                    group_obj = getattr(self._financial_model, a)
-                    if var_name in group_obj.__dir__():
-                        attr_obj = group_obj
-                        break
-                except:
-                    pass
+            group_name = PowerSource.find_model_group(self._financial_model, var_name)
+            if group_name is not None:
+                attr_obj = getattr(self._financial_model, group_name)
         if not attr_obj:
             raise ValueError("Variable {} not found in technology or financial model {}".format(
                 var_name, self.__class__.__name__))
@@ -120,6 +115,45 @@ class PowerSource:
             except Exception as e:
                 raise IOError(f"{self.__class__}'s attribute {var_name} could not be set to {var_value}: {e}")
 
+    def _has_attribute(self, var_name: str) -> bool:
+        """
+        Checks if variable is an attribute of this object, equivalent to ``var_name in self.__dir__()`` without
+        building the sorted attribute list.
+        """
+        return var_name in self.__dict__ or hasattr(type(self), var_name)
+
+    @staticmethod
+    def find_model_group(model, var_name: str):
+        """
+        Finds the name of the group (e.g., PySAM model subclass) within model that contains variable.
+
+        Results are cached by model type after the first lookup, because all instances of a model type share the same
+        groups. Replacing a model with one of another type therefore uses that type's cache.
+
+        :param model: System or financial model
+        :param var_name: Variable name
+
+        :returns: Group name, None if variable is not found
+        """
+        model_cache = PowerSource._model_group_cache.setdefault(type(model), {})
+        if var_name not in model_cache:
+            group_name = None
+            for a in model.__dir__():
+                try:
+                    group_obj = getattr(model, a)
+                    if var_name in group_obj.__dir__():
+                        group_name = a
+                        break
+                except:
+                    pass
+            model_cache[var_name] = group_name
+        return model_cache[var_name]
+
+    @staticmethod
+    def clear_model_group_cache():
+        """Clears the cached variable to model group resolutions"""
+        PowerSource._model_group_cache.clear()
+
     def assign(self, input_dict: dict):
         """
         Sets input variables in the PowerSource class or any of its subclasses (system or financial models)
@@ -127,6 +161,48 @@ class PowerSource:
         for k, v in input_dict.items():
             self.value(k, v)
 
+    @staticmethod
+    def copy_model(model, linked_model=None):
+        """
+        Creates a new PySAM model of the same type as ``model`` with a copy of its inputs. Outputs are not copied.
+
+        :param model: PySAM model
+        :param linked_model: (optional) PySAM model with which the new model shares its data, as with
+            ``from_existing``
+
+        :returns: new PySAM model, None if ``model`` is not a PySAM model
+        """
+        name = type(model).__name__
+        module = sys.modules.get("PySAM." + name)
+        if module is None or not isinstance(model, getattr(module, name, ())):
+            return None
+        if linked_model is None:
+            new_model = module.new()
+        else:
+            new_model = module.from_existing(linked_model)
+        new_model.assign(model.export())
+        return new_model
+
+    def setup_copy(self, memo: dict):
+        """
+        Prepares a ``copy.deepcopy`` memo for copying this power source, see :func:`hybrid.hybrid_simulation.HybridSimulation.copy`.
+
+        PySAM models cannot be deep copied, so new models are created from their exported inputs, keeping a financial
+        model that was created from the system model's data linked to the new system model. The site is shared.
+
+        :param memo: memo dictionary passed to ``copy.deepcopy``
+        """
+        memo[id(self.site)] = self.site
+        if self._system_model is not None and id(self._system_model) not in memo:
+            system_model = PowerSource.copy_model(self._system_model)
+            if system_model is not None:
+                memo[id(self._system_model)] = system_model
+        if self._financial_model is not None and id(self._financial_model) not in memo:
+            linked_model = memo.get(id(self._system_model)) if self._financial_model_linked else None
+            financial_model = PowerSource.copy_model(self._financial_model, linked_model)
+            if financial_model is not None:
+                memo[id(self._financial_model)] = financial_model
+
     def calc_nominal_capacity(self, interconnect_kw: float):
         """
         Calculates the nominal AC net system capacity based on specific technology.
@@ -160,8 +236,9 @@ class PowerSource:
         """
         W_ac_nom = self.calc_nominal_capacity(interconnect_kw)
         t_step = self.site.interval / 60                                                # hr
-        E_net_max_feasible = [min(x,W_ac_nom) * t_step for x in self.generation_profile[0:self.site.n_timesteps]]      # [kWh]
-        return E_net_max_feasible
+        gen = np.asarray(self.generation_profile[0:self.site.n_timesteps], dtype=float)
+        E_net_max_feasible = np.minimum(gen, W_ac_nom) * t_step                          # [kWh]
+        return E_net_max_feasible.tolist()
 
     def calc_capacity_credit_percent(self, interconnect_kw: float) -> float:
         """
@@ -223,7 +300,8 @@ class PowerSource:
             self._system_model.Lifetime.system_use_lifetime_output = 1 if lifetime_sim else 0
             self._system_model.Lifetime.analysis_period = project_life if lifetime_sim else 1
 
-        self._system_model.execute(0)
+        with self.timer.phase('ssc_execute'):
+            self._system_model.execute(0)
         logger.info(f"{self.name} simulation executed with AEP {self.annual_energy_kwh}")
         
     def simulate_financials(self, interconnect_kw: float, project_life: int):
@@ -253,9 +331,12 @@ class PowerSource:
             else:
                 raise RuntimeError(f"simulate_financials error: generation profile of len {self.site.n_timesteps} required")
 
-        if len(self._financial_model.value('gen')) == self.site.n_timesteps:
-            self._financial_model.value('gen', self._financial_model.value('gen') * project_life)
-        self._financial_model.value('system_pre_curtailment_kwac', self._financial_model.value('gen'))
+        # Lifetime profiles are replicated as sequences, which only copies references, and set once each
+        lifetime_gen = self._financial_model.value('gen')
+        if len(lifetime_gen) == self.site.n_timesteps:
+            lifetime_gen = tuple(lifetime_gen) * project_life
+            self._financial_model.value('gen', lifetime_gen)
+        self._financial_model.value('system_pre_curtailment_kwac', lifetime_gen)
         self._financial_model.value('annual_energy_pre_curtailment_ac', self._system_model.value("annual_energy"))
         # TODO: Should we use the nominal capacity function here?
         self.gen_max_feasible = self.calc_gen_max_feasible_kwh(interconnect_kw)
@@ -267,7 +348,8 @@ class PowerSource:
             except:
                 raise NotImplementedError("Financial model cannot set its inputs.")
 
-        self._financial_model.execute(0)
+        with self.timer.phase('financial_execute'):
+            self._financial_model.execute(0)
 
     def simulate(self, interconnect_kw: float, project_life: int = 25, lifetime_sim=False):
         """
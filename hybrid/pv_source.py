@@ -36,6 +36,7 @@ class PVPlant(PowerSource):
             financial_model = Singleowner.from_existing(system_model, "PVWattsSingleOwner")
 
         super().__init__("SolarPlant", site, system_model, financial_model)
+        self._financial_model_linked = 'fin_model' not in pv_config.keys()
 
         self._system_model.SolarResource.solar_resource_data = self.site.solar_resource.data
 
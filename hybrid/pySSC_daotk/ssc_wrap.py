@@ -55,6 +55,11 @@ class PysscWrap(SscWrap):
         self.wrapper = 'pyssc'
         self.tech_name = tech_name
         self.financial_name = financial_name
+        # When warm_start is True, execute() keeps the ssc data container between calls and only sets the
+        # parameters changed since the previous call, instead of converting all parameters every call
+        self.warm_start = False
+        self._dat = None                # warm ssc data container
+        self._changed = set()           # parameters set since the warm data container was updated
         if defaults is not None:
             self.defaults = copy.deepcopy(defaults)
             self.params = copy.deepcopy(self.defaults)
@@ -69,14 +74,79 @@ class PysscWrap(SscWrap):
             param_dict['is_elec_heat_dur_off'] = param_dict['is_elec_heat_dur_off'][0]
 
         self.params.update(param_dict)
+        self._changed.update(param_dict.keys())
 
     def get(self, name):
         return self.params[name]
 
     def execute(self):
+        if self.warm_start and self.params['financial_model'] in [None, "none"]:
+            return self.execute_warm()
         results = ssc_sim_from_dict(self.ssc, self.params)
         return results
 
+    def execute_warm(self):
+        """Runs the technology compute module on the warm data container, see warm_start"""
+        tech_model_name = self.params['tech_model']
+        var_info = ssc_module_var_info(self.ssc, tech_model_name)
+        if self._dat is None:
+            self._dat = self.ssc.data_create()
+            changed = self.params.keys()
+        else:
+            changed = self._changed
+        for name in changed:
+            if name in var_info and var_info[name][1] in (1, 3):     # INPUT or INOUT
+                value = self.params[name]
+                if var_info[name][0] in (3, 4, 5) and len(value) == 0:
+                    self.ssc.data_unassign(self._dat, name.encode("ascii"))
+                else:
+                    set_ssc_var(var_info[name][0], self.ssc, self._dat, name, value)
+        # the compute module may overwrite INOUT variables, so those are set again before the next run
+        self._changed = set(name for name, (_, var_type) in var_info.items() if var_type == 3)
+
+        cmod = self.ssc.module_create(tech_model_name.encode("utf-8"))
+        self.ssc.module_exec_set_print(0)
+        success = self.ssc.module_exec(cmod, self._dat)
+        if success == 0:
+            print(tech_model_name + ' simulation error')
+            idx = 0
+            msg = self.ssc.module_log(cmod, idx)
+            while msg is not None:
+                print(' : ' + msg.decode("utf - 8"))
+                idx = idx + 1
+                msg = self.ssc.module_log(cmod, idx)
+        self.ssc.module_free(cmod)
+
+        # inputs are taken from params, only outputs are read from ssc
+        results = {name: self.params[name] for name, (_, var_type) in var_info.items()
+                   if var_type == 1 and name in self.params}
+        results.update(ssc_data_to_dict(self.ssc, self._dat, {name: info for name, info in var_info.items()
+                                                               if info[1] in (2, 3)}))
+        results["tech_model"] = tech_model_name
+        results["financial_model"] = self.params['financial_model']
+        results["cmod_success"] = 1 if success else 0
+        return results
+
+    def free_warm_data(self):
+        """Frees the warm data container, the next warm run sets all parameters"""
+        if self._dat is not None:
+            self.ssc.data_free(self._dat)
+            self._dat = None
+        self._changed = set()
+
+    def __getstate__(self):
+        # copies create their own warm data container
+        state = self.__dict__.copy()
+        state['_dat'] = None
+        state['_changed'] = set()
+        return state
+
+    def __del__(self):
+        try:
+            self.free_warm_data()
+        except Exception:
+            pass
+
     def export_params(self):
         return copy.deepcopy(self.params)
 
@@ -297,6 +367,47 @@ def ssc_cmod(ssc, dat, name):
     return [True, ssc_table_to_dict(ssc, cmod, dat)]
 
 
+_module_var_info = {}
+
+
+def ssc_module_var_info(ssc, cmod_name):
+    """Returns {variable name: (data type, variable type)} of a compute module, read from ssc once per process"""
+    if cmod_name not in _module_var_info:
+        cmod = ssc.module_create(cmod_name.encode("utf-8"))
+        var_info = {}
+        ii = 0
+        while (True):
+            p_ssc_entry = ssc.module_var_info(cmod, ii)
+            ssc_data_type = ssc.info_data_type(p_ssc_entry)
+            if (ssc_data_type <= 0 or ssc_data_type > 5):
+                break
+            name = str(ssc.info_name(p_ssc_entry).decode("ascii"))
+            var_info[name] = (ssc_data_type, ssc.info_var_type(p_ssc_entry))
+            ii = ii + 1
+        ssc.module_free(cmod)
+        _module_var_info[cmod_name] = var_info
+    return _module_var_info[cmod_name]
+
+
+def ssc_data_to_dict(ssc, dat, var_info):
+    """Returns the assigned variables of var_info, {name: (data type, variable type)}, in an ssc data container"""
+    ssc_out = {}
+    for name, (ssc_data_type, _) in var_info.items():
+        name_ascii = name.encode("ascii")
+        if ssc.data_query(dat, name_ascii) > 0:
+            if (ssc_data_type == 1):
+                ssc_out[name] = ssc.data_get_string(dat, name_ascii).decode("ascii")
+            elif (ssc_data_type == 2):
+                ssc_out[name] = ssc.data_get_number(dat, name_ascii)
+            elif (ssc_data_type == 3):
+                ssc_out[name] = ssc.data_get_array(dat, name_ascii)
+            elif (ssc_data_type == 4):
+                ssc_out[name] = ssc.data_get_matrix(dat, name_ascii)
+            elif (ssc_data_type == 5):
+                ssc_out[name] = ssc.data_get_table(dat, name_ascii)
+    return ssc_out
+
+
 def dict_to_ssc_table(ssc, py_dict, cmod_name):
     # ssc = PySSC()
     dat = ssc.data_create()
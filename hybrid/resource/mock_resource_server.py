@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from hybrid.resource.resource import default_resource_dir
+from hybrid.resource.solar_resource import NSRDB_PATH
+from hybrid.resource.wind_resource import WTK_PATH
+
+
+default_solar_template = os.path.join(default_resource_dir, 'solar', '35.2018863_-101.945027_psmv3_60_2012.csv')
+default_wind_template = os.path.join(default_resource_dir, 'wind',
+                                     '35.2018863_-101.945027_windtoolkit_2012_60min_100m.srw')
+
+
+class MockResourceServer:
+    """
+    Local stand-in for the NREL developer API, for testing resource downloads without network access.
+
+    Serves the NSRDB and Wind Toolkit download endpoints on localhost, responding to every request with the contents
+    of a template resource file. The first ``fail_first`` requests of each url are answered with ``fail_status``
+    instead, to exercise retries. Use as a context manager and pass ``url`` as the downloader's ``base_url``::
+
+        with MockResourceServer() as server:
+            download_resources(requests, base_url=server.url, api_key='test')
+    """
+    def __init__(self,
+                 solar_template: str = default_solar_template,
+                 wind_template: str = default_wind_template,
+                 fail_first: int = 0,
+                 fail_status: int = 503,
+                 delay_s: float = 0.):
+        """
+        :param solar_template: file served for solar resource requests
+        :param wind_template: file served for wind resource requests
+        :param fail_first: number of failed responses to each url before succeeding
+        :param fail_status: HTTP status of failed responses
+        :param delay_s: time taken by each response [s]
+        """
+        with open(solar_template, 'rb') as f:
+            self.solar_content = f.read()
+        with open(wind_template, 'rb') as f:
+            self.wind_content = f.read()
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.delay_s = delay_s
+
+        self.requests = []              # paths of all requests received, with query
+        self.connections = set()        # client addresses, one per connection
+        self.max_active = 0             # maximum number of requests handled concurrently
+        self._active = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def start(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def respond(self, path: str, client_address) -> tuple:
+        """
+        :returns: (status, body) for a request
+        """
+        with self._lock:
+            n_previous = self.requests.count(path)
+            self.requests.append(path)
+            self.connections.add(client_address)
+            self._active += 1
+            self.max_active = max(self.max_active, self._active)
+        try:
+            if self.delay_s > 0:
+                time.sleep(self.delay_s)
+            endpoint = urlparse(path).path
+            if endpoint == NSRDB_PATH:
+                content = self.solar_content
+            elif endpoint == WTK_PATH:
+                content = self.wind_content
+            else:
+                return 404, b'{"errors": ["Unknown endpoint"]}'
+            if n_previous < self.fail_first:
+                return self.fail_status, b''
+            return 200, content
+        finally:
+            with self._lock:
+                self._active -= 1
+
+
+def _make_handler(server: MockResourceServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'     # keep-alive, so pooled connections are reused
+
+        def do_GET(self):
+            status, body = server.respond(self.path, self.client_address)
+            self.send_response(status)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
@@ -5,6 +5,21 @@ import requests
 import time
 
 
+NREL_API_URL = 'https://developer.nrel.gov'
+
+# generic api settings
+default_api_settings = {'interval': str(int(8760/365/24 * 60)),
+                        'leap_year': 'false',
+                        'utc': 'false',
+                        'name': 'hybrid-systems',
+                        'affiliation': 'NREL',
+                        'reason': 'hybrid-analysis',
+                        'email': 'nicholas.diorio@nrel.gov',
+                        'mailing_list': 'true'}
+
+default_resource_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..', 'resource_files')
+
+
 class Resource(metaclass=ABCMeta):
     """
     Class to manage resource data for a given lat & lon. If a resource file doesn't exist,
@@ -30,18 +45,11 @@ class Resource(metaclass=ABCMeta):
         self.n_timesteps = 8760
 
         # generic api settings
-        self.interval = str(int(8760/365/24 * 60))
-        self.leap_year = 'false'
-        self.utc = 'false'
-        self.name = 'hybrid-systems'
-        self.affiliation = 'NREL'
-        self.reason = 'hybrid-analysis'
-        self.email = 'nicholas.diorio@nrel.gov'
-        self.mailing_list = 'true'
+        self.__dict__.update(default_api_settings)
 
         # paths
         self.path_current = os.path.dirname(os.path.abspath(__file__))
-        self.path_resource = os.path.join(self.path_current, '../..', 'resource_files')
+        self.path_resource = default_resource_dir
 
         # update any passed in
         self.__dict__.update(kwargs)
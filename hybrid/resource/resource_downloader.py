@@ -0,0 +1,231 @@
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, NamedTuple, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from hybrid.keys import get_developer_nrel_gov_key
+from hybrid.log import hybrid_logger as logger
+from hybrid.resource.resource import NREL_API_URL, default_api_settings, default_resource_dir
+from hybrid.resource.solar_resource import get_solar_resource_filename, get_solar_download_url
+from hybrid.resource.wind_resource import get_wind_resource_files, get_wind_download_url, combine_wind_files
+
+
+class ResourceRequest(NamedTuple):
+    """Location and year of resource to download, with the wind turbine hub height if wind resource is needed"""
+    lat: float
+    lon: float
+    year: int
+    hub_height: Optional[float] = None
+
+
+class DownloadResult:
+    """Resource files of a ResourceRequest, in the layout used by SolarResource and WindResource"""
+    def __init__(self, request: ResourceRequest):
+        self.request = request
+        self.solar_filename: Optional[str] = None
+        self.wind_filename: Optional[str] = None
+        self.errors = {}            # {'solar' | 'wind': error message}
+
+    @property
+    def success(self) -> bool:
+        return len(self.errors) == 0
+
+    def __repr__(self):
+        return "DownloadResult({}, solar={}, wind={}, errors={})".format(self.request, self.solar_filename,
+                                                                          self.wind_filename, self.errors)
+
+
+class DownloadError(Exception):
+    """Raised when a resource file can not be downloaded"""
+
+
+class ResourceDownloader:
+    """
+    Downloads the NSRDB solar and Wind Toolkit resource files of many locations concurrently.
+
+    Requests share a pooled HTTP session and run on a bounded number of threads. Rate limited (429), server error
+    (5xx) and timed out requests are retried with exponential backoff, while invalid requests (400, 403, 404) fail
+    immediately. Files are written atomically to the same paths SolarResource and WindResource use, so those load
+    the downloaded files instead of calling the API. Existing files are not downloaded again.
+    """
+    def __init__(self,
+                 path_resource: str = default_resource_dir,
+                 max_workers: int = 8,
+                 max_tries: int = 5,
+                 backoff_s: float = 0.5,
+                 max_backoff_s: float = 30.,
+                 timeout_s: float = 120.,
+                 base_url: str = NREL_API_URL,
+                 api_key: Optional[str] = None,
+                 overwrite: bool = False):
+        """
+        :param path_resource: directory containing the 'solar' and 'wind' resource directories
+        :param max_workers: maximum number of concurrent requests
+        :param max_tries: maximum number of attempts per file
+        :param backoff_s: delay before the first retry, doubled after every failed attempt [s]
+        :param max_backoff_s: maximum delay between attempts [s]
+        :param timeout_s: connect and read timeout of each request [s]
+        :param base_url: API host, e.g., the url of a MockResourceServer
+        :param api_key: NREL developer key, otherwise the key set in ``hybrid.keys``
+        :param overwrite: whether to download files that already exist
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.path_resource = path_resource
+        self.max_workers = max_workers
+        self.max_tries = max_tries
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.timeout_s = timeout_s
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key if api_key is not None else get_developer_nrel_gov_key()
+        self.overwrite = overwrite
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def download(self, resource_requests: Iterable, solar: bool = True, wind: bool = True) -> List[DownloadResult]:
+        """
+        Downloads the resource files of the requests
+
+        :param resource_requests: ResourceRequests or (lat, lon, year[, hub height]) tuples
+        :param solar: whether to download solar resource
+        :param wind: whether to download wind resource, for requests with a hub height
+
+        :returns: a DownloadResult per request, in order
+        """
+        resource_requests = [ResourceRequest(*r) for r in resource_requests]
+        results = [DownloadResult(r) for r in resource_requests]
+        solar_dir = os.path.join(self.path_resource, 'solar')
+        wind_dir = os.path.join(self.path_resource, 'wind')
+        interval = default_api_settings['interval']
+
+        # unique files to download, {filename: url}, and the ({part: file}, resource file) each request needs
+        downloads = {}
+        needed = []
+        for r in resource_requests:
+            files = {}
+            if solar:
+                filename = get_solar_resource_filename(solar_dir, r.lat, r.lon, r.year, interval)
+                files['solar'] = ({None: filename}, filename)
+                if self.overwrite or not os.path.isfile(filename):
+                    downloads[filename] = get_solar_download_url(r.lat, r.lon, r.year, self.api_key, self.base_url)
+            if wind and r.hub_height is not None:
+                height_files, filename = get_wind_resource_files(wind_dir, r.lat, r.lon, r.year, r.hub_height,
+                                                                 interval)
+                files['wind'] = (height_files, filename)
+                if self.overwrite or not os.path.isfile(filename):
+                    for height, f in height_files.items():
+                        if self.overwrite or not os.path.isfile(f):
+                            downloads[f] = get_wind_download_url(r.lat, r.lon, r.year, height, self.api_key,
+                                                                 self.base_url)
+            needed.append(files)
+
+        for directory in {os.path.dirname(f) for f in downloads.keys()}:
+            os.makedirs(directory, exist_ok=True)
+
+        errors = {}
+        if len(downloads):
+            logger.info("ResourceDownloader: downloading {} files with {} workers".format(len(downloads),
+                                                                                        self.max_workers))
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(downloads))) as executor:
+                futures = {filename: executor.submit(self.fetch, url, filename)
+                           for filename, url in downloads.items()}
+                for filename, future in futures.items():
+                    err = future.exception()
+                    if err is not None:
+                        errors[filename] = str(err)
+
+        for result, files in zip(results, needed):
+            for kind, (parts, filename) in files.items():
+                failed = [errors[f] for f in parts.values() if f in errors]
+                if failed:
+                    result.errors[kind] = "; ".join(failed)
+                    continue
+                if len(parts) > 1 and (self.overwrite or not os.path.isfile(filename)):
+                    if not combine_wind_files(parts, filename):
+                        result.errors[kind] = "Could not combine wind resource files " + str(list(parts.values()))
+                        continue
+                setattr(result, kind + '_filename', filename)
+        return results
+
+    def fetch(self, url: str, filename: str):
+        """
+        Downloads a single file, retrying with exponential backoff
+
+        :param url: API endpoint
+        :param filename: file to write, replaced atomically once the download completes
+        """
+        err = None
+        for attempt in range(self.max_tries):
+            if attempt > 0:
+                time.sleep(self._retry_delay(attempt, err))
+            try:
+                r = self.session.get(url, timeout=self.timeout_s)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                err = e
+                continue
+            if r.ok:
+                self._write(filename, r.content)
+                return
+            elif r.status_code in (400, 403, 404):
+                message = r.text
+                try:
+                    text_json = json.loads(r.text)
+                    if 'errors' in text_json.keys():
+                        message = text_json['errors']
+                except (ValueError, AttributeError):
+                    pass
+                raise DownloadError("{} for {}: {}".format(r.status_code, filename, message))
+            err = r
+        raise DownloadError("Failed to download {} after {} attempts, last error: {}".format(
+            filename, self.max_tries, err.status_code if isinstance(err, requests.Response) else err))
+
+    def _retry_delay(self, attempt: int, err) -> float:
+        """Delay before an attempt, using the server's Retry-After if given, with jitter so workers spread out"""
+        if isinstance(err, requests.Response) and 'Retry-After' in err.headers:
+            try:
+                return min(float(err.headers['Retry-After']), self.max_backoff_s)
+            except ValueError:
+                pass
+        delay = min(self.backoff_s * 2 ** (attempt - 1), self.max_backoff_s)
+        return delay * (0.5 + 0.5 * random.random())
+
+    @staticmethod
+    def _write(filename: str, content: bytes):
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(filename), suffix='.part', delete=False) as f:
+            f.write(content)
+        os.replace(f.name, filename)
+
+
+def download_resources(resource_requests: Iterable, solar: bool = True, wind: bool = True,
+                       **kwargs) -> List[DownloadResult]:
+    """
+    Downloads the solar and wind resource files of many locations concurrently, see :class:`ResourceDownloader`
+
+    :param resource_requests: ResourceRequests or (lat, lon, year[, hub height]) tuples
+    :param solar: whether to download solar resource
+    :param wind: whether to download wind resource, for requests with a hub height
+    :param kwargs: ResourceDownloader options
+
+    :returns: a DownloadResult per request, in order
+    """
+    with ResourceDownloader(**kwargs) as downloader:
+        return downloader.download(resource_requests, solar, wind)
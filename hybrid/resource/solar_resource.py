@@ -1,11 +1,38 @@
-import csv
-from collections import defaultdict
 import numpy as np
-from PySAM.ResourceTools import SAM_CSV_to_solar_data
 
 from hybrid.keys import get_developer_nrel_gov_key
 from hybrid.log import hybrid_logger as logger
 from hybrid.resource.resource import *
+from hybrid.resource.weather_cache import load_weather_file
+
+
+NSRDB_PATH = '/api/nsrdb/v2/solar/psm3-download.csv'
+default_solar_attributes = 'ghi,dhi,dni,wind_speed,air_temperature,solar_zenith_angle,surface_pressure,dew_point'
+
+
+def get_solar_resource_filename(path_resource: str, lat, lon, year, interval: str = default_api_settings['interval']):
+    """
+    :param path_resource: directory of the solar resource files
+    :returns: path of the NSRDB file for the location and year
+    """
+    return os.path.join(path_resource, str(lat) + "_" + str(lon) + "_psmv3_" + str(interval) + "_" + str(year) + ".csv")
+
+
+def get_solar_download_url(lat, lon, year, api_key: str, base_url: str = NREL_API_URL,
+                           attributes: str = default_solar_attributes, **settings):
+    """
+    :param api_key: NREL developer key
+    :param base_url: API host
+    :param attributes: comma-separated NSRDB attributes to download
+    :param settings: overrides of ``default_api_settings``
+    :returns: NSRDB PSM v3 download url
+    """
+    s = dict(default_api_settings, **settings)
+    return (base_url + NSRDB_PATH + '?wkt=POINT({lon}+{lat})&names={year}&leap_day={leap}&interval={interval}&utc={utc}&full_name={name}&email={email}&affiliation={affiliation}&mailing_list={mailing_list}&reason={reason}&api_key={api}&attributes={attr}').format(
+        year=year, lat=lat, lon=lon, leap=s['leap_year'], interval=s['interval'],
+        utc=s['utc'], name=s['name'], email=s['email'],
+        mailing_list=s['mailing_list'], affiliation=s['affiliation'], reason=s['reason'], api=api_key,
+        attr=attributes)
 
 
 class SolarResource(Resource):
@@ -28,7 +55,7 @@ class SolarResource(Resource):
         if os.path.isdir(path_resource):
             self.path_resource = path_resource
 
-        self.solar_attributes = 'ghi,dhi,dni,wind_speed,air_temperature,solar_zenith_angle,surface_pressure,dew_point'
+        self.solar_attributes = default_solar_attributes
 
         self.path_resource = os.path.join(self.path_resource, 'solar')
 
@@ -37,9 +64,7 @@ class SolarResource(Resource):
 
         # resource_files files
         if filepath == "":
-            filepath = os.path.join(self.path_resource,
-                                    str(lat) + "_" + str(lon) + "_psmv3_" + str(self.interval) + "_" + str(
-                                        year) + ".csv")
+            filepath = get_solar_resource_filename(self.path_resource, lat, lon, year, self.interval)
         self.filename = filepath
 
         self.check_download_dir()   # FIXME: This breaks if weather file is in the same directory as caller
@@ -52,11 +77,9 @@ class SolarResource(Resource):
         logger.info("SolarResource: {}".format(self.filename))
 
     def download_resource(self):
-        url = 'https://developer.nrel.gov/api/nsrdb/v2/solar/psm3-download.csv?wkt=POINT({lon}+{lat})&names={year}&leap_day={leap}&interval={interval}&utc={utc}&full_name={name}&email={email}&affiliation={affiliation}&mailing_list={mailing_list}&reason={reason}&api_key={api}&attributes={attr}'.format(
-            year=self.year, lat=self.latitude, lon=self.longitude, leap=self.leap_year, interval=self.interval,
-            utc=self.utc, name=self.name, email=self.email,
-            mailing_list=self.mailing_list, affiliation=self.affiliation, reason=self.reason, api=get_developer_nrel_gov_key(),
-            attr=self.solar_attributes)
+        url = get_solar_download_url(self.latitude, self.longitude, self.year, get_developer_nrel_gov_key(),
+                                     attributes=self.solar_attributes,
+                                     **{key: getattr(self, key) for key in default_api_settings.keys()})
 
         success = self.call_api(url, filename=self.filename)
 
@@ -92,24 +115,31 @@ class SolarResource(Resource):
         :key tdew: array, dew point temp [C]
         :key press: array, atmospheric pressure [mbar]
         """
-        self._data = SAM_CSV_to_solar_data(data_dict)
+        # Same formatting as PySAM.ResourceTools.SAM_CSV_to_solar_data, read from the shared weather cache
+        weather = load_weather_file(data_dict)
+        if "Time Zone" not in weather.meta:
+            raise ValueError("`Time Zone` field not found in solar resource file.")
+        self._data = {'tz': weather.meta_float('Time Zone'),
+                      'elev': weather.meta_float('Elevation'),
+                      'lat': weather.meta_float('Latitude'),
+                      'lon': weather.meta_float('Longitude')}
+        for key, col in (('year', 'Year'), ('month', 'Month'), ('day', 'Day'), ('hour', 'Hour'),
+                         ('minute', 'Minute'), ('dn', 'DNI'), ('df', 'DHI'), ('gh', 'GHI'),
+                         ('wspd', 'Wind Speed'), ('tdry', 'Temperature')):
+            self._data[key] = weather[col].tolist()
+        for key, col in (('wdir', 'Wind Direction'), ('pres', 'Pressure'), ('tdew', 'Dew Point'),
+                         ('rhum', 'Relative Humidity'), ('rhum', 'RH'), ('alb', 'Surface Albedo'),
+                         ('snow', 'Snow Depth')):
+            if col in weather:
+                self._data[key] = weather[col].tolist()
+
         # TODO: Update ResourceTools.py in pySAM to include pressure and dew point or relative humidity
-        with open(data_dict) as file_in:
-            wfd = defaultdict(list)
-            for i in range(2):
-                file_in.readline()
-            reader = csv.DictReader(file_in)
-            for row in reader:
-                for col, dat in row.items():
-                    if len(col) > 0:
-                        wfd[col].append(float(dat))
-
-        if 'Dew Point' in wfd:
-            self._data['tdew'] = wfd.pop('Dew Point')
-        elif 'RH' in wfd:
-            self._data['rh'] = wfd.pop('RH')
-        elif 'Pressure' in wfd:
-            self._data['pres'] = wfd.pop('Pressure')
+        if 'Dew Point' in weather:
+            self._data['tdew'] = weather['Dew Point'].tolist()
+        elif 'RH' in weather:
+            self._data['rh'] = weather['RH'].tolist()
+        elif 'Pressure' in weather:
+            self._data['pres'] = weather['Pressure'].tolist()
 
 
     def roll_timezone(self, roll_hours, timezone):
@@ -0,0 +1,185 @@
+import csv
+import hashlib
+import json
+import os
+import re
+import tempfile
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from hybrid.log import hybrid_logger as logger
+
+
+_default_cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..', 'resource_files', 'weather_cache')
+_cache_dir: Optional[str] = _default_cache_dir
+_loaded: Dict[str, 'WeatherFileData'] = {}
+
+_int_pattern = re.compile(r'^\s*[-+]?\d+\s*$')
+
+
+class WeatherFileData:
+    """
+    Parsed contents of a SAM CSV (NSRDB/TMY) solar resource file.
+
+    The first two lines of the file hold the location metadata (names, values) and the third line holds the names of
+    the time series columns. All time series are stored as float64 in a single column-major array so each column is a
+    contiguous (and, when loaded from the on-disk cache, read-only memory-mapped) view.
+    """
+    def __init__(self, filepath: str, meta: Dict[str, str], columns: List[str], data: np.ndarray,
+                 integer_columns: List[str]):
+        """
+        :param filepath: path of the weather file the data was read from
+        :param meta: location metadata, {name: value string}
+        :param columns: time series column names, in file order
+        :param data: time series data, shape (n_columns, n_timesteps)
+        :param integer_columns: names of columns whose values were all written as integers
+        """
+        self.filepath = filepath
+        self.meta = meta
+        self.columns = columns
+        self.data = data
+        self.integer_columns = integer_columns
+        self._index = {name: i for i, name in enumerate(columns)}
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._index
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.data[self._index[column]]
+
+    def meta_float(self, name: str) -> float:
+        return float(self.meta[name])
+
+
+def set_weather_cache_dir(cache_dir: Optional[str]):
+    """
+    Sets the directory of the on-disk weather cache. ``None`` disables the on-disk cache, so weather files are parsed
+    once per process instead.
+    """
+    global _cache_dir
+    _cache_dir = cache_dir
+
+
+def get_weather_cache_dir() -> Optional[str]:
+    return _cache_dir
+
+
+def clear_loaded_weather():
+    """Clears the in-process weather file cache. The on-disk cache is unaffected."""
+    _loaded.clear()
+
+
+def weather_file_key(filepath: str) -> str:
+    """
+    Hash identifying a version of a weather file: its absolute path, modification time and size.
+    """
+    stat = os.stat(filepath)
+    key = "{}|{}|{}".format(os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def parse_weather_file(filepath: str) -> WeatherFileData:
+    """
+    Parses a SAM CSV solar resource file.
+
+    :param filepath: path of the weather file
+
+    :returns: WeatherFileData
+    """
+    if not os.path.isfile(filepath):
+        raise FileNotFoundError(f"{filepath} does not exist.")
+    with open(filepath) as file_in:
+        names = file_in.readline().rstrip('\r\n').split(',')
+        values = file_in.readline().rstrip('\r\n').split(',')
+        meta = {}
+        for name, value in zip(names, values):
+            if len(name) > 0 and name not in meta:
+                meta[name] = value
+
+        reader = csv.reader(file_in)
+        header = next(reader)
+        used = [(i, col) for i, col in enumerate(header) if len(col) > 0]
+        columns = [col for _, col in used]
+        rows = []
+        is_int = [True] * len(used)
+        for row in reader:
+            if not row:
+                continue
+            parsed = []
+            for j, (i, _) in enumerate(used):
+                token = row[i]
+                if is_int[j] and not _int_pattern.match(token):
+                    is_int[j] = False
+                parsed.append(float(token) if token.strip() else np.nan)
+            rows.append(parsed)
+
+    data = np.ascontiguousarray(np.array(rows, dtype=float).reshape(len(rows), len(columns)).T)
+    data.setflags(write=False)
+    integer_columns = [col for col, flag in zip(columns, is_int) if flag and len(rows) > 0]
+    return WeatherFileData(filepath, meta, columns, data, integer_columns)
+
+
+def _write_cache(cache_dir: str, key: str, weather: WeatherFileData):
+    """Writes the cache entry atomically, so concurrent processes only ever see complete files"""
+    os.makedirs(cache_dir, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=cache_dir, suffix='.npy', delete=False) as f:
+        np.save(f, weather.data)
+    os.replace(f.name, os.path.join(cache_dir, key + '.npy'))
+    header = {'filepath': os.path.abspath(weather.filepath),
+              'meta': weather.meta,
+              'columns': weather.columns,
+              'integer_columns': weather.integer_columns}
+    with tempfile.NamedTemporaryFile(mode='w', dir=cache_dir, suffix='.json', delete=False) as f:
+        json.dump(header, f)
+    os.replace(f.name, os.path.join(cache_dir, key + '.json'))
+
+
+def _read_cache(cache_dir: str, key: str, filepath: str) -> Optional[WeatherFileData]:
+    header_path = os.path.join(cache_dir, key + '.json')
+    data_path = os.path.join(cache_dir, key + '.npy')
+    if not (os.path.isfile(header_path) and os.path.isfile(data_path)):
+        return None
+    try:
+        with open(header_path) as f:
+            header = json.load(f)
+        data = np.load(data_path, mmap_mode='r')
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable weather cache entry {}: {}".format(data_path, e))
+        return None
+    if data.shape[0] != len(header['columns']):
+        return None
+    return WeatherFileData(filepath, header['meta'], header['columns'], data, header['integer_columns'])
+
+
+def load_weather_file(filepath: str) -> WeatherFileData:
+    """
+    Loads a SAM CSV solar resource file, parsing the text only once.
+
+    Parsed files are kept in memory for the rest of the process and saved to the on-disk cache directory, keyed by
+    a hash of the file's path, modification time and size. Other processes, such as parallel optimization workers,
+    then memory-map the cached array read-only instead of parsing the text again. Editing the file invalidates its
+    cache entry.
+
+    :param filepath: path of the weather file
+
+    :returns: WeatherFileData, whose arrays must be treated as read-only
+    """
+    if not os.path.isfile(filepath):
+        raise FileNotFoundError(f"{filepath} does not exist.")
+    key = weather_file_key(filepath)
+    if key in _loaded:
+        return _loaded[key]
+
+    weather = None
+    if _cache_dir is not None:
+        weather = _read_cache(_cache_dir, key, filepath)
+    if weather is None:
+        weather = parse_weather_file(filepath)
+        if _cache_dir is not None:
+            try:
+                _write_cache(_cache_dir, key, weather)
+            except OSError as e:
+                logger.warning("Could not write weather cache to {}: {}".format(_cache_dir, e))
+    _loaded[key] = weather
+    return weather
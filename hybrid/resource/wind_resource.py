@@ -8,6 +8,88 @@ from hybrid.log import hybrid_logger as logger
 from hybrid.resource.resource import *
 
 
+WTK_PATH = '/api/wind-toolkit/v2/wind/wtk-srw-download'
+allowed_hub_height_meters = [10, 40, 60, 80, 100, 120, 140, 160, 200]
+
+
+def get_wind_resource_files(path_resource: str, lat, lon, year, hub_height_meters,
+                            interval: str = default_api_settings['interval']):
+    """
+    Given the system hub height, and the available hubheights from WindToolkit,
+    determine which heights to download to bracket the hub height
+
+    :param path_resource: directory of the wind resource files
+    :returns: ({height: file to download}, combined resource file)
+    """
+    # evaluate hub height, determine what heights to download
+    heights = [hub_height_meters]
+    if hub_height_meters not in allowed_hub_height_meters:
+        height_low = allowed_hub_height_meters[0]
+        height_high = allowed_hub_height_meters[-1]
+        for h in allowed_hub_height_meters:
+            if h < hub_height_meters:
+                height_low = h
+            elif h > hub_height_meters:
+                height_high = h
+                break
+        heights[0] = height_low
+        heights.append(height_high)
+
+    file_resource_base = os.path.join(path_resource, str(lat) + "_" + str(lon) + "_windtoolkit_" + str(
+        year) + "_" + str(interval) + "min")
+    file_resource_full = file_resource_base
+    file_resource_heights = dict()
+
+    for h in heights:
+        file_resource_heights[h] = file_resource_base + '_' + str(h) + 'm.srw'
+        file_resource_full += "_" + str(h) + 'm'
+    file_resource_full += ".srw"
+    return file_resource_heights, file_resource_full
+
+
+def get_wind_download_url(lat, lon, year, hub_height_meters, api_key: str, base_url: str = NREL_API_URL,
+                          email: str = default_api_settings['email']):
+    """
+    :param api_key: NREL developer key
+    :param base_url: API host
+    :returns: Wind Toolkit SRW download url for a single height
+    """
+    return (base_url + WTK_PATH + '?year={year}&lat={lat}&lon={lon}&hubheight={hubheight}&api_key={api_key}&email={email}').format(
+        year=year, lat=lat, lon=lon, hubheight=hub_height_meters, api_key=api_key, email=email)
+
+
+def combine_wind_files(file_resource_heights: dict, filename: str):
+    """
+    Combines single height SRW files into one file
+
+    :param file_resource_heights: Keys are height in meters, values are corresponding files,
+        example {40: path_to_file, 60: path_to_file2}
+    :param filename: File path to write combined srw file
+    :returns: whether the combined file was written
+    """
+    data = [None] * 2
+    for height, f in file_resource_heights.items():
+        if os.path.isfile(f):
+            with open(f) as file_in:
+                csv_reader = csv.reader(file_in, delimiter=',')
+                line = 0
+                for row in csv_reader:
+                    if line < 2:
+                        data[line] = row
+                    else:
+                        if line >= len(data):
+                            data.append(row)
+                        else:
+                            data[line] += row
+                    line += 1
+
+    with open(filename, 'w', newline='') as fo:
+        writer = csv.writer(fo)
+        writer.writerows(data)
+
+    return os.path.isfile(filename)
+
+
 class WindResource(Resource):
     """ Class to manage Wind Resource data
 
@@ -18,7 +100,7 @@ class WindResource(Resource):
         filename - the combined resource filename
     """
 
-    allowed_hub_height_meters = [10, 40, 60, 80, 100, 120, 140, 160, 200]
+    allowed_hub_height_meters = allowed_hub_height_meters
 
     def __init__(self, lat, lon, year, wind_turbine_hub_ht, path_resource="", filepath="", **kwargs):
         """
@@ -61,34 +143,9 @@ class WindResource(Resource):
         Given the system hub height, and the available hubheights from WindToolkit,
         determine which heights to download to bracket the hub height
         """
-        hub_height_meters = self.hub_height_meters
-
-        # evaluate hub height, determine what heights to download
-        heights = [hub_height_meters]
-        if hub_height_meters not in self.allowed_hub_height_meters:
-            height_low = self.allowed_hub_height_meters[0]
-            height_high = self.allowed_hub_height_meters[-1]
-            for h in self.allowed_hub_height_meters:
-                if h < hub_height_meters:
-                    height_low = h
-                elif h > hub_height_meters:
-                    height_high = h
-                    break
-            heights[0] = height_low
-            heights.append(height_high)
-
-        file_resource_base = os.path.join(self.path_resource, str(self.latitude) + "_" + str(self.longitude) + "_windtoolkit_" + str(
-            self.year) + "_" + str(self.interval) + "min")
-        file_resource_full = file_resource_base
-        file_resource_heights = dict()
-
-        for h in heights:
-            file_resource_heights[h] = file_resource_base + '_' + str(h) + 'm.srw'
-            file_resource_full += "_" + str(h) + 'm'
-        file_resource_full += ".srw"
-
-        self.file_resource_heights = file_resource_heights
-        self.filename = file_resource_full
+        self.file_resource_heights, self.filename = get_wind_resource_files(self.path_resource, self.latitude,
+                                                                            self.longitude, self.year,
+                                                                            self.hub_height_meters, self.interval)
 
     def update_height(self, hub_height_meters):
         self.hub_height_meters = hub_height_meters
@@ -99,8 +156,8 @@ class WindResource(Resource):
         if not success:
 
             for height, f in self.file_resource_heights.items():
-                url = 'https://developer.nrel.gov/api/wind-toolkit/v2/wind/wtk-srw-download?year={year}&lat={lat}&lon={lon}&hubheight={hubheight}&api_key={api_key}&email={email}'.format(
-                    year=self.year, lat=self.latitude, lon=self.longitude, hubheight=height, api_key=get_developer_nrel_gov_key(), email=self.email)
+                url = get_wind_download_url(self.latitude, self.longitude, self.year, height,
+                                            get_developer_nrel_gov_key(), email=self.email)
 
                 success = self.call_api(url, filename=f)
 
@@ -118,35 +175,9 @@ class WindResource(Resource):
 
     def combine_wind_files(self):
         """
-        Parameters
-        ---------
-        file_resource_heights: dict
-            Keys are height in meters, values are corresponding files
-            example {40: path_to_file, 60: path_to_file2}
-        file_out: string
-            File path to write combined srw file
+        Combines the files of ``file_resource_heights`` into ``filename``
         """
-        data = [None] * 2
-        for height, f in self.file_resource_heights.items():
-            if os.path.isfile(f):
-                with open(f) as file_in:
-                    csv_reader = csv.reader(file_in, delimiter=',')
-                    line = 0
-                    for row in csv_reader:
-                        if line < 2:
-                            data[line] = row
-                        else:
-                            if line >= len(data):
-                                data.append(row)
-                            else:
-                                data[line] += row
-                        line += 1
-
-        with open(self.filename, 'w', newline='') as fo:
-            writer = csv.writer(fo)
-            writer.writerows(data)
-
-        return os.path.isfile(self.filename)
+        return combine_wind_files(self.file_resource_heights, self.filename)
 
     def format_data(self):
         """
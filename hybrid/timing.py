@@ -0,0 +1,79 @@
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+
+
+class PhaseTimer:
+    """
+    Opt-in wall time collection for named phases of a simulation.
+
+    Phases are timed with ``with timer.phase(name):`` blocks, and nested phases are recorded under the path of their
+    parents, i.e., ``simulate_power/dispatch/solve``. Repeated phases are accumulated. When disabled, ``phase`` returns
+    a shared no-op context so instrumented code runs at practically full speed.
+
+    A :class:`hybrid.hybrid_simulation.HybridSimulation` shares one timer with its power sources and dispatch builder,
+    enable it with ``hybrid_plant.timer.enabled = True``.
+    """
+    _disabled_phase = nullcontext()
+
+    def __init__(self, enabled: bool = False):
+        """
+        :param enabled: whether phases are timed
+        """
+        self.enabled = enabled
+        self._stack = []
+        self._totals = OrderedDict()
+        self._counts = {}
+
+    def phase(self, name: str):
+        """
+        Context manager timing a phase
+
+        :param name: phase name, without '/'
+        """
+        if not self.enabled:
+            return PhaseTimer._disabled_phase
+        return _Phase(self, name)
+
+    def _record(self, path: str, elapsed: float):
+        self._totals[path] = self._totals.get(path, 0.) + elapsed
+        self._counts[path] = self._counts.get(path, 0) + 1
+
+    def summary(self) -> dict:
+        """
+        :returns: ``{phase path: {'total_s': float, 'count': int}}``, in the order phases were first completed
+        """
+        return {path: {'total_s': total, 'count': self._counts[path]} for path, total in self._totals.items()}
+
+    def reset(self):
+        """Clears the recorded timings"""
+        self._totals.clear()
+        self._counts.clear()
+
+    def __str__(self):
+        lines = ["{:<60}{:>12}{:>10}".format('phase', 'total [s]', 'count')]
+        for path, values in self.summary().items():
+            lines.append("{:<60}{:>12.3f}{:>10d}".format(path, values['total_s'], values['count']))
+        return "\n".join(lines)
+
+
+class _Phase:
+    """Context timing a single occurrence of a phase"""
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer: PhaseTimer, name: str):
+        self.timer = timer
+        self.name = name
+        self.start = 0.
+
+    def __enter__(self):
+        self.timer._stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = time.perf_counter() - self.start
+        path = "/".join(self.timer._stack)
+        self.timer._stack.pop()
+        self.timer._record(path, elapsed)
+        return False
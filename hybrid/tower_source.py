@@ -11,6 +11,7 @@ from hybrid.dispatch.power_sources.csp_dispatch import CspDispatch
 
 from hybrid.power_source import *
 from hybrid.csp_source import CspPlant
+from hybrid import csp_setup_cache
 
 
 # TODO: Figure out where to put this...
@@ -34,6 +35,10 @@ class TowerPlant(CspPlant):
     # _layout: TowerLayout
     _dispatch: TowerDispatch
 
+    # Field layout and maps inputs replaced by the field generation, see create_field_layout_and_simulate_flux_eta_maps
+    field_cache_exclude = ['eta_map', 'flux_maps', 'A_sf_in', 'helio_positions', 'N_hel', 'land_area_base',
+                           'eta_map_aod_format']
+
     def __init__(self,
                  site: SiteInfo,
                  tower_config: dict):
@@ -149,7 +154,9 @@ class TowerPlant(CspPlant):
 
     def create_field_layout_and_simulate_flux_eta_maps(self, optimize_tower_field: bool = False):
         """
-        Creates heliostats field layout and simulates receiver flux efficiency maps to be stored.
+        Creates heliostats field layout and simulates receiver flux efficiency maps to be stored. If
+        ``use_setup_cache``, the field and maps are reused whenever the SSC inputs, apart from thermal storage size, and
+        the weather file are unchanged.
 
         :param optimize_tower_field: If True, SolarPilot's field and tower height optimization will before system
             simulation, o.w., SolarPilot will just generate field based on inputs.
@@ -172,16 +179,27 @@ class TowerPlant(CspPlant):
         # TODO: probably don't need hourly sf adjustment factors
         self.ssc.set({'is_dispatch_targets': False, 'rec_clearsky_model': 1, 'time_steps_per_hour': 1,
                       'sf_adjust:hourly': [0.0 for j in range(8760)]})
-        tech_outputs = self.ssc.execute()
-        print('Finished creating field layout and simulating flux and eta maps. # Heliostats = %d, Tower height = %.1fm, Receiver height = %.2fm, Receiver diameter = %.2fm'%
-             (tech_outputs['N_hel'], tech_outputs['h_tower'], tech_outputs['rec_height'], tech_outputs['D_rec']))
+
+        field_and_flux_maps = None
+        key = None
+        if self.use_setup_cache:
+            key = self.setup_cache_key(exclude=self.tes_cache_exclude + self.field_cache_exclude)
+            field_and_flux_maps = csp_setup_cache.get_cached('field', key)
+
+        if field_and_flux_maps is None:
+            with self.timer.phase('ssc_execute'):
+                tech_outputs = self.ssc.execute()
+            print('Finished creating field layout and simulating flux and eta maps. # Heliostats = %d, Tower height = %.1fm, Receiver height = %.2fm, Receiver diameter = %.2fm'%
+                 (tech_outputs['N_hel'], tech_outputs['h_tower'], tech_outputs['rec_height'], tech_outputs['D_rec']))
+            eta_map = tech_outputs["eta_map_out"]
+            flux_maps = [r[2:] for r in tech_outputs['flux_maps_for_import']]  # don't include first two columns
+            A_sf_in = tech_outputs["A_sf"]
+            field_and_flux_maps = {'eta_map': eta_map, 'flux_maps': flux_maps, 'A_sf_in': A_sf_in}
+            for k in ['helio_positions', 'N_hel', 'D_rec', 'rec_height', 'h_tower', 'land_area_base']:
+                field_and_flux_maps[k] = tech_outputs[k]
+            if key is not None:
+                csp_setup_cache.set_cached('field', key, field_and_flux_maps)
         self.ssc.set(original_values)
-        eta_map = tech_outputs["eta_map_out"]
-        flux_maps = [r[2:] for r in tech_outputs['flux_maps_for_import']]  # don't include first two columns
-        A_sf_in = tech_outputs["A_sf"]
-        field_and_flux_maps = {'eta_map': eta_map, 'flux_maps': flux_maps, 'A_sf_in': A_sf_in}
-        for k in ['helio_positions', 'N_hel', 'D_rec', 'rec_height', 'h_tower', 'land_area_base']:
-            field_and_flux_maps[k] = tech_outputs[k]
 
         # Check if specified receiver dimensions make sense relative to heliostat dimensions
         if min(field_and_flux_maps['rec_height'], field_and_flux_maps['D_rec']) < max(self.ssc.get('helio_width'), self.ssc.get('helio_height')):
@@ -50,7 +50,8 @@ class TroughPlant(CspPlant):
         """
         self.ssc.set({'time_start': 0.0, 'time_stop': 0.0})
         self.ssc.set({'is_dispatch_targets': 0})
-        tech_outputs = self.ssc.execute()
+        with self.timer.phase('ssc_execute'):
+            tech_outputs = self.ssc.execute()
         return tech_outputs['total_aperture'], tech_outputs['total_land_area']
 
     def calculate_total_installed_cost(self) -> float:
@@ -26,6 +26,9 @@ class WindPlant(PowerSource):
             where layout_mode can be selected from the following:
             - 'boundarygrid': regular grid with boundary turbines, requires WindBoundaryGridParameters as 'params'
             - 'grid': regular grid with dx, dy distance, 0 angle; does not require 'params'
+            with 'model_name': 'floris', FLORIS can be evaluated once per wind rose bin instead of every timestep by
+            setting 'wind_rose_binning': True, with optional 'wind_direction_bin_deg' (default 5) and
+            'wind_speed_bin_ms' (default 0.5)
 
         :param rating_range_kw:
             allowable kw range of turbines, default is 1000 - 3000 kW
@@ -47,6 +50,7 @@ class WindPlant(PowerSource):
             financial_model = farm_config['fin_model']
 
         super().__init__("WindPlant", site, system_model, financial_model)
+        self._financial_model_linked = 'model_name' not in farm_config.keys() and 'fin_model' not in farm_config.keys()
         self._system_model.value("wind_resource_data", self.site.wind_resource.data)
 
         if 'layout_mode' not in farm_config.keys():
@@ -1,5 +1,7 @@
+import numpy as np
 import pytest
 from tools.analysis import CostCalculator, BOSLookup, create_cost_calculator
+from tools.analysis.bos.bos_lookup import set_bos_cache_dir, get_bos_cache_dir, clear_loaded_lookups
 
 
 class TestCostCalculator:
@@ -118,3 +120,40 @@ class TestCostCalculator:
             assert True
 
 
+
+    def test_bos_calculate_bos_costs_batch(self):
+        bos_calc = BOSLookup()
+
+        interconnection_mw = np.repeat([10., 100., 250., 100., 100.], 2)
+        wind_mw = np.array([10., 0., 95., 90., 125., 160., 0., 0., 0., 150.])
+        solar_mw = np.array([0., 10., 15., 15., 125., 170., 0., 100., 0., 0.])
+        costs = bos_calc.calculate_bos_costs(wind_mw, solar_mw, interconnection_mw)
+        assert all(c.shape == wind_mw.shape for c in costs)
+        for i in range(len(wind_mw)):
+            expected = bos_calc.calculate_bos_costs(wind_mw[i], solar_mw[i], interconnection_mw[i])
+            if wind_mw[i] + solar_mw[i] == 0:
+                assert [c[i] for c in costs] == [0, 0, 0, 0]
+            else:
+                assert [c[i] for c in costs] == pytest.approx(expected)
+
+        with pytest.raises(ValueError):
+            bos_calc.calculate_bos_costs(wind_mw + 295, solar_mw + 295, 550)
+
+    def test_bos_lookup_cache(self, tmp_path):
+        previous = get_bos_cache_dir()
+        set_bos_cache_dir(str(tmp_path))
+        clear_loaded_lookups()
+        try:
+            bos_calc = BOSLookup()
+            assert len(list(tmp_path.glob("*.pkl"))) == 1
+            assert BOSLookup()._table is bos_calc._table
+
+            # new process-level load reads the cached triangulation
+            clear_loaded_lookups()
+            cached_calc = BOSLookup()
+            assert cached_calc._table is not bos_calc._table
+            assert np.array_equal(cached_calc._table.triangulation.simplices, bos_calc._table.triangulation.simplices)
+            assert cached_calc.calculate_bos_costs(95, 15, 100) == bos_calc.calculate_bos_costs(95, 15, 100)
+        finally:
+            set_bos_cache_dir(previous)
+            clear_loaded_lookups()
@@ -57,6 +57,18 @@ def test_custom_financial():
     assert npv == approx(7412807, 1e-3)
 
 
+def test_custom_financial_value_cache():
+    model = CustomFinancialModel(default_fin_config)
+    assert model.value('om_fixed') == [1]
+    assert model.value('inflation_rate') == approx(2.5)
+
+    other_model = CustomFinancialModel(default_fin_config)
+    other_model.value('om_fixed', [5])
+    assert other_model.value('om_fixed') == [5]
+    assert other_model.SystemCosts.om_fixed == [5]
+    assert model.value('om_fixed') == [1]
+
+
 def test_detailed_pv(site):
     # Run detailed PV model (pvsamv1) using a custom financial model
     annual_energy_expected = 108239401
@@ -69,6 +69,27 @@ def test_minimum_specification():
         [18,  21,  23,  29,  34,  42,  64,  69,  96, 107, 111, 118, 131, 134, 139, 147, 164, 172, 175, 177]
 
 
+def test_similarity_matches_rowwise():
+    rng = np.random.default_rng(0)
+    data = rng.uniform(0, 1, (183, 97))
+    expected = np.zeros((183, 183))
+    for g in range(183):
+        expected[g, :] = -((data[g, :] - data[:, :])**2).sum(1)
+    for max_block_size in (1, 5000, 2**21):
+        S = clustering.AffinityPropagation.compute_similarity(data, max_block_size)
+        assert np.array_equal(S, expected)
+
+
+def test_afp_warm_start():
+    clusterer = clustering.Clustering(
+        power_sources=['tower'],
+        solar_resource_file="resource_files/solar/35.2018863_-101.945027_psmv3_60_2012.csv")
+    clusterer.afp_warm_start = True
+    clusterer.run_clustering()
+    assert len(clusterer.clusters['count']) == 20
+    assert clusterer.clusters['count'].sum() == len(clusterer.clusters['index'])
+
+
 def test_alternate_solar_file():
     clusterer = clustering.Clustering(
         power_sources=['tower'],
@@ -412,3 +433,23 @@ def test_cluster_avgs_from_timeseries():
     assert max(list_lengths) == min(list_lengths)
     assert sum(cluster_averages[0]) == approx(495893, 1e-3)
     assert sum(cluster_averages[-1]) == approx(2734562, 1e-3)
+
+
+def test_solar_position_matches_pysolar():
+    import datetime
+    import pysolar
+    times = [datetime.datetime(2012, 1, 1, tzinfo=datetime.timezone.utc) + datetime.timedelta(hours=h)
+             for h in range(0, 8760, 7)]
+    unix_seconds = np.array([t.timestamp() for t in times])
+    for lat, lon in [(35.2, -101.9), (-33.9, 18.4), (60.2, 24.9)]:
+        expected = np.array([pysolar.solar.get_altitude(lat, lon, t) for t in times])
+        altitude = clustering.get_solar_altitude(lat, lon, unix_seconds)
+        assert altitude == approx(expected, abs=0.02)
+        daytime = expected > 1
+        csky = clustering.get_clear_sky_direct(unix_seconds[daytime], expected[daytime])
+        assert csky == approx([pysolar.radiation.get_radiation_direct(t, a)
+                               for t, a in zip(np.array(times)[daytime], expected[daytime])])
+
+    clusterer = clustering.Clustering(['tower'], None)
+    location = {'lat': 35.2, 'lon': -101.9, 'tz': -6, 'year': 2012}
+    assert clusterer.get_daylight_cutoffs(location, 172, 1) == (6, 20)
@@ -6,9 +6,12 @@ from pathlib import Path
 
 from hybrid.sites import SiteInfo, flatirons_site
 from hybrid.dispatch.power_sources.csp_dispatch import CspDispatch
+from hybrid.csp_source import CspOutputs
+from hybrid import csp_setup_cache
 from hybrid.tower_source import TowerPlant
 from hybrid.trough_source import TroughPlant
 from hybrid.hybrid_simulation import HybridSimulation
+from hybrid.power_source import PowerSource
 
 @pytest.fixture
 def site():
@@ -16,6 +19,27 @@ def site():
     wind_resource_file = Path(__file__).absolute().parent.parent.parent / "resource_files" / "wind" / "35.2018863_-101.945027_windtoolkit_2012_60min_80m_100m.srw"
     return SiteInfo(flatirons_site, solar_resource_file=solar_resource_file, wind_resource_file=wind_resource_file)
 
+def test_csp_value(site):
+    tower_config = {'cycle_capacity_kw': 100 * 1000,
+                    'solar_multiple': 2.0,
+                    'tes_hours': 6.0}
+
+    csp = TowerPlant(site, tower_config)
+    PowerSource.clear_model_group_cache()
+
+    assert csp.value('tes_hours') == tower_config['tes_hours']
+    csp.value('helio_width', 10.0)
+    assert csp.value('helio_width') == pytest.approx(10.0)
+    assert csp.ssc.get('helio_width') == pytest.approx(10.0)
+    csp.value('ppa_escalation', 1.5)
+    assert csp.value('ppa_escalation') == pytest.approx(1.5)
+    assert csp._financial_model.Revenue.ppa_escalation == pytest.approx(1.5)
+    assert PowerSource._model_group_cache[type(csp._financial_model)]['ppa_escalation'] == 'Revenue'
+
+    with pytest.raises(ValueError):
+        csp.value('not_a_variable')
+
+
 def test_pySSC_tower_model(site):
     """Testing pySSC tower model using heuristic dispatch method"""
     tower_config = {'cycle_capacity_kw': 100 * 1000,
@@ -342,4 +366,110 @@ def test_tower_annual_financial(site):
     assert csp.ssc.get('N_hel') == pytest.approx(expected_Nhel, 1e-3)
     assert csp.annual_energy_kwh == pytest.approx(expected_energy, 2e-3)
     assert csp._financial_model.value('lcoe_nom') == pytest.approx(expected_lcoe_nom, 2e-3)
-    assert csp._financial_model.value('lppa_nom') == pytest.approx(expected_ppa_nom, 2e-3)
\ No newline at end of file
+    assert csp._financial_model.value('lppa_nom') == pytest.approx(expected_ppa_nom, 2e-3)
+
+def test_csp_outputs_storage():
+    """Testing horizon outputs are stored at their simulation hours"""
+    outputs = CspOutputs()
+    for start_hour in (0, 24):
+        ssc_outputs = {'time_steps_per_hour': 1,
+                       'time_start': start_hour * 3600.,
+                       'time_stop': (start_hour + 48) * 3600.,
+                       'gen': [float(start_hour + t) for t in range(48)] + [0.] * (8760 - 48),
+                       'annual_energy': 1.}
+        outputs.update_from_ssc_output(ssc_outputs, skip_hr_end=24)
+
+    assert list(outputs.ssc_time_series.keys()) == ['gen']
+    assert len(outputs.ssc_time_series['gen']) == 8760
+    assert outputs.ssc_time_series['gen'][0:48] == pytest.approx([float(t) for t in range(48)])
+    assert sum(outputs.ssc_time_series['gen'][48:]) == 0
+    assert outputs.export()['ssc_time_series']['gen'][25] == pytest.approx(25.)
+
+
+def test_tower_setup_cache(site, tmp_path):
+    """Testing that the forecast and field of an identical tower design are reused"""
+    csp_setup_cache.set_csp_cache_dir(str(tmp_path))
+    csp_setup_cache.clear_csp_cache()
+    tower_config = {'cycle_capacity_kw': 100 * 1000,
+                    'solar_multiple': 2.0,
+                    'tes_hours': 6.0,
+                    'optimize_field_before_sim': False}
+    try:
+        csp = TowerPlant(site, tower_config)
+        csp.timer.enabled = True
+        csp.setup_performance_model()
+        assert csp.timer.summary()['ssc_execute']['count'] == 2
+
+        # storage size does not change the forecast or field
+        tower_config['tes_hours'] = 10.0
+        cached = TowerPlant(site, tower_config)
+        cached.timer.enabled = True
+        cached.setup_performance_model()
+        assert cached.timer.summary() == {}
+        assert cached.solar_thermal_resource == csp.solar_thermal_resource
+        assert cached.cycle_efficiency_tables == csp.cycle_efficiency_tables
+        for k in ['N_hel', 'D_rec', 'rec_height', 'h_tower', 'A_sf_in']:
+            assert cached.value(k) == csp.value(k)
+        assert cached.value('tshours') == 10.0
+
+        # from the on-disk cache
+        csp_setup_cache.clear_csp_cache()
+        tower_config['solar_multiple'] = 2.5
+        changed = TowerPlant(site, tower_config)
+        changed.timer.enabled = True
+        changed.setup_performance_model()
+        assert changed.timer.summary()['ssc_execute']['count'] == 2
+        tower_config['solar_multiple'] = 2.0
+        cached = TowerPlant(site, tower_config)
+        cached.timer.enabled = True
+        cached.setup_performance_model()
+        assert cached.timer.summary() == {}
+        assert cached.solar_thermal_resource == csp.solar_thermal_resource
+    finally:
+        csp_setup_cache.set_csp_cache_dir(csp_setup_cache._default_cache_dir)
+        csp_setup_cache.clear_csp_cache()
+
+
+def test_csp_setup_cache_key(tmp_path):
+    params = {'P_ref': 100, 'tshours': 6., 'helio_positions': [[0., 1.], [2., 3.]], 'flux_maps': [[1.], [2., 3.]]}
+    key = csp_setup_cache.ssc_inputs_key(params, weather='a')
+    assert key == csp_setup_cache.ssc_inputs_key(dict(reversed(list(params.items()))), weather='a')
+    assert key != csp_setup_cache.ssc_inputs_key(params, weather='b')
+    assert key != csp_setup_cache.ssc_inputs_key({**params, 'P_ref': 101}, weather='a')
+    assert csp_setup_cache.ssc_inputs_key(params, exclude=['tshours']) == \
+        csp_setup_cache.ssc_inputs_key({**params, 'tshours': 10.}, exclude=['tshours'])
+
+    csp_setup_cache.set_csp_cache_dir(str(tmp_path))
+    try:
+        assert csp_setup_cache.get_cached('forecast', key) is None
+        csp_setup_cache.set_cached('forecast', key, {'Q_thermal': [1., 2.]})
+        cached = csp_setup_cache.get_cached('forecast', key)
+        cached['Q_thermal'][0] = 0.
+        csp_setup_cache.clear_csp_cache()
+        assert csp_setup_cache.get_cached('forecast', key) == {'Q_thermal': [1., 2.]}
+    finally:
+        csp_setup_cache.set_csp_cache_dir(csp_setup_cache._default_cache_dir)
+        csp_setup_cache.clear_csp_cache()
+
+
+@pytest.mark.parametrize('csp_tech', ['tower', 'trough'])
+def test_csp_warm_start_ssc(site, csp_tech):
+    """Testing that simulating dispatch horizons on a warm SSC data container gives the same results"""
+    annual_energy = {}
+    for warm_start in (False, True):
+        technologies = {csp_tech: {'cycle_capacity_kw': 50 * 1000,
+                                   'solar_multiple': 2.0,
+                                   'tes_hours': 6.0,
+                                   'optimize_field_before_sim': False,
+                                   'warm_start_ssc': warm_start},
+                        'grid': {'interconnect_kw': 50000}}
+        system = HybridSimulation(technologies, site, dispatch_options={'is_test_start_year': True,
+                                                                        'is_test_end_year': True})
+        system.ppa_price = (0.12,)
+        system.simulate()
+        csp = getattr(system, csp_tech)
+        assert csp.ssc.warm_start == warm_start
+        annual_energy[warm_start] = csp.annual_energy_kwh
+        if warm_start:
+            assert csp.ssc._dat is not None
+    assert annual_energy[True] == pytest.approx(annual_energy[False], 1e-6)
@@ -1,8 +1,12 @@
+import os
+import json
 import pytest
+import numpy as np
 from pathlib import Path
 import pyomo.environ as pyomo
 from pyomo.environ import units as u
-from pyomo.opt import TerminationCondition
+from pyomo.opt import TerminationCondition, SolverResults
+from pyomo.core.base.param import ScalarParam
 from pyomo.util.check_units import assert_units_consistent
 
 from hybrid.sites import SiteInfo, flatirons_site
@@ -433,6 +437,177 @@ def test_simple_battery_dispatch(site):
         assert battery.Outputs.P[i] == pytest.approx(dispatch_power, 1e-3 * abs(dispatch_power))
 
 
+def test_dispatch_block_params_set_when_changed(site, monkeypatch):
+    battery = Battery(site, technologies['battery'])
+
+    model = pyomo.ConcreteModel(name='battery_only')
+    model.forecast_horizon = pyomo.Set(initialize=range(4))
+    battery._dispatch = SimpleBatteryDispatch(model,
+                                              model.forecast_horizon,
+                                              battery._system_model,
+                                              battery._financial_model,
+                                              include_lifecycle_count=False)
+    battery.dispatch.initialize_parameters()
+
+    params_set = []
+    set_value = ScalarParam.set_value
+
+    def counting_set_value(param, *args, **kwargs):
+        params_set.append(param.local_name)
+        return set_value(param, *args, **kwargs)
+
+    monkeypatch.setattr(ScalarParam, 'set_value', counting_set_value)
+
+    battery.dispatch.update_time_series_parameters(0)
+    assert params_set == ['time_duration'] * 4
+    params_set.clear()
+
+    # unchanged values are not set again
+    battery.dispatch.update_time_series_parameters(24)
+    battery.dispatch.maximum_power = battery.dispatch.maximum_power
+    assert len(params_set) == 0
+
+    battery.dispatch.time_duration = [1.0, 1.0, 0.5, 1.0]
+    assert params_set == ['time_duration']
+    assert battery.dispatch.time_duration == [1.0, 1.0, 0.5, 1.0]
+
+    with pytest.raises(ValueError):
+        battery.dispatch.set_block_params(time_duration=[1.0] * 3)
+
+
+def test_simple_battery_dispatch_lp_relaxation(site):
+    dispatch_n_look_ahead = 24
+
+    battery = Battery(site, technologies['battery'])
+
+    model = pyomo.ConcreteModel(name='battery_only')
+    model.forecast_horizon = pyomo.Set(initialize=range(dispatch_n_look_ahead))
+    battery._dispatch = SimpleBatteryDispatch(model,
+                                              model.forecast_horizon,
+                                              battery._system_model,
+                                              battery._financial_model,
+                                              include_lifecycle_count=False)
+
+    # negative prices make burning energy through battery losses profitable
+    prices = {t: -50.0 if t < 4 else 40.0 for t in model.forecast_horizon}
+    model.test_objective = pyomo.Objective(
+        expr=sum(prices[t] * (model.battery[t].discharge_power - model.battery[t].charge_power)
+                 for t in model.forecast_horizon),
+        sense=pyomo.maximize)
+
+    battery.dispatch.initialize_parameters()
+    battery.dispatch.update_time_series_parameters(0)
+    battery.dispatch.update_dispatch_initial_soc(battery.dispatch.minimum_soc)
+
+    HybridDispatchBuilderSolver.glpk_solve_call(model)
+    milp_objective = pyomo.value(model.test_objective)
+
+    assert len(battery.dispatch.relax_binaries(True)) == 2 * dispatch_n_look_ahead
+    assert len(battery.dispatch.relax_binaries(True)) == 0
+    HybridDispatchBuilderSolver.glpk_solve_call(model)
+    assert pyomo.value(model.test_objective) >= milp_objective
+    assert any(c > 1e-5 and d > 1e-5 for c, d in zip(battery.dispatch.charge_power, battery.dispatch.discharge_power))
+    assert not battery.dispatch.round_relaxed_binaries()
+
+    # restoring the binaries recovers the MILP solution
+    battery.dispatch.relax_binaries(False)
+    HybridDispatchBuilderSolver.glpk_solve_call(model)
+    assert pyomo.value(model.test_objective) == pytest.approx(milp_objective, 1e-5)
+    assert battery.dispatch.round_relaxed_binaries()
+
+
+def test_persistent_solver_matches_glpk(site):
+    pytest.importorskip("highspy")
+    if not pyomo.SolverFactory('appsi_highs').available(exception_flag=False):
+        pytest.skip("HiGHS solver is not available")
+
+    dispatch_n_look_ahead = 48
+    n_roll_periods = 24
+
+    def create_battery_model():
+        battery = Battery(site, technologies['battery'])
+        model = pyomo.ConcreteModel(name='battery_only')
+        model.forecast_horizon = pyomo.Set(initialize=range(dispatch_n_look_ahead))
+        battery._dispatch = SimpleBatteryDispatch(model,
+                                                  model.forecast_horizon,
+                                                  battery._system_model,
+                                                  battery._financial_model,
+                                                  include_lifecycle_count=False)
+        model.price = pyomo.Param(model.forecast_horizon, within=pyomo.Reals, initialize=0.0, mutable=True,
+                                  units=u.USD / u.MWh)
+        model.test_objective = pyomo.Objective(
+            expr=sum(model.battery[t].time_duration * (
+                    (model.price[t] - model.battery[t].cost_per_discharge) * model.battery[t].discharge_power
+                    - (model.price[t] + model.battery[t].cost_per_charge) * model.battery[t].charge_power)
+                     for t in model.forecast_horizon),
+            sense=pyomo.maximize)
+        battery.dispatch.initialize_parameters()
+        return battery, model
+
+    glpk_battery, glpk_model = create_battery_model()
+    battery, model = create_battery_model()
+    opt = HybridDispatchBuilderSolver.create_persistent_solver('appsi_highs')
+    optimal_gap = {'mip_rel_gap': 0.}    # GLPK solves to optimality by default
+
+    hours = np.arange(5 * n_roll_periods + dispatch_n_look_ahead)
+    prices = 50.0 + 30.0 * np.sin(2 * np.pi * hours / 24) + 10.0 * np.sin(2 * np.pi * hours / 67)
+    for i in range(5):
+        start_time = i * n_roll_periods
+        for b, m in ((glpk_battery, glpk_model), (battery, model)):
+            for t in m.forecast_horizon:
+                m.price[t] = prices[start_time + t]
+            b.dispatch.update_time_series_parameters(start_time)
+            b.dispatch.update_dispatch_initial_soc(b.dispatch.minimum_soc + 10.0 * i)
+
+        results = HybridDispatchBuilderSolver.glpk_solve_call(glpk_model)
+        assert results.solver.termination_condition == TerminationCondition.optimal
+        if i > 0:
+            HybridDispatchBuilderSolver.shift_solution(model, n_roll_periods)
+        results = HybridDispatchBuilderSolver.highs_persistent_solve_call(opt, model, warm_start=i > 0,
+                                                                          user_solver_options=optimal_gap)
+        assert results.solver.termination_condition == TerminationCondition.optimal
+
+        assert pyomo.value(model.test_objective) == pytest.approx(pyomo.value(glpk_model.test_objective), 1e-5)
+        assert battery.dispatch.charge_power == pytest.approx(glpk_battery.dispatch.charge_power, abs=1e-3)
+        assert battery.dispatch.discharge_power == pytest.approx(glpk_battery.dispatch.discharge_power, abs=1e-3)
+
+    # fixed variables, e.g., from the heuristic battery dispatch, are passed to the persistent solver
+    for b in (glpk_battery, battery):
+        for t in b.dispatch.blocks.index_set():
+            b.dispatch.blocks[t].discharge_power.fix(0.0)
+    HybridDispatchBuilderSolver.glpk_solve_call(glpk_model)
+    HybridDispatchBuilderSolver.highs_persistent_solve_call(opt, model, warm_start=True,
+                                                            user_solver_options=optimal_gap)
+    assert sum(battery.dispatch.discharge_power) == 0.0
+    assert pyomo.value(model.test_objective) == pytest.approx(pyomo.value(glpk_model.test_objective), 1e-5)
+
+
+def test_shift_solution_for_warm_start():
+    model = pyomo.ConcreteModel()
+    model.forecast_horizon = pyomo.Set(initialize=range(6))
+    model.block = pyomo.Block(model.forecast_horizon)
+    model.other_block = pyomo.Block(range(3))
+    for t in model.forecast_horizon:
+        model.block[t].x = pyomo.Var(initialize=float(t))
+        model.block[t].y = pyomo.Var(initialize=None if t == 3 else 10.0 + t)
+        model.block[t].z = pyomo.Var(initialize=20.0 + t)
+    for t in range(3):
+        model.other_block[t].x = pyomo.Var(initialize=float(t))
+    model.block[1].z.fix()
+
+    HybridDispatchBuilderSolver.shift_solution(model, 2)
+    # periods beyond the previous horizon reuse the previous solution at the same position
+    assert [model.block[t].x.value for t in model.forecast_horizon] == [2., 3., 4., 5., 4., 5.]
+    # periods without a previous value are unchanged
+    assert [model.block[t].y.value for t in model.forecast_horizon] == [12., 11., 14., 15., 14., 15.]
+    # fixed variables are unchanged
+    assert [model.block[t].z.value for t in model.forecast_horizon] == [22., 21., 24., 25., 24., 25.]
+    assert [model.other_block[t].x.value for t in range(3)] == [0., 1., 2.]
+
+    HybridDispatchBuilderSolver.shift_solution(model, 6)
+    assert [model.block[t].x.value for t in model.forecast_horizon] == [2., 3., 4., 5., 4., 5.]
+
+
 def test_simple_battery_dispatch_lifecycle_count(site):
     expected_objective = 17024.52
     expected_lifecycles = 2.2514
@@ -628,10 +803,53 @@ def test_hybrid_dispatch_heuristic(site):
 
     hybrid_plant.simulate(1)
 
+    assert hybrid_plant.dispatch_builder.pyomo_model is None
+    assert isinstance(hybrid_plant.battery.dispatch, HeuristicBatteryDispatch)
     assert sum(hybrid_plant.battery.dispatch.charge_power) > 0.0
     assert sum(hybrid_plant.battery.dispatch.discharge_power) > 0.0
 
 
+def test_heuristic_battery_dispatch_matches_pyomo(site):
+    n_horizon = 24
+    battery = Battery(site, technologies['battery'])
+
+    model = pyomo.ConcreteModel(name='battery_only')
+    model.forecast_horizon = pyomo.Set(initialize=range(n_horizon))
+    pyomo_dispatch = OneCycleBatteryDispatchHeuristic(model,
+                                                      model.forecast_horizon,
+                                                      battery._system_model,
+                                                      battery._financial_model)
+    pyomo_dispatch.initialize_parameters()
+    numpy_dispatch = OneCycleHeuristicBatteryDispatch(n_horizon,
+                                                      battery._system_model,
+                                                      battery._financial_model)
+    numpy_dispatch.initialize_parameters()
+
+    # two days of available generation [MW], grid limits [MW] and prices [$/MWh]
+    gen = [0.0] * 6 + [10.0, 25.0, 40.0, 50.0, 60.0, 60.0, 55.0, 45.0, 30.0, 15.0] + [0.0] * 8
+    gen += [0.5 * g for g in gen]
+    grid_limit = [interconnect_mw] * len(gen)
+    prices = ([20.0] * 8 + [30.0] * 8 + [90.0] * 4 + [40.0] * 4) * 2
+    numpy_dispatch.set_annual_dispatch(gen, grid_limit, prices)
+
+    for start_time in (0, n_horizon):
+        horizon = slice(start_time, start_time + n_horizon)
+        pyomo_dispatch.update_dispatch_initial_soc()
+        pyomo_dispatch.update_time_series_parameters(start_time)
+        pyomo_dispatch.prices = prices[horizon]
+        pyomo_dispatch.set_fixed_dispatch(gen[horizon], grid_limit[horizon])
+
+        numpy_dispatch.update_dispatch_initial_soc()
+        numpy_dispatch.update_time_series_parameters(start_time)
+
+        assert numpy_dispatch.power == pytest.approx(pyomo_dispatch.power)
+        assert numpy_dispatch.soc == pytest.approx(pyomo_dispatch.soc)
+        assert sum(numpy_dispatch.charge_power) > 0.0
+        assert sum(numpy_dispatch.discharge_power) > 0.0
+
+        battery.simulate_with_dispatch(n_horizon)
+
+
 def test_hybrid_dispatch_one_cycle_heuristic(site):
     dispatch_options = {'battery_dispatch': 'one_cycle_heuristic',
                         'grid_charging': False}
@@ -698,6 +916,46 @@ def test_hybrid_solar_battery_dispatch(site):
         assert system_generation[t] * 1e3 >= 0.0
 
 
+def test_hybrid_battery_lp_relaxation_fallback(site):
+    solar_battery_technologies = {k: technologies[k] for k in ('pv', 'battery', 'grid')}
+    hybrid_plant = HybridSimulation(solar_battery_technologies,
+                                    site,
+                                    dispatch_options={'battery_lp_relaxation': True})
+    hybrid_plant.pv.dc_degradation = [0.5] * 1
+    hybrid_plant.pv.simulate(1)
+
+    builder = hybrid_plant.dispatch_builder
+    assert builder.battery_lp_relaxation
+    builder.dispatch.initialize_parameters()
+    builder.dispatch.update_time_series_parameters(0)
+    hybrid_plant.battery.dispatch.update_dispatch_initial_soc(hybrid_plant.battery.dispatch.minimum_soc)
+
+    # negative prices make burning energy through battery losses profitable, so the relaxed battery charges and
+    # discharges at once
+    prices = [-50.0 if t < 4 else 40.0 for t in builder.pyomo_model.forecast_horizon]
+    hybrid_plant.grid.dispatch.electricity_sell_price = prices
+    hybrid_plant.grid.dispatch.electricity_purchase_price = prices
+
+    builder.solve_dispatch_model(0, 1)
+    assert builder.problem_state.n_milp_fallback_solves == 1
+    assert builder.problem_state.records[-1]['termination_condition'] == 'optimal'
+    assert not any(c > 1e-5 and d > 1e-5 for c, d in zip(hybrid_plant.battery.dispatch.charge_power,
+                                                          hybrid_plant.battery.dispatch.discharge_power))
+    # binaries are relaxed again for the next horizon
+    assert not any(builder.pyomo_model.battery[t].is_charging.is_binary() for t in builder.pyomo_model.forecast_horizon)
+
+
+def test_battery_lp_relaxation_not_used_with_csp(site):
+    tower_battery_technologies = {k: technologies[k] for k in ('tower', 'battery', 'grid')}
+    hybrid_plant = HybridSimulation(tower_battery_technologies,
+                                    site,
+                                    dispatch_options={'battery_lp_relaxation': True})
+
+    model = hybrid_plant.dispatch_builder.pyomo_model
+    assert not hybrid_plant.dispatch_builder.battery_lp_relaxation
+    assert all(model.battery[t].is_charging.is_binary() for t in model.forecast_horizon)
+
+
 def test_hybrid_dispatch_financials(site):
     wind_solar_battery = {key: technologies[key] for key in ('pv', 'wind', 'battery', 'grid')}
     hybrid_plant = HybridSimulation(wind_solar_battery,
@@ -709,6 +967,98 @@ def test_hybrid_dispatch_financials(site):
     assert sum(hybrid_plant.battery.Outputs.P) < 0.0
 
 
+def test_dispatch_problem_state_records(tmp_path):
+    results = SolverResults()
+    results.solver.termination_condition = TerminationCondition.optimal
+    results.solver.time = 0.5
+    results.problem.upper_bound = 100.
+    results.problem.lower_bound = 99.
+    results.solver.statistics.black_box.number_of_iterations = 12
+
+    problem_state = DispatchProblemState()
+    problem_state.store_problem_metrics(results, 0, 1, 100.)
+    problem_state.set_record_file(str(tmp_path / "solves.jsonl"), n_records_per_flush=2)
+    assert problem_state.record_file == str(tmp_path / "solves_{}.jsonl".format(os.getpid()))
+
+    problem_state.store_problem_metrics(results, 24, 1, 100.)
+    assert not os.path.isfile(problem_state.record_file)
+    problem_state.store_problem_metrics(results, 48, 1, 100.)
+    problem_state.store_problem_metrics(results, 72, 1, 100.)
+    problem_state.flush_records()
+    problem_state.flush_records()
+
+    assert len(problem_state.records) == 4
+    with open(problem_state.record_file) as f:
+        records = [json.loads(line) for line in f]
+    # records before set_record_file are not written
+    assert records == problem_state.records[1:]
+    assert [r['start_time'] for r in records] == [24, 48, 72]
+    assert records[0]['termination_condition'] == 'optimal'
+    assert records[0]['solve_time'] == 0.5
+    assert records[0]['gap'] == pytest.approx(0.01)
+    assert records[0]['n_iterations'] == 12
+    assert records[0]['non_zeros'] is None
+
+
+def test_print_infeasible_problem(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    model = pyomo.ConcreteModel()
+    model.block = pyomo.Block(range(2))
+    for t in range(2):
+        model.block[t].limit = pyomo.Param(initialize=float(t), mutable=True)
+        model.block[t].x = pyomo.Var(bounds=(0, 1))
+
+    with pytest.raises(ValueError, match="infeasible_instance_{}.txt".format(os.getpid())):
+        HybridDispatchBuilderSolver.check_solve_condition(TerminationCondition.infeasible, model)
+    with open(tmp_path / "infeasible_instance_{}.txt".format(os.getpid())) as f:
+        diagnostics = f.read()
+    assert "Parameter:  limit" in diagnostics
+    assert "Model Blocks Display" in diagnostics
+
+
+def test_look_ahead_insensitivity():
+    n_horizon = 4
+    n_roll_periods = 2
+    is_insensitive = HybridDispatchBuilderSolver.is_insensitive_to_look_ahead
+
+    assert is_insensitive(np.full(6, 60.), n_horizon, n_roll_periods, 50.)
+    # energy is worth more after the horizon
+    prices = np.array([60., 80., 60., 65., 70., 60.])
+    assert not is_insensitive(prices, n_horizon, n_roll_periods, 50.)
+    assert is_insensitive(prices, n_horizon, n_roll_periods, 0.)
+    assert is_insensitive(prices, 6, n_roll_periods, 50.)
+    # energy is sold at the same price within the horizon
+    prices = np.array([60., 60., 80., 70., 70., 60.])
+    assert is_insensitive(prices, n_horizon, n_roll_periods, 50.)
+
+
+def test_adaptive_roll_dispatch(site):
+    solar_battery_technologies = {k: technologies[k] for k in ('pv', 'battery', 'grid')}
+    solar_battery_technologies['pv'] = {'system_capacity_kw': 40 * 1000}
+    revenues = []
+    n_solves = []
+    for adaptive_roll in (False, True):
+        hybrid_plant = HybridSimulation(solar_battery_technologies,
+                                        site,
+                                        dispatch_options={'adaptive_roll': adaptive_roll})
+        hybrid_plant.ppa_price = (0.06,)
+        hybrid_plant.simulate(1)
+        revenues.append(hybrid_plant.total_revenues.hybrid[1])
+        records = hybrid_plant.dispatch_builder.problem_state.records
+        n_solves.append(len(records))
+
+        # each solve record holds its own horizon
+        start_times = [r['start_time'] for r in records]
+        n_days = [r['n_days'] for r in records]
+        assert start_times[0] == 0
+        assert np.diff(start_times) == pytest.approx(np.array(n_days[:-1]) * site.n_periods_per_day)
+        assert sum(n_days) == pytest.approx(365)
+
+    assert n_solves[0] == 365
+    assert n_solves[1] < n_solves[0]
+    assert revenues[1] == pytest.approx(revenues[0], rel=5e-3)
+
+
 def test_desired_schedule_dispatch():
 
     # Creating a contrived schedule
@@ -774,3 +1124,45 @@ def test_desired_schedule_dispatch():
     assert sum(hybrid_plant.tower.dispatch.receiver_thermal_power) > 0.0
 
 
+
+
+def test_clustering_parallel_exemplars(site):
+    solar_battery_technologies = {k: technologies[k] for k in ('pv', 'battery', 'grid')}
+    dispatch_options = {'use_clustering': True,
+                        'n_clusters': 10,
+                        'grid_charging': False}
+    serial_plant = HybridSimulation(solar_battery_technologies, site, dispatch_options=dispatch_options)
+    serial_plant.ppa_price = (0.06,)
+    serial_plant.simulate(1)
+
+    dispatch_options['n_clustering_workers'] = 4
+    parallel_plant = HybridSimulation(solar_battery_technologies, site, dispatch_options=dispatch_options)
+    parallel_plant.ppa_price = (0.06,)
+    parallel_plant.simulate(1)
+
+    assert len(parallel_plant.battery.Outputs.gen) == site.n_timesteps
+    assert sum(parallel_plant.battery.Outputs.P) < 0.0
+    # Exemplars simulated in parallel only differ by their initial state estimates
+    assert parallel_plant.annual_energies.hybrid == pytest.approx(serial_plant.annual_energies.hybrid, 1e-2)
+
+
+def test_clustering_parallel_heuristic_dispatch(site):
+    solar_battery_technologies = {k: technologies[k] for k in ('pv', 'battery', 'grid')}
+    dispatch_options = {'battery_dispatch': 'heuristic',
+                        'use_clustering': True,
+                        'n_clusters': 10,
+                        'n_clustering_workers': 4,
+                        'grid_charging': False}
+    hybrid_plant = HybridSimulation(solar_battery_technologies, site, dispatch_options=dispatch_options)
+    fixed_dispatch = [0.0] * 6
+    fixed_dispatch.extend([-1.0] * 6)
+    fixed_dispatch.extend([1.0] * 6)
+    fixed_dispatch.extend([0.0] * 6)
+    hybrid_plant.battery.dispatch.user_fixed_dispatch = fixed_dispatch
+    hybrid_plant.ppa_price = (0.06,)
+    hybrid_plant.simulate(1)
+
+    assert hybrid_plant.dispatch_builder.pyomo_model is None
+    assert len(hybrid_plant.dispatch_builder.problem_state) == 0
+    assert len(hybrid_plant.battery.Outputs.gen) == site.n_timesteps
+    assert any(hybrid_plant.battery.Outputs.P)
@@ -141,6 +141,32 @@ def test_single_turbine_wind_dir():
     assert(np.count_nonzero(hours_shaded) == 2819)
 
 
+def test_single_turbine_raster():
+    FlickerMismatch.turbine_tower_shadow = True
+    FlickerMismatch.diam_mult_nwe = 3
+    FlickerMismatch.diam_mult_s = 1
+    FlickerMismatch.steps_per_hour = 1
+    flicker = FlickerMismatch(lat, lon, angles_per_step=3)
+    shadow, loss = flicker.create_heat_maps(range(3185, 3187), ("poa", "power"))
+
+    # point-in-polygon heat maps are the same as with shapely
+    flicker.raster = True
+    shadow_r, loss_r = flicker.create_heat_maps(range(3185, 3187), ("poa", "power"))
+    assert np.count_nonzero(shadow_r) == np.count_nonzero(shadow)
+    assert np.count_nonzero(loss_r) == np.count_nonzero(loss)
+    assert np.allclose(shadow_r, shadow)
+    assert np.allclose(loss_r, loss)
+
+    # area-weighted heat map is approximated by subsampling each cell
+    flicker = FlickerMismatch(lat, lon, angles_per_step=None)
+    (hours_shaded, ) = flicker.create_heat_maps(range(3187, 3189), ("time",))
+    flicker.raster = True
+    (hours_shaded_r, ) = flicker.create_heat_maps(range(3187, 3189), ("time",))
+    assert np.max(hours_shaded_r) == approx(np.max(hours_shaded))
+    assert np.average(hours_shaded_r) == approx(np.average(hours_shaded), 1e-3)
+    assert np.max(np.abs(hours_shaded_r - hours_shaded)) < 0.1
+
+
 def test_grid():
     dx = 1
     dy = 2
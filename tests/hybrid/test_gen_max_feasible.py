@@ -0,0 +1,155 @@
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from hybrid.sites import SiteInfo, flatirons_site
+from hybrid.battery import Battery
+from hybrid.pv_source import PVPlant
+from hybrid.tower_source import TowerPlant
+
+
+@pytest.fixture
+def site():
+    solar_resource_file = Path(__file__).absolute().parent.parent.parent / "resource_files" / "solar" / "35.2018863_-101.945027_psmv3_60_2012.csv"
+    wind_resource_file = Path(__file__).absolute().parent.parent.parent / "resource_files" / "wind" / "35.2018863_-101.945027_windtoolkit_2012_60min_80m_100m.srw"
+    return SiteInfo(flatirons_site, solar_resource_file=solar_resource_file, wind_resource_file=wind_resource_file)
+
+
+interconnect_kw = 15000
+
+
+def rowwise_battery_gen_max_feasible_kwh(battery, interconnect_kw, use_avail_storage=True):
+    """Row-wise reference implementation of ``Battery.calc_gen_max_feasible_kwh``"""
+    t_step = battery.site.interval / 60
+    df = pd.DataFrame()
+    df['E_delivered'] = [max(0, x * t_step) for x in battery.Outputs.P]
+    df['SOC_perc'] = battery.Outputs.SOC
+    df['E_stored'] = df.SOC_perc / 100 * battery.system_capacity_kwh
+
+    def max_feasible_kwh(row):
+        return min(battery.system_capacity_kw * t_step, row.E_delivered + row.E_stored)
+
+    if use_avail_storage:
+        E_max_feasible = df.apply(max_feasible_kwh, axis=1)
+    else:
+        E_max_feasible = df['E_delivered']
+
+    W_ac_nom = battery.calc_nominal_capacity(interconnect_kw)
+    return list(np.minimum(E_max_feasible, W_ac_nom * t_step))
+
+
+def rowwise_csp_gen_max_feasible_kwh(csp, interconnect_kw, cap_cred_avail_storage=True):
+    """Row-wise reference implementation of ``CspPlant.calc_gen_max_feasible_kwh``"""
+    SIGMA = 1e-6
+    t_step = csp.value("time_steps_per_hour")
+    ts = csp.outputs.ssc_time_series
+
+    df = pd.DataFrame()
+    df['Q_pb_startup'] = [x * 1e3 for x in ts["q_dot_pc_startup"]]
+    df['E_pb_startup'] = [x * 1e3 for x in ts["q_pc_startup"]]
+    df['W_pb_gross'] = [x * 1e3 for x in ts["P_cycle"]]
+    df['E_tes'] = [x * 1e3 for x in ts["e_ch_tes"]]
+    df['eta_pb'] = ts["eta"]
+    df['W_pb_net'] = [x * 1e3 for x in ts["P_out_net"]]
+    df['Q_pb'] = [x * 1e3 for x in ts["q_pb"]]
+
+    def power_block_state(Q_pb_startup, W_pb_gross):
+        if abs(Q_pb_startup) < SIGMA and abs(W_pb_gross) < SIGMA:
+            return 'off'
+        elif Q_pb_startup > SIGMA and abs(W_pb_gross) < SIGMA:
+            return 'starting'
+        elif Q_pb_startup > SIGMA and W_pb_gross > SIGMA:
+            return 'started'
+        elif abs(Q_pb_startup) < SIGMA and W_pb_gross > SIGMA:
+            return 'on'
+        else:
+            return None
+
+    def max_feasible_kwh(row):
+        state = power_block_state(row.Q_pb_startup, row.W_pb_gross)
+        if state == 'starting':
+            return 0
+        if state == 'off':
+            t_pb_startup = csp.value("startup_time")
+        elif state == 'started':
+            t_pb_startup = t_step * (1.0 - row.eta_pb / (row.W_pb_gross / (row.Q_pb - row.Q_pb_startup))) \
+                if row.E_pb_startup > SIGMA and row.Q_pb_startup > SIGMA else 0
+        elif state == 'on':
+            t_pb_startup = 0
+        else:
+            return None
+        W_pb_nom = csp.cycle_capacity_kw
+        W_pb_max = W_pb_nom * csp.value("cycle_max_frac")
+        E_pb_max = max(W_pb_max * (t_step - t_pb_startup), row.W_pb_gross * t_step)
+
+        if state == 'off':
+            E_pb_gross = 0
+            eta_pb_nom = csp.cycle_nominal_efficiency
+            E_pb_startup = W_pb_nom / eta_pb_nom * csp.value("startup_frac") * t_pb_startup
+            dE_pb_rest_of_tes = max(0, row.E_tes - E_pb_startup) * eta_pb_nom
+        else:
+            E_pb_gross = row.W_pb_gross * t_step
+            dE_pb_rest_of_tes = row.E_tes * row.eta_pb
+        return min(E_pb_max, E_pb_gross + dE_pb_rest_of_tes)
+
+    if cap_cred_avail_storage:
+        E_pb_max_feasible = np.maximum(df['W_pb_net'] * t_step,
+                                       df.apply(max_feasible_kwh, axis=1) * csp.value('gross_net_conversion_factor'))
+    else:
+        E_pb_max_feasible = df['W_pb_net'] * t_step
+
+    W_ac_nom = csp.calc_nominal_capacity(interconnect_kw)
+    return list(np.minimum(E_pb_max_feasible, W_ac_nom * t_step))
+
+
+def test_battery_gen_max_feasible_matches_rowwise(site):
+    battery = Battery(site, {'system_capacity_kwh': 20000, 'system_capacity_kw': 5000})
+    rng = np.random.default_rng(0)
+    battery.Outputs.P = list(rng.uniform(-6000, 6000, site.n_timesteps))
+    battery.Outputs.SOC = list(rng.uniform(0, 100, site.n_timesteps))
+
+    for use_avail_storage in (True, False):
+        expected = rowwise_battery_gen_max_feasible_kwh(battery, interconnect_kw, use_avail_storage)
+        actual = battery.calc_gen_max_feasible_kwh(interconnect_kw, use_avail_storage)
+        assert isinstance(actual, list)
+        assert actual == pytest.approx(expected, rel=1e-12, abs=1e-12)
+
+
+def test_pv_gen_max_feasible_matches_rowwise(site):
+    pv = PVPlant(site, {'system_capacity_kw': 20000})
+    pv.simulate(interconnect_kw)
+
+    W_ac_nom = pv.calc_nominal_capacity(interconnect_kw)
+    t_step = site.interval / 60
+    expected = [min(x, W_ac_nom) * t_step for x in pv.generation_profile[0:site.n_timesteps]]
+    actual = pv.calc_gen_max_feasible_kwh(interconnect_kw)
+    assert isinstance(actual, list)
+    assert actual == pytest.approx(expected, rel=1e-12, abs=1e-12)
+
+
+def test_csp_gen_max_feasible_matches_rowwise(site):
+    csp = TowerPlant(site, {'cycle_capacity_kw': 100 * 1000, 'solar_multiple': 2.0, 'tes_hours': 6.0})
+    n = site.n_timesteps
+    rng = np.random.default_rng(0)
+
+    # Cycle through off, starting, started and on power block states
+    state = np.arange(n) % 4
+    startup = np.where((state == 1) | (state == 2), rng.uniform(1, 50, n), 0.)    # [MWt]
+    gross = np.where(state >= 2, rng.uniform(1, 110, n), 0.)                        # [MWe]
+    q_pb = gross / 0.4 + startup + rng.uniform(0, 10, n)                            # [MWt]
+    csp.outputs.ssc_time_series = {
+        'q_dot_pc_startup': list(startup),
+        'q_pc_startup': list(np.where(state == 2, startup * rng.uniform(0, 1, n), startup)),
+        'P_cycle': list(gross),
+        'e_ch_tes': list(rng.uniform(0, 1500, n)),
+        'eta': list(np.where(state >= 2, rng.uniform(0.3, 0.45, n), 0.)),
+        'P_out_net': list(gross * 0.9),
+        'q_pb': list(q_pb),
+    }
+
+    for cap_cred_avail_storage in (True, False):
+        expected = rowwise_csp_gen_max_feasible_kwh(csp, interconnect_kw, cap_cred_avail_storage)
+        actual = csp.calc_gen_max_feasible_kwh(interconnect_kw, cap_cred_avail_storage)
+        assert isinstance(actual, list)
+        assert actual == pytest.approx(expected, rel=1e-12, abs=1e-12)
@@ -10,6 +10,7 @@ from examples.Detailed_PV_Layout.detailed_pv_layout import DetailedPVParameters,
 from examples.Detailed_PV_Layout.detailed_pv_config import PVLayoutConfig
 import PySAM.Singleowner as Singleowner
 from hybrid.grid import Grid
+from hybrid.power_source import PowerSource
 from hybrid.keys import set_nrel_key_dot_env
 from hybrid.layout.pv_design_utils import size_electrical_parameters
 from copy import deepcopy
@@ -115,6 +116,30 @@ def test_hybrid_pv_only(site):
     assert npvs.hybrid == approx(-5121293, 1e3)
 
 
+def test_power_source_value(site):
+    solar_only = {key: technologies[key] for key in ('pv', 'grid')}
+    hybrid_plant = HybridSimulation(solar_only, site)
+    pv = hybrid_plant.pv
+    PowerSource.clear_model_group_cache()
+
+    assert pv.value('system_capacity_kw') == approx(pv_kw)
+    pv.value('gcr', 0.35)
+    assert pv.value('gcr') == approx(0.35)
+    assert pv._system_model.SystemDesign.gcr == approx(0.35)
+    pv.value('ppa_escalation', 1.5)
+    assert pv.value('ppa_escalation') == approx(1.5)
+    assert pv._financial_model.Revenue.ppa_escalation == approx(1.5)
+
+    # group lookups are cached by model type
+    assert PowerSource._model_group_cache[type(pv._system_model)]['gcr'] == 'SystemDesign'
+    assert PowerSource._model_group_cache[type(pv._financial_model)]['ppa_escalation'] == 'Revenue'
+    pv.value('gcr', 0.4)
+    assert pv.value('gcr') == approx(0.4)
+
+    with raises(ValueError):
+        pv.value('not_a_variable')
+
+
 def test_hybrid_detailed_pv_only(site):
     # Run standalone detailed PV model (pvsamv1) using defaults
     annual_energy_expected = 112401677
@@ -490,6 +515,33 @@ def test_wind_pv_with_storage_dispatch(site):
     assert tc.battery[1] == approx(0, rel=5e-2)
     assert tc.hybrid[1] == approx(1646170, rel=5e-2)
 
+def test_hybrid_copy(site):
+    wind_pv_battery = {key: technologies[key] for key in ('pv', 'wind', 'battery', 'grid')}
+    hybrid_plant = HybridSimulation(wind_pv_battery, site)
+    hybrid_plant.ppa_price = (0.03, )
+    hybrid_plant.pv.dc_degradation = [0] * 25
+
+    plant_copy = hybrid_plant.copy()
+    assert plant_copy.site is hybrid_plant.site
+    assert plant_copy.pv is not hybrid_plant.pv
+    assert plant_copy.power_sources['pv'] is plant_copy.pv
+    assert plant_copy.pv._system_model is not hybrid_plant.pv._system_model
+    assert plant_copy.dispatch_builder.pyomo_model is not hybrid_plant.dispatch_builder.pyomo_model
+    assert plant_copy.battery.dispatch.model is plant_copy.dispatch_builder.pyomo_model
+    assert plant_copy.battery.dispatch.blocks.model() is plant_copy.dispatch_builder.pyomo_model
+    assert plant_copy.ppa_price == hybrid_plant.ppa_price
+
+    plant_copy.pv.system_capacity_kw = pv_kw * 2
+    assert hybrid_plant.pv.system_capacity_kw == approx(pv_kw)
+
+    hybrid_plant.simulate()
+    plant_copy.pv.system_capacity_kw = pv_kw
+    plant_copy.simulate()
+    assert plant_copy.annual_energies.pv == approx(hybrid_plant.annual_energies.pv)
+    assert plant_copy.annual_energies.battery == approx(hybrid_plant.annual_energies.battery)
+    assert plant_copy.net_present_values.hybrid == approx(hybrid_plant.net_present_values.hybrid)
+
+
 def test_tower_pv_hybrid(site):
     interconnection_size_kw_test = 50000
     technologies_test = {'tower': {'cycle_capacity_kw': 50 * 1000,
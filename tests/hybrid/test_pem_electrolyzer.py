@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from hybrid.PEM_H2_LT_electrolyzer import PEM_electrolyzer_LT, PEM_electrolyzer_fleet
+
+
+def power_profile(system_size_MW):
+    t = np.arange(8760)
+    return np.clip(system_size_MW * 1000 * (0.6 + 0.6 * np.sin(2 * np.pi * t / 24)), 0, None)
+
+
+def test_fleet_equal_split():
+    P_input_kW = power_profile(10)
+    single = PEM_electrolyzer_LT({'P_input_external_kW': P_input_kW, 'electrolyzer_system_size_MW': 10}, {})
+    single.h2_production_rate()
+    fleet_output = {}
+    fleet = PEM_electrolyzer_fleet({'P_input_external_kW': P_input_kW, 'electrolyzer_system_size_MW': 10},
+                                   fleet_output)
+    fleet.h2_production_rate()
+
+    assert fleet_output['stack_h2_produced_kg_hr'].shape == (10, 8760)
+    assert fleet_output['h2_produced_kg_hr_system'] == pytest.approx(single.output_dict['h2_produced_kg_hr_system'])
+    assert fleet_output['curtailed_P_kW'] == pytest.approx(single.output_dict['curtailed_P_kW'])
+
+
+def test_fleet_sequential_split():
+    P_input_kW = power_profile(10)
+    fleet_output = {}
+    fleet = PEM_electrolyzer_fleet({'P_input_external_kW': P_input_kW, 'electrolyzer_system_size_MW': 10,
+                                    'power_split': 'sequential'}, fleet_output)
+    fleet.h2_production_rate()
+    equal = PEM_electrolyzer_fleet({'P_input_external_kW': P_input_kW, 'electrolyzer_system_size_MW': 10}, {})
+    h2_equal = equal.h2_production_rate()
+
+    stack_P_kW = fleet_output['stack_P_input_kW']
+    assert stack_P_kW.sum(axis=0) == pytest.approx(fleet.input_dict['P_input_external_kW'])
+    assert stack_P_kW.max() <= fleet.stack_rating_kW + 1e-6
+    # stacks are committed in order
+    assert np.all(np.diff((stack_P_kW > 0).astype(int), axis=0) <= 0)
+    # committing fewer stacks keeps them above the minimum current at low power
+    low_power = fleet.input_dict['P_input_external_kW'] < 2000
+    assert np.all(fleet_output['h2_produced_kg_hr_system'][low_power] >= h2_equal[low_power])
+    assert fleet_output['h2_produced_kg_hr_system'].sum() > h2_equal.sum()
+
+    with pytest.raises(ValueError):
+        PEM_electrolyzer_fleet({'P_input_external_kW': P_input_kW, 'electrolyzer_system_size_MW': 10,
+                                'power_split': 'random'}, {})
+    with pytest.raises(ValueError):
+        PEM_electrolyzer_fleet({'P_input_external_kW': P_input_kW, 'electrolyzer_system_size_MW': 10.5}, {}) \
+            .h2_production_rate()
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from hybrid.resource import SolarResource, WindResource
+from hybrid.resource.mock_resource_server import MockResourceServer, default_solar_template, default_wind_template
+from hybrid.resource.resource_downloader import ResourceDownloader, ResourceRequest, download_resources
+
+year = 2012
+api_key = 'x' * 40
+
+
+def test_download_resources(tmp_path):
+    resource_requests = [ResourceRequest(39.7555 + 0.01 * i, -105.2211, year, 80) for i in range(12)]
+    resource_requests.append((39.7555, -105.2211, year, 90))      # between heights, shares the 80m file
+    resource_requests.append((39.7555, -105.2211, year))          # solar only
+
+    with MockResourceServer(delay_s=0.02) as server:
+        results = download_resources(resource_requests, path_resource=str(tmp_path), max_workers=4,
+                                     base_url=server.url, api_key=api_key)
+
+    assert all(r.success for r in results)
+    # 12 solar files, 12 at 80m and one at 100m, shared files downloaded once
+    assert len(server.requests) == 12 + 12 + 1
+    assert 1 < server.max_active <= 4
+    assert len(server.connections) <= 4
+
+    with open(default_solar_template, 'rb') as f:
+        solar_content = f.read()
+    for r in results:
+        assert open(r.solar_filename, 'rb').read() == solar_content
+    assert results[-1].wind_filename is None
+    assert results[-2].wind_filename.endswith("_80m_100m.srw")
+
+    # downloaded files are used by the resource classes
+    lat, lon = resource_requests[0][:2]
+    solar_resource = SolarResource(lat, lon, year, path_resource=str(tmp_path))
+    assert solar_resource.filename == results[0].solar_filename
+    assert len(solar_resource.data['gh']) == 8760
+    wind_resource = WindResource(lat, lon, year, 80, path_resource=str(tmp_path))
+    assert wind_resource.filename == results[0].wind_filename
+
+    # existing files are not downloaded again
+    with MockResourceServer() as server:
+        results = download_resources(resource_requests, path_resource=str(tmp_path), base_url=server.url,
+                                     api_key=api_key)
+    assert all(r.success for r in results)
+    assert len(server.requests) == 0
+
+
+def test_download_retries(tmp_path):
+    resource_requests = [(39.7555, -105.2211, year, 80), (39.7655, -105.2211, year, 80)]
+
+    with MockResourceServer(fail_first=2, fail_status=429) as server:
+        with ResourceDownloader(path_resource=str(tmp_path), backoff_s=0.01, base_url=server.url,
+                                api_key=api_key) as downloader:
+            results = downloader.download(resource_requests, solar=False)
+    assert all(r.success for r in results)
+    assert len(server.requests) == 2 * 3
+    with open(default_wind_template, 'rb') as f:
+        assert open(results[0].wind_filename, 'rb').read() == f.read()
+
+    with MockResourceServer(fail_first=5) as server:
+        results = download_resources(resource_requests[:1], path_resource=str(tmp_path), wind=False, max_tries=3,
+                                     backoff_s=0.01, base_url=server.url, api_key=api_key)
+    assert not results[0].success
+    assert results[0].solar_filename is None
+    assert 'solar' in results[0].errors
+    assert len(server.requests) == 3
+    assert not any(f.endswith('.part') for f in os.listdir(tmp_path / 'solar'))
+
+    # requests that can not succeed are not retried
+    with MockResourceServer() as server:
+        downloader = ResourceDownloader(path_resource=str(tmp_path), base_url=server.url + "/missing",
+                                        api_key=api_key)
+        results = downloader.download(resource_requests[:1], wind=False)
+        downloader.close()
+    assert 'Unknown endpoint' in results[0].errors['solar']
+    assert len(server.requests) == 1
@@ -0,0 +1,44 @@
+import pytest
+
+from hybrid.timing import PhaseTimer
+
+
+def test_phase_timer_nesting():
+    timer = PhaseTimer(enabled=True)
+    with timer.phase('simulate_power'):
+        for _ in range(3):
+            with timer.phase('dispatch'):
+                with timer.phase('solve'):
+                    pass
+    with timer.phase('simulate_financials'):
+        pass
+
+    summary = timer.summary()
+    assert list(summary.keys()) == ['simulate_power/dispatch/solve', 'simulate_power/dispatch', 'simulate_power',
+                                    'simulate_financials']
+    assert summary['simulate_power/dispatch/solve']['count'] == 3
+    assert summary['simulate_power']['count'] == 1
+    assert summary['simulate_power']['total_s'] >= summary['simulate_power/dispatch']['total_s']
+    assert 'simulate_power/dispatch/solve' in str(timer)
+
+    timer.reset()
+    assert timer.summary() == {}
+
+
+def test_phase_timer_disabled():
+    timer = PhaseTimer()
+    with timer.phase('simulate_power'):
+        pass
+    assert timer.summary() == {}
+
+
+def test_phase_timer_exception():
+    timer = PhaseTimer(enabled=True)
+    with pytest.raises(ValueError):
+        with timer.phase('outer'):
+            with timer.phase('inner'):
+                raise ValueError
+    assert list(timer.summary().keys()) == ['outer/inner', 'outer']
+    with timer.phase('next'):
+        pass
+    assert 'next' in timer.summary()
@@ -0,0 +1,82 @@
+import os
+import shutil
+import numpy as np
+import pytest
+from pathlib import Path
+
+from hybrid.resource import weather_cache
+from hybrid.resource.weather_cache import load_weather_file, parse_weather_file, set_weather_cache_dir, \
+    clear_loaded_weather, weather_file_key
+
+solar_resource_file = Path(__file__).absolute().parent.parent.parent / "resource_files" / "solar" / "35.2018863_-101.945027_psmv3_60_2012.csv"
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    previous = weather_cache.get_weather_cache_dir()
+    set_weather_cache_dir(str(tmp_path / "cache"))
+    clear_loaded_weather()
+    yield tmp_path / "cache"
+    set_weather_cache_dir(previous)
+    clear_loaded_weather()
+
+
+def test_weather_cache_round_trip(cache_dir):
+    parsed = parse_weather_file(str(solar_resource_file))
+    loaded = load_weather_file(str(solar_resource_file))
+    key = weather_file_key(str(solar_resource_file))
+    assert (cache_dir / (key + '.npy')).exists()
+    assert (cache_dir / (key + '.json')).exists()
+
+    # Second process-level load maps the cached array instead of parsing
+    clear_loaded_weather()
+    mapped = load_weather_file(str(solar_resource_file))
+    assert isinstance(mapped.data, np.memmap)
+    assert not mapped.data.flags.writeable
+    for weather in (loaded, mapped):
+        assert weather.columns == parsed.columns
+        assert weather.meta == parsed.meta
+        assert weather.integer_columns == parsed.integer_columns
+        assert np.array_equal(weather.data, parsed.data)
+
+    assert mapped.meta_float('Latitude') == pytest.approx(35.21, abs=1e-2)
+    assert len(mapped['GHI']) == 8760
+    assert 'Year' in mapped.integer_columns
+
+
+def test_weather_cache_invalidated_on_change(cache_dir, tmp_path):
+    weather_file = tmp_path / "weather.csv"
+    shutil.copy(solar_resource_file, weather_file)
+    first = load_weather_file(str(weather_file))
+
+    lines = weather_file.read_text().splitlines(keepends=True)
+    columns = lines[2].rstrip('\n').split(',')
+    row = lines[3].rstrip('\n').split(',')
+    row[columns.index('GHI')] = '1234'
+    lines[3] = ','.join(row) + '\n'
+    weather_file.write_text(''.join(lines))
+    os.utime(weather_file, ns=(0, os.stat(weather_file).st_mtime_ns + 1000000))
+
+    second = load_weather_file(str(weather_file))
+    assert second['GHI'][0] == 1234
+    assert first['GHI'][0] != 1234
+
+
+def test_weather_cache_disabled(tmp_path):
+    previous = weather_cache.get_weather_cache_dir()
+    set_weather_cache_dir(None)
+    clear_loaded_weather()
+    try:
+        weather = load_weather_file(str(solar_resource_file))
+        assert not isinstance(weather.data, np.memmap)
+        assert load_weather_file(str(solar_resource_file)) is weather
+    finally:
+        set_weather_cache_dir(previous)
+        clear_loaded_weather()
+
+
+def test_weather_file_not_found(cache_dir, tmp_path):
+    missing_file = tmp_path / "missing.csv"
+    for load in (parse_weather_file, load_weather_file):
+        with pytest.raises(FileNotFoundError, match="missing.csv does not exist"):
+            load(missing_file)
@@ -1,9 +1,14 @@
 import pytest
 import math
+import yaml
+import numpy as np
+from pathlib import Path
+from types import SimpleNamespace
 import PySAM.Windpower as windpower
 
 from hybrid.sites import SiteInfo, flatirons_site
 from hybrid.wind_source import WindPlant
+from hybrid.add_custom_modules.custom_wind_floris import Floris
 
 
 wind_default_elevation = 0
@@ -119,4 +124,41 @@ def test_changing_system_capacity():
         assert model.system_capacity_kw == pytest.approx(n)
 
 
-
+def test_floris_wind_rose_binning():
+    floris_input = Path(__file__).absolute().parent.parent.parent / "examples" / "Wind_Floris" / "floris_input.yaml"
+    with open(floris_input, 'r') as f:
+        floris_config = yaml.load(f, yaml.SafeLoader)
+
+    # Hourly conditions that fall exactly on the wind rose bin centers, so binning does not change the result
+    rng = np.random.default_rng(0)
+    speeds = np.round(rng.weibull(2, 8760) * 8 / 0.5) * 0.5
+    wind_dirs = np.mod(np.round(rng.uniform(0, 360, 8760) / 5) * 5, 360)
+    site = SimpleNamespace(wind_resource=SimpleNamespace(data={'data': [[0, 0, s, d] for s, d in zip(speeds, wind_dirs)]}))
+
+    model = Floris({'floris_config': floris_config, 'turbine_rating_kw': 5000, 'wind_rose_binning': True},
+                   site, timestep=(0, 8760))
+    assert np.array_equal(model.speeds, speeds)
+    assert np.array_equal(model.wind_dirs, wind_dirs)
+
+    model.execute(1)
+    assert len(model._wind_rose_cache) == 1
+
+    # Direct timeseries evaluation of every hour
+    model.fi.reinitialize(layout_x=model.wind_farm_xCoordinates, layout_y=model.wind_farm_yCoordinates,
+                          wind_directions=wind_dirs[speeds > 0], wind_speeds=speeds[speeds > 0], time_series=True)
+    model.fi.calculate_wake()
+    expected = np.zeros(8760)
+    expected[speeds > 0] = np.nan_to_num(model.fi.get_turbine_powers()).sum(axis=(1, 2)) / 1000
+    assert model.gen == pytest.approx(expected, rel=1e-9)
+
+    # Repeated layout is served from the cache
+    annual_energy = model.annual_energy
+    model.execute(1)
+    assert len(model._wind_rose_cache) == 1
+    assert model.annual_energy == pytest.approx(annual_energy)
+
+    model.value("wind_farm_xCoordinates", [0, 500, 1000, 1500])
+    model.value("wind_farm_yCoordinates", [0, 0, 0, 0])
+    model.execute(1)
+    assert len(model._wind_rose_cache) == 2
+    assert model.annual_energy != pytest.approx(annual_energy)
@@ -8,6 +8,8 @@ from hybrid.log import bos_logger as logger
 
 file_path = Path(__file__).parent
 
+_loaded = {}
+
 
 class ATBLookup:
     def __init__(self):
@@ -33,9 +35,15 @@ class ATBLookup:
 
     def _load_lookup(self):
         import json
+        import os
         file = file_path / "ATBCosts2020.json"
-        with open(file, 'r') as f:
-            atb_cost_data = json.loads(f.read())
+        # parsed once per process and shared between instances, must be treated as read-only
+        stat = os.stat(file)
+        key = (str(file), stat.st_mtime_ns, stat.st_size)
+        if key not in _loaded:
+            with open(file, 'r') as f:
+                _loaded[key] = json.loads(f.read())
+        atb_cost_data = _loaded[key]
         contents = atb_cost_data#[self.input_parameters].values
         return atb_cost_data, contents
 
@@ -1,5 +1,11 @@
 from scipy.interpolate import LinearNDInterpolator as interp
+from scipy.spatial import Delaunay, cKDTree
 from pathlib import Path
+from typing import Optional
+import hashlib
+import os
+import pickle
+import tempfile
 import pandas as pd
 import numpy as np
 
@@ -8,6 +14,101 @@ from hybrid.log import bos_logger as logger
 
 file_path = Path(__file__).parent
 
+_default_cache_dir = str(file_path / "cache")
+_cache_dir: Optional[str] = _default_cache_dir
+_loaded = {}
+
+
+def set_bos_cache_dir(cache_dir: Optional[str]):
+    """
+    Sets the directory of the on-disk triangulation cache. ``None`` disables the on-disk cache, so the triangulation
+    is computed once per process instead.
+    """
+    global _cache_dir
+    _cache_dir = cache_dir
+
+
+def get_bos_cache_dir() -> Optional[str]:
+    return _cache_dir
+
+
+def clear_loaded_lookups():
+    """Clears the in-process lookup cache. The on-disk cache is unaffected."""
+    _loaded.clear()
+
+
+class LookupTable:
+    """
+    Lookup data shared by all BOSLookup instances using the same file: the parsed table, the Delaunay triangulation
+    of its input points and a k-d tree for nearest point queries. Must be treated as read-only.
+    """
+    def __init__(self, data: pd.DataFrame, contents: np.ndarray, triangulation: Delaunay):
+        self.data = data
+        self.contents = contents
+        self.triangulation = triangulation
+        self.tree = cKDTree(contents)
+        self._interpolators = {}
+
+    def interpolator(self, output_parameters: tuple) -> interp:
+        """
+        :returns: linear interpolator of the output parameters over the shared triangulation
+        """
+        if output_parameters not in self._interpolators:
+            self._interpolators[output_parameters] = interp(self.triangulation,
+                                                            self.data[list(output_parameters)].values)
+        return self._interpolators[output_parameters]
+
+
+def _load_triangulation(contents: np.ndarray, digest: str) -> Delaunay:
+    """Reads the triangulation of the contents from the on-disk cache, computing and caching it if not found"""
+    cache_file = os.path.join(_cache_dir, digest + ".pkl") if _cache_dir is not None else None
+    if cache_file is not None and os.path.isfile(cache_file):
+        try:
+            with open(cache_file, 'rb') as f:
+                triangulation = pickle.load(f)
+            if isinstance(triangulation, Delaunay) and np.array_equal(triangulation.points, contents):
+                return triangulation
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            logger.warning("Ignoring unreadable BOS lookup cache {}: {}".format(cache_file, e))
+
+    triangulation = Delaunay(contents)
+    if cache_file is not None:
+        try:
+            os.makedirs(_cache_dir, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=_cache_dir, suffix='.pkl', delete=False) as f:
+                pickle.dump(triangulation, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(f.name, cache_file)
+        except OSError as e:
+            logger.warning("Could not write BOS lookup cache to {}: {}".format(_cache_dir, e))
+    return triangulation
+
+
+def load_lookup_table(file, input_parameters: list) -> LookupTable:
+    """
+    Loads a lookup table, triangulating its input points only once.
+
+    Tables are kept in memory for the rest of the process, keyed by the file's path, modification time and size. The
+    triangulation is also saved to the on-disk cache directory, keyed by a hash of the file contents and input
+    parameters, so other processes read it instead of triangulating again.
+
+    :param file: path of the lookup csv
+    :param input_parameters: names of the input columns
+    """
+    stat = os.stat(file)
+    key = "{}|{}|{}|{}".format(os.path.abspath(file), stat.st_mtime_ns, stat.st_size, ",".join(input_parameters))
+    if key in _loaded:
+        return _loaded[key]
+
+    with open(file, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha1(raw + ",".join(input_parameters).encode()).hexdigest()
+    with open(file, "r") as f:
+        data = pd.read_csv(f)
+    contents = data[input_parameters].values
+    table = LookupTable(data, contents, _load_triangulation(contents, digest))
+    _loaded[key] = table
+    return table
+
 
 class BOSLookup(BOSCalculator):
     def __init__(self):
@@ -22,52 +123,61 @@ class BOSLookup(BOSCalculator):
         self.desired_output_parameters = ["Wind BOS Cost",
                                           "Solar BOS Cost"]
 
-        # Loads the json data containing all the BOS cost information from the excel model
-        self.data, self.contents = self._load_lookup()
-        self.interpolating_fxns = self._load_interp()
+        # Loads the data containing all the BOS cost information from the excel model, shared between instances
+        self._table = load_lookup_table(file_path / "BOSLookup.csv", self.input_parameters)
+        self.data, self.contents = self._table.data, self._table.contents
 
         for p in self.desired_output_parameters:
             if p not in self.data.columns:
                 raise KeyError(p + " column missing")
 
-    def _load_lookup(self):
-        file = file_path / "BOSLookup.csv"
-        with open(file, "r") as f:
-            data = pd.read_csv(f)
-        contents = data[self.input_parameters].values
-        return data, contents
+        self.interpolating_fxns = self._load_interp()
+        self._interpolator = self._table.interpolator(tuple(self.desired_output_parameters))
 
     def _load_interp(self):
-        fxns = []
-        for p in self.desired_output_parameters:
-            f = interp(self.contents, self.data[p].values)
-            fxns.append(f)
-        return fxns
+        return [self._table.interpolator((p,)) for p in self.desired_output_parameters]
+
+    def _lookup_costs_batch(self, wind_mw, solar_mw, interconnection_mw):
+        """
+        Looks up the BOS costs of many systems at once
+
+        :returns: wind, solar and total bos cost, and distance to the nearest lookup point, as arrays of the
+            broadcast shape of the inputs
+        """
+        wind_mw, solar_mw, interconnection_mw = np.broadcast_arrays(np.asarray(wind_mw, dtype=float),
+                                                                    np.asarray(solar_mw, dtype=float),
+                                                                    np.asarray(interconnection_mw, dtype=float))
+        shape = wind_mw.shape
+        search_inputs = np.column_stack([interconnection_mw.ravel(), wind_mw.ravel(), solar_mw.ravel()])
+        vals = np.zeros((len(search_inputs), len(self.desired_output_parameters)))
+        min_distance = np.zeros(len(search_inputs))
+
+        active = search_inputs[:, 1] + search_inputs[:, 2] != 0
+        if active.any():
+            points = search_inputs[active]
+            distance, min_index = self._table.tree.query(points)
+            active_vals = self._interpolator(points)
+
+            missing = np.isnan(active_vals).any(axis=1)
+            if missing.any():
+                near = distance[missing] / np.linalg.norm(points[missing], axis=1) < .05
+                if not near.all():
+                    _, wind, solar = points[missing][~near][0]
+                    raise ValueError("Inputs (Wind Size: {}MW and Solar Size: {}MW) to BOSLookup outside of range and cannot be extrapolated".format(wind, solar))
+                active_vals[missing] = self.data[self.desired_output_parameters].values[min_index[missing]]
+            vals[active] = active_vals
+            min_distance[active] = distance
+
+        wind_bos_cost = vals[:, self.desired_output_parameters.index("Wind BOS Cost")].reshape(shape)
+        solar_bos_cost = vals[:, self.desired_output_parameters.index("Solar BOS Cost")].reshape(shape)
+        return wind_bos_cost, solar_bos_cost, wind_bos_cost + solar_bos_cost, min_distance.reshape(shape)
 
     def _lookup_costs(self, wind_mw, solar_mw, interconnection_mw):
         if wind_mw + solar_mw == 0:
             return 0, 0, 0
 
-        search_inputs = np.array([interconnection_mw, wind_mw, solar_mw])
-        distance_norm = np.linalg.norm(self.contents - search_inputs, axis=1)
-        min_index = np.argmin(distance_norm)
-        min_distance = distance_norm[min_index]
-
-        vals = []
-        for i in range(len(self.desired_output_parameters)):
-            vals.append(self.interpolating_fxns[i](search_inputs)[0])
-
-        if np.isnan(vals).any():
-            if min_distance / np.linalg.norm(search_inputs) < .05:
-                wind_bos_cost = self.data.iloc[min_index:min_index+1]["Wind BOS Cost"].values
-                solar_bos_cost = self.data.iloc[min_index:min_index+1]["Solar BOS Cost"].values
-            else:
-                raise ValueError("Inputs (Wind Size: {}MW and Solar Size: {}MW) to BOSLookup outside of range and cannot be extrapolated".format(wind_mw, solar_mw))
-        else:
-            wind_bos_cost = vals[self.desired_output_parameters.index("Wind BOS Cost")]
-            solar_bos_cost = vals[self.desired_output_parameters.index("Solar BOS Cost")]
-
-        total_bos_cost = wind_bos_cost + solar_bos_cost
+        wind_bos_cost, solar_bos_cost, total_bos_cost, min_distance = \
+            (float(v) for v in self._lookup_costs_batch(wind_mw, solar_mw, interconnection_mw))
         logger.info("Total BOS Cost: {} Wind BOS Cost: {} Solar BOS Cost {}".
                     format(total_bos_cost, wind_bos_cost, solar_bos_cost))
 
@@ -77,14 +187,19 @@ class BOSLookup(BOSCalculator):
         """
         Calls the appropriate calculate_bos_costs_x method for the Cost Source data specified
 
+        Sizes may be arrays to evaluate many systems at once, in which case the costs and distances are arrays of the
+        broadcast shape of the inputs, and systems without wind or solar have zero cost.
+
         :param wind_mw: Installed Capacity (MW) of wind component
         :param solar_mw: Installed Capacity (MW) of solar component
         :param interconnection_mw:
         :param scenario: 'greenfield' or 'solar addition'
-        :return: wind, solar and total bos cost
+        :return: wind, solar and total bos cost, and distance to the nearest lookup point
         """
         scenario = scenario.lower()
         if scenario == 'greenfield':
+            if any(np.ndim(x) > 0 for x in (wind_mw, solar_mw, interconnection_mw)):
+                return self._lookup_costs_batch(wind_mw, solar_mw, interconnection_mw)
             return self._lookup_costs(wind_mw, solar_mw, interconnection_mw)
         elif scenario == 'solar addition':
             raise NotImplementedError